@@ -0,0 +1,29 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Vectors stored as (3, N) component arrays, with and without ``axis``."""
+
+import numpy as np
+
+import erfa
+
+
+class TimeComponentArrays:
+    params = ([1_000, 1_000_000], ["pdp", "pxp", "rxp", "c2s"])
+    param_names = ["size", "function"]
+
+    def setup(self, size, function):
+        rng = np.random.default_rng(0)
+        self.func = getattr(erfa, function)
+        vectors = rng.normal(size=(3, size))
+        self.args = {
+            "pdp": (vectors, vectors),
+            "pxp": (vectors, vectors),
+            "rxp": (erfa.rx(0.1, np.eye(3))[..., np.newaxis], vectors),
+            "c2s": (vectors,),
+        }[function]
+
+    def time_axis(self, size, function):
+        self.func(*self.args, axis=0)
+
+    def time_transposed_copy(self, size, function):
+        self.func(*(np.ascontiguousarray(np.moveaxis(arg, -1, 0))
+                    for arg in self.args))
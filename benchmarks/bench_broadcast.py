@@ -0,0 +1,34 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""One matrix or context applied to many vectors or stars."""
+
+import numpy as np
+
+import erfa
+
+
+class TimeBroadcastMatrix:
+    params = ([1_000, 1_000_000], ["rxp", "trxp", "rxpv"], [False, True])
+    param_names = ["size", "function", "transposed"]
+
+    def setup(self, size, function, transposed):
+        self.func = getattr(erfa, function)
+        r = erfa.rx(0.3, erfa.rz(0.1, np.eye(3)))
+        # A transposed matrix is not C-contiguous, so it has to be copied.
+        self.r = r.T if transposed else r
+        p = np.random.default_rng(0).normal(size=(size, 3))
+        self.p = erfa.p2pv(p) if function == "rxpv" else p
+
+    def time_broadcast(self, size, function, transposed):
+        self.func(self.r, self.p)
+
+
+class TimeBroadcastAstrom:
+    params = [1_000, 1_000_000]
+    param_names = ["size"]
+
+    def setup(self, size):
+        self.astrom = erfa.apci13(2460000.5, 0.0).astrom
+        self.rc = np.linspace(0.0, 2 * np.pi, size)
+
+    def time_atciq(self, size):
+        erfa.atciq(self.rc, 0.5, 0.0, 0.0, 0.0, 0.0, self.astrom)
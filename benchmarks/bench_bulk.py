@@ -0,0 +1,25 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""A single rotation matrix applied with the ufuncs and with BLAS."""
+
+import numpy as np
+
+import erfa
+
+
+class TimeBulk:
+    params = ([1_000, 1_000_000], ["rxp", "trxp", "rxpv", "rxr"], [False, True])
+    param_names = ["size", "function", "bulk"]
+
+    def setup(self, size, function, bulk):
+        rng = np.random.default_rng(0)
+        self.func = getattr(erfa, function)
+        self.r = erfa.pnm06a(2460000.5, 0.0)
+        self.args = {
+            "rxp": (self.r, rng.normal(size=(size, 3))),
+            "trxp": (self.r, rng.normal(size=(size, 3))),
+            "rxpv": (self.r, erfa.p2pv(rng.normal(size=(size, 3)))),
+            "rxr": (rng.normal(size=(size, 3, 3)), self.r),
+        }[function]
+
+    def time_single_matrix(self, size, function, bulk):
+        self.func(*self.args, bulk=bulk)
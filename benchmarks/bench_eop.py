@@ -0,0 +1,26 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Interpolation of Earth orientation parameters."""
+
+import numpy as np
+
+import erfa
+from erfa import eop
+
+
+class TimeEop:
+    params = ([1_000, 1_000_000], [True, False])
+    param_names = ["size", "uniform"]
+
+    def setup(self, size, uniform):
+        mjd = np.arange(41684.0, 61684.0)
+        if not uniform:
+            mjd = np.delete(mjd, 1000)
+        eop.set({"mjd": mjd, "dut1": np.zeros(mjd.shape),
+                 "xp": np.zeros(mjd.shape), "yp": np.zeros(mjd.shape)})
+        self.mjd = np.random.default_rng(0).uniform(45000.0, 60000.0, size)
+
+    def teardown(self, size, uniform):
+        eop.set(None)
+
+    def time_interpolate(self, size, uniform):
+        eop.interpolate(erfa.DJM0, self.mjd)
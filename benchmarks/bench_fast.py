@@ -0,0 +1,39 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Chebyshev-table approximations versus the full series."""
+
+import numpy as np
+
+import erfa
+
+
+class TimeDtdb:
+    params = ([1_000, 1_000_000], [False, True])
+    param_names = ["size", "fast"]
+
+    def setup(self, size, fast):
+        # Ensure the table is available, so it is not built while timing.
+        erfa.dtdb(2451545.0, 0.0, 0.0, 0.0, 0.0, 0.0, fast=True)
+        rng = np.random.default_rng(0)
+        self.jd = np.linspace(2450000.0, 2460000.0, size)
+        self.ut = rng.uniform(0.0, 1.0, size)
+        self.elong = rng.uniform(-np.pi, np.pi, size)
+        self.u = rng.uniform(0.0, 6400.0, size)
+        self.v = rng.uniform(-6400.0, 6400.0, size)
+
+    def time_dtdb(self, size, fast):
+        erfa.dtdb(self.jd, 0.5, self.ut, self.elong, self.u, self.v, fast=fast)
+
+
+class TimeEpv00:
+    params = ([1_000, 1_000_000], [False, True])
+    param_names = ["size", "fast"]
+
+    def setup(self, size, fast):
+        erfa.epv00(2451545.0, 0.0, fast=True)
+        self.jd = np.linspace(2450000.0, 2460000.0, size)
+
+    def time_epv00(self, size, fast):
+        erfa.epv00(self.jd, 0.5, fast=fast)
+
+    def time_apci13(self, size, fast):
+        erfa.apci13(self.jd, 0.5, fast=fast)
@@ -0,0 +1,13 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Import of erfa, with the wrappers loaded only when first used."""
+
+
+class TimeImport:
+    def timeraw_import_erfa(self):
+        return "import erfa"
+
+    def timeraw_first_call(self):
+        return "erfa.cal2jd(2024, 1, 1)", "import erfa"
+
+    def timeraw_load_all_wrappers(self):
+        return "[getattr(erfa, name) for name in erfa.core.__all__]", "import erfa"
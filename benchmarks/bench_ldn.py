@@ -0,0 +1,35 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Light deflection of many stars by the same bodies."""
+
+import numpy as np
+
+import erfa
+
+
+class TimeLdn:
+    params = ([1_000, 1_000_000], [True, False])
+    param_names = ["size", "shared"]
+
+    def setup(self, size, shared):
+        rng = np.random.default_rng(0)
+        b = np.zeros(3, erfa.dt_eraLDBODY)
+        b["bm"] = [0.00028574, 0.00095435, 1.0]
+        b["dl"] = [3e-10, 3e-9, 6e-6]
+        b["pv"]["p"] = [[-7.81014427, -5.60956681, -1.98079819],
+                        [0.738098796, 4.63658692, 1.9693136],
+                        [-0.000712174377, -0.00230478303, -0.00105865966]]
+        b["pv"]["v"] = [[0.0030723249, -0.00406995477, -0.00181335842],
+                        [-0.00755816922, 0.00126913722, 0.000727999001],
+                        [6.29235213e-6, -3.30888387e-7, -2.96486623e-7]]
+        ob = np.array([-0.974170437, -0.2115201, -0.0917583114])
+        sc = rng.normal(size=(size, 3))
+        sc /= np.linalg.norm(sc, axis=-1, keepdims=True)
+        if not shared:
+            # Bodies and observer repeated for each star, as when they are
+            # taken from per-star arrays.
+            b = np.repeat(b[np.newaxis], size, axis=0)
+            ob = np.repeat(ob[np.newaxis], size, axis=0)
+        self.args = b, ob, sc
+
+    def time_ldn(self, size, shared):
+        erfa.ldn(*self.args)
@@ -0,0 +1,27 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Indexed leap-second lookups versus the ERFA functions."""
+
+import numpy as np
+
+import erfa
+
+
+class TimeLeapSeconds:
+    params = ([1_000, 1_000_000], [False, True])
+    param_names = ["size", "indexed"]
+
+    def setup(self, size, indexed):
+        self.module = erfa.leap_seconds if indexed else erfa
+        rng = np.random.default_rng(0)
+        self.jd1 = rng.uniform(2442000.5, 2460000.5, size)
+        self.jd2 = rng.uniform(-0.5, 0.5, size)
+        self.date = erfa.jd2cal(self.jd1, self.jd2)
+
+    def time_dat(self, size, indexed):
+        self.module.dat(*self.date)
+
+    def time_utctai(self, size, indexed):
+        self.module.utctai(self.jd1, self.jd2)
+
+    def time_taiutc(self, size, indexed):
+        self.module.taiutc(self.jd1, self.jd2)
@@ -0,0 +1,35 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Evaluation in a pool of processes versus a single call."""
+
+import numpy as np
+
+import erfa
+from erfa import parallel
+
+
+class TimeExecutor:
+    params = ([10_000, 1_000_000], ["pnm06a", "atco13"])
+    param_names = ["size", "function"]
+    timeout = 600
+
+    def setup(self, size, function):
+        jd2 = np.linspace(0.0, 1.0, size)
+        self.func = getattr(erfa, function)
+        self.args = {
+            "pnm06a": (2460000.5, jd2),
+            "atco13": (1.0, 0.5, 0.0, 0.0, 0.0, 0.0, 2460000.5, jd2, 0.0,
+                       -1.228798, -0.42982, 2669.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+                       2.5),
+        }[function]
+        self.executor = parallel.Executor()
+        # Start the workers.
+        self.executor.apply(erfa.anp, [0.0, 1.0])
+
+    def teardown(self, size, function):
+        self.executor.shutdown()
+
+    def time_serial(self, size, function):
+        self.func(*self.args)
+
+    def time_executor(self, size, function):
+        self.executor.apply(self.func, *self.args)
@@ -0,0 +1,25 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Single-value calls of the array wrappers versus erfa.scalar."""
+
+import erfa
+from erfa import scalar
+
+
+class TimeScalar:
+    params = [False, True]
+    param_names = ["scalar"]
+
+    def setup(self, use_scalar):
+        self.module = scalar if use_scalar else erfa
+
+    def time_cal2jd(self, use_scalar):
+        self.module.cal2jd(2024, 1, 1)
+
+    def time_era00(self, use_scalar):
+        self.module.era00(2460000.5, 0.25)
+
+    def time_c2s(self, use_scalar):
+        self.module.c2s((1.0, 2.0, 3.0))
+
+    def time_pnm06a(self, use_scalar):
+        self.module.pnm06a(2460000.5, 0.25)
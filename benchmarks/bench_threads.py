@@ -0,0 +1,35 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Scaling of the ufunc loops with the number of threads."""
+
+import os
+
+import numpy as np
+
+import erfa
+
+
+class TimeThreadScaling:
+    params = (
+        ["atco13", "pnm06a", "anp"],
+        sorted({1, 2, 4, 8, os.cpu_count() or 1}),
+    )
+    param_names = ["function", "n_threads"]
+
+    def setup(self, function, n_threads):
+        self.n_threads = erfa.get_num_threads()
+        erfa.set_num_threads(n_threads)
+        jd = np.linspace(2450000.0, 2460000.0, 1_000_000)
+        self.func = getattr(erfa.ufunc, function)
+        self.args = {
+            "atco13": (2.71, 0.174, 1e-5, 5e-6, 0.1, 55.0, jd, 0.5, 0.3,
+                       -0.52, -0.42, 2738.0, 2.5e-7, 1.5e-6, 731.0, 12.8, 0.59,
+                       0.55),
+            "pnm06a": (jd, 0.5),
+            "anp": (jd,),
+        }[function]
+
+    def teardown(self, function, n_threads):
+        erfa.set_num_threads(self.n_threads)
+
+    def time_ufunc(self, function, n_threads):
+        self.func(*self.args)
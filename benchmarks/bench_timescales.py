@@ -0,0 +1,31 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Fused time-scale conversion versus a chain of ERFA functions."""
+
+import numpy as np
+
+import erfa
+
+
+def utc_to_tt(jd1, jd2):
+    return erfa.taitt(*erfa.utctai(jd1, jd2))
+
+
+def utc_to_tdb(jd1, jd2):
+    tt = utc_to_tt(jd1, jd2)
+    return erfa.tttdb(*tt, erfa.dtdb(*tt, 0.0, 0.0, 0.0, 0.0))
+
+
+class TimeFromUtc:
+    params = ([1_000, 1_000_000], ["tt", "tdb"])
+    param_names = ["size", "scale"]
+
+    def setup(self, size, scale):
+        self.jd1 = 2460000.5
+        self.jd2 = np.linspace(0.0, 1.0, size)
+        self.chain = utc_to_tt if scale == "tt" else utc_to_tdb
+
+    def time_chain(self, size, scale):
+        self.chain(self.jd1, self.jd2)
+
+    def time_convert_timescale(self, size, scale):
+        erfa.convert_timescale(self.jd1, self.jd2, "utc", scale)
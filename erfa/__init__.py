@@ -4,7 +4,9 @@
 # if a system liberfa is too old.
 from .version import version as __version__  # noqa: I001
 
-from .core import *
+import importlib
+
+from . import core
 from .ufunc import (
     dt_eraASTROM,
     dt_eraLDBODY,
@@ -15,5 +17,71 @@ from .ufunc import (
     dt_ymdf,
     dt_hmsf,
     dt_dmsf,
+    get_num_threads,
+    set_num_threads,
+)
+from . import (
+    bulk,
+    cache,
+    eop,
+    fast,
+    interp,
+    leap_seconds,
+    profiling,
+    scalar,
+    stream,
+    views,
 )
-from . import leap_seconds
+from .cache import AstromCache
+from .profiling import profile
+
+__all__ = [
+    "AstromCache",
+    "aio",
+    "bulk",
+    "cache",
+    "core",
+    "dt_dmsf",
+    "dt_eraASTROM",
+    "dt_eraLDBODY",
+    "dt_eraLEAPSECOND",
+    "dt_hmsf",
+    "dt_pv",
+    "dt_sign",
+    "dt_type",
+    "dt_ymdf",
+    "eop",
+    "fast",
+    "get_num_threads",
+    "interp",
+    "leap_seconds",
+    "parallel",
+    "profile",
+    "profiling",
+    "scalar",
+    "set_num_threads",
+    "stream",
+    "ufunc",
+    "version",
+    "views",
+]
+__all__ += core.__all__
+
+# Submodules that need slow imports (asyncio, multiprocessing), and are
+# therefore only imported when first used.
+_LAZY_SUBMODULES = {"aio", "parallel"}
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    # Everything in erfa.core is available here, but its wrappers are only
+    # imported when they are first used (see erfa.core.__getattr__).
+    if name not in core.__all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(core, name)
+    return value
+
+
+def __dir__():
+    return sorted(globals().keys() | set(core.__all__) | _LAZY_SUBMODULES)
@@ -0,0 +1,8 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Python wrappers of the ERFA functions, in groups as in ``erfa.h``.
+
+The modules in this package are generated by erfa_generator.py.  They are
+imported by `erfa.core` only once one of their functions is used, so that
+importing `erfa` does not have to define all wrappers and their docstrings.
+"""
@@ -0,0 +1,89 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Binary tables that can be memory-mapped.
+
+A table file consists of a magic string, the length of a JSON header as
+a little-endian 32-bit integer, the JSON header itself (padded with spaces
+such that the data are aligned to 64 bytes), and the raw array data.
+The header holds the dtype and shape of the data, as well as any metadata.
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"\x93ERFATAB"
+ALIGNMENT = 64
+
+
+def write(path, data, **meta):
+    """Write an array and its metadata to a table file.
+
+    The file is first written to a temporary file next to it, which is
+    then moved into place, so that readers never see a partial table.
+
+    Parameters
+    ----------
+    path : str or `~pathlib.Path`
+        Name of the file to write.
+    data : array_like
+        Data to store.  Structured dtypes are not supported.
+    **meta
+        Metadata to store, which should be serializable by `json`.
+    """
+    path = Path(path)
+    data = np.ascontiguousarray(data)
+    if data.dtype.names is not None:
+        raise TypeError("structured arrays cannot be stored in a table.")
+    header = json.dumps(
+        {"dtype": data.dtype.str, "shape": data.shape, "meta": meta}
+    ).encode()
+    size = len(MAGIC) + 4 + len(header)
+    header += b" " * (-size % ALIGNMENT)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+            f.write(data.tobytes())
+        tmp.replace(path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def read(path):
+    """Memory-map the array in a table file.
+
+    Parameters
+    ----------
+    path : str or `~pathlib.Path`
+        Name of the file to read.
+
+    Returns
+    -------
+    data : `~numpy.memmap`
+        Read-only memory map of the stored array.
+    meta : dict
+        The stored metadata.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a valid table.
+    """
+    path = Path(path)
+    with path.open("rb") as f:
+        start = f.read(len(MAGIC) + 4)
+        if len(start) < len(MAGIC) + 4 or not start.startswith(MAGIC):
+            raise ValueError(f"{path} is not an ERFA table file.")
+        (header_size,) = struct.unpack("<I", start[len(MAGIC) :])
+        header = json.loads(f.read(header_size))
+    dtype = np.dtype(header["dtype"])
+    shape = tuple(header["shape"])
+    offset = len(MAGIC) + 4 + header_size
+    if path.stat().st_size != offset + dtype.itemsize * int(np.prod(shape)):
+        raise ValueError(f"{path} is truncated or corrupted.")
+    data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+    return data, header["meta"]
@@ -0,0 +1,84 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Coroutine versions of the ERFA functions, for use with `asyncio`.
+
+For every function in `erfa`, this module has a coroutine function with the
+same name and arguments, which runs the function in a thread, so that the
+event loop is not blocked while it is calculating.  This gives real overlap
+with other work, such as I/O, because the ufunc loops do not hold the GIL:
+they do not use the Python C API, and none of the dtypes they are registered
+for, including the structured ones like ``eraASTROM`` and ``eraLDBODY``,
+holds Python objects, so `numpy` releases the GIL around them (except for
+calls with fewer than a few hundred elements).
+
+Example
+-------
+>>> import asyncio
+>>> import erfa
+>>> from erfa import aio
+>>> async def main():
+...     return await aio.cal2jd(2024, 1, 1)
+>>> djm0, djm = asyncio.run(main())
+>>> float(djm)
+60310.0
+
+The functions are run with the event loop's default executor, unless
+another `concurrent.futures.Executor` is passed in with ``executor``.
+"""
+
+import asyncio
+import functools
+import inspect
+
+from . import core
+
+__all__ = ["run"]
+
+
+async def run(func, *args, executor=None, **kwargs):
+    """Run a function in a thread, without blocking the event loop.
+
+    Parameters
+    ----------
+    func : callable
+        Function to run, such as one from `erfa`.
+    *args, **kwargs
+        Arguments for ``func``.
+    executor : `concurrent.futures.Executor`, optional
+        Executor to run the function in.  Default: the default executor of
+        the event loop.
+
+    Returns
+    -------
+    result
+        As returned by ``func``.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+def _coroutine_function(name):
+    async def coroutine_function(*args, executor=None, **kwargs):
+        # Look up the function on each call, so that, e.g., erfa.profile()
+        # sees the calls.
+        return await run(getattr(core, name), *args, executor=executor,
+                         **kwargs)
+
+    coroutine_function.__name__ = coroutine_function.__qualname__ = name
+    coroutine_function.__doc__ = (
+        f"Coroutine version of `erfa.{name}`, run in a thread.\n\n"
+        "Takes the same arguments, as well as ``executor``, the\n"
+        "`concurrent.futures.Executor` to use (default: the one of\n"
+        "the event loop)."
+    )
+    return coroutine_function
+
+
+def __getattr__(name):
+    # The coroutine functions are created on first use, like the wrappers
+    # in erfa.core are imported on first use.
+    if name not in core.__all__ or not inspect.isfunction(getattr(core, name)):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = _coroutine_function(name)
+    return value
@@ -0,0 +1,201 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Products with a single rotation matrix, evaluated with BLAS.
+
+The functions here are equivalent to `erfa.rxp`, `erfa.trxp`, `erfa.rxpv`
+and `erfa.rxr`, but if a single matrix is applied to many vectors (or, for
+`rxr`, many matrices are multiplied by a single one from the right), all
+products are evaluated with one call to `numpy.matmul`, which uses the
+optimized (and possibly multi-threaded) ``dgemm`` of the BLAS library that
+`numpy` is linked to.  This is typical when, e.g., many star vectors are
+rotated by one precession-nutation matrix.  For stacks of matrices, BLAS
+offers no advantage, and the ERFA ufuncs are used.
+
+Since BLAS may add the products in a different order, or use fused
+multiply-add instructions, the results can differ from those of ERFA in the
+last bit.
+
+The functions can also be accessed via a ``bulk=True`` argument of their
+`erfa` counterparts.
+
+Example
+-------
+>>> import numpy as np
+>>> import erfa
+>>> rbpn = erfa.pnm06a(2460000.5, 0.0)
+>>> p = erfa.s2c(np.linspace(0.0, 6.0, 1000), 0.5)
+>>> erfa.rxp(rbpn, p, bulk=True).shape
+(1000, 3)
+"""
+
+import numpy as np
+
+from . import core, ufunc
+
+__all__ = ["rxp", "rxpv", "rxr", "trxp"]
+
+
+def _single_matrix(r, axis, *others):
+    """Get r as an array of doubles if it is a single matrix, else `None`.
+
+    `None` is also returned if ``axis`` does not fit a single matrix, or if
+    any of ``r`` and ``others`` is an instance of an `~numpy.ndarray`
+    subclass, which the ufuncs may treat differently.
+    """
+    if any(isinstance(a, np.ndarray) and type(a) is not np.ndarray
+           for a in (r, *others)):
+        return None
+    r = np.asarray(r, dtype=np.float64)
+    if r.shape != (3, 3) or axis not in (None, 0, -1):
+        return None
+    return r
+
+
+def _rows_times(rows, m, out):
+    """Calculate ``rows @ m``, for rows of three elements, as one product."""
+    shape = rows.shape
+    if out is None:
+        return np.matmul(rows.reshape(-1, 3), m).reshape(shape)
+    if out.shape != shape:
+        raise ValueError(f"output has shape {out.shape} instead of {shape}.")
+    if out.flags.c_contiguous:
+        np.matmul(rows.reshape(-1, 3), m, out=out.reshape(-1, 3))
+    else:
+        np.copyto(out, np.matmul(rows.reshape(-1, 3), m).reshape(shape))
+    return out
+
+
+def _rotate(m, p, out, axis):
+    """Calculate ``m @ p`` for vectors ``p`` along ``axis``.
+
+    Returns `None` if ``p`` does not have vectors along ``axis``.
+    """
+    p = np.asarray(p, dtype=np.float64)
+    axis = -1 if axis is None else axis
+    if p.ndim == 0 or p.shape[axis] != 3:
+        return None
+    if axis == 0 and p.ndim <= 2:
+        # Components along the first axis: a single product as is.
+        return np.matmul(m, p) if out is None else np.matmul(m, p, out=out)
+    result = _rows_times(
+        np.moveaxis(p, axis, -1), m.T,
+        None if out is None else np.moveaxis(out, axis, -1),
+    )
+    return np.moveaxis(result, -1, axis) if out is None else out
+
+
+def rxp(r, p, *, out=None, axis=None):
+    """Multiply a p-vector by an r-matrix, as `erfa.rxp`.
+
+    Parameters
+    ----------
+    r : double array
+        Rotation matrix (or matrices).
+    p : double array
+        Vector(s).
+    out : double array, optional
+        Array in which to store the result.
+    axis : int, optional
+        Axis along which the vector (and matrix) components are, as in
+        `erfa.rxp`.  Default: the last one(s).
+
+    Returns
+    -------
+    rp : double array
+        ``r * p``.  If ``r`` is a single matrix, calculated with BLAS.
+    """
+    m = _single_matrix(r, axis, p, out)
+    if m is not None and (result := _rotate(m, p, out, axis)) is not None:
+        return result
+    return core.rxp(r, p, out=out, axis=axis)
+
+
+def trxp(r, p, *, out=None, axis=None):
+    """Multiply a p-vector by the transpose of an r-matrix, as `erfa.trxp`.
+
+    Parameters
+    ----------
+    r : double array
+        Rotation matrix (or matrices).
+    p : double array
+        Vector(s).
+    out : double array, optional
+        Array in which to store the result.
+    axis : int, optional
+        Axis along which the vector (and matrix) components are, as in
+        `erfa.trxp`.  Default: the last one(s).
+
+    Returns
+    -------
+    trp : double array
+        ``r^T * p``.  If ``r`` is a single matrix, calculated with BLAS.
+    """
+    m = _single_matrix(r, axis, p, out)
+    if m is not None and (result := _rotate(m.T, p, out, axis)) is not None:
+        return result
+    return core.trxp(r, p, out=out, axis=axis)
+
+
+def rxpv(r, pv, *, out=None, axis=None):
+    """Multiply a pv-vector by an r-matrix, as `erfa.rxpv`.
+
+    Parameters
+    ----------
+    r : double array
+        Rotation matrix (or matrices).
+    pv : `erfa.dt_pv` array
+        Position-velocity vector(s).
+    out : `erfa.dt_pv` array, optional
+        Array in which to store the result.
+    axis : int, optional
+        Axes along which the matrix components are, as in `erfa.rxpv`.
+        Default: the last two.
+
+    Returns
+    -------
+    rpv : `erfa.dt_pv` array
+        ``r * pv``.  If ``r`` is a single matrix, calculated with BLAS.
+    """
+    m = _single_matrix(r, axis, pv, out)
+    pv = np.asanyarray(pv)
+    # A single pv-vector goes to the ufunc too, which returns a scalar.
+    if (
+        m is None
+        or pv.ndim == 0
+        or pv.dtype != ufunc.dt_pv
+        or (out is not None and out.dtype != ufunc.dt_pv)
+    ):
+        return core.rxpv(r, pv, out=out, axis=axis)
+    if out is None:
+        out = np.empty(pv.shape, ufunc.dt_pv)
+    # View position and velocity as rows of a (..., 2, 3) array of doubles.
+    vectors = pv.view((np.float64, (2, 3)))
+    _rows_times(vectors, m.T, out.view((np.float64, (2, 3))))
+    return out
+
+
+def rxr(a, b, *, out=None, axis=None):
+    """Multiply two r-matrices, as `erfa.rxr`.
+
+    Parameters
+    ----------
+    a : double array
+        Rotation matrix (or matrices) on the left.
+    b : double array
+        Rotation matrix (or matrices) on the right.
+    out : double array, optional
+        Array in which to store the result.
+    axis : int, optional
+        Axis at which the matrix components start, as in `erfa.rxr`.
+        Default: the last two axes.
+
+    Returns
+    -------
+    atb : double array
+        ``a * b``.  If ``b`` is a single matrix, and the components are
+        along the last two axes, calculated with BLAS.
+    """
+    if (m := _single_matrix(b, axis, a, out)) is not None and axis != 0:
+        a = np.asarray(a, dtype=np.float64)
+        if a.shape[-2:] == (3, 3):
+            return _rows_times(a, m, out)
+    return core.rxr(a, b, out=out, axis=axis)
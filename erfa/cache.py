@@ -0,0 +1,155 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Caching of star-independent astrometry parameters.
+
+Calculating the ``eraASTROM`` context with `~erfa.apco13`, `~erfa.apci13`
+or `~erfa.apcg13` is far more expensive than using it to transform star
+positions with, e.g., `~erfa.atciq` and `~erfa.atioq`.  An `AstromCache`
+keeps the contexts for the most recently used inputs, so that repeated
+requests for the same epoch and site can reuse them.
+
+Example
+-------
+>>> import erfa
+>>> cache = erfa.AstromCache(maxsize=16)
+>>> astrom, eo = cache.apci13(2460000.5, 0.25)
+>>> cache.apci13(2460000.5, 0.25).astrom is astrom
+True
+>>> ri, di = erfa.atciq(1.0, 0.5, 0.0, 0.0, 0.0, 0.0, astrom)
+>>> cache.cache_info()
+CacheInfo(hits=1, misses=1, maxsize=16, currsize=1)
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from . import core
+
+__all__ = ["AstromCache"]
+
+
+CacheInfo = namedtuple("CacheInfo", "hits, misses, maxsize, currsize")
+
+
+def _key(arg):
+    """Hashable key for an argument, numbers for scalars, bytes for arrays."""
+    arg = np.asanyarray(arg)
+    if arg.ndim == 0 and arg.dtype.kind in "fiu":
+        return arg.item()
+    return (arg.dtype.str, arg.shape, arg.tobytes())
+
+
+def _read_only(value):
+    """Make array results read-only, so that cached contexts are not changed."""
+    if isinstance(value, tuple):
+        return type(value)(*map(_read_only, value))
+    if isinstance(value, np.generic) and value.dtype.names:
+        value = np.array(value)
+        value.flags.writeable = False
+        return value[()]
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+    return value
+
+
+class AstromCache:
+    """LRU cache of ``eraASTROM`` contexts.
+
+    The `apco13`, `apci13` and `apcg13` methods are like the `erfa`
+    functions, but return cached results if they were called before with
+    the same inputs.  The results can be passed on to functions such as
+    `~erfa.atciq` and `~erfa.atioq` directly.  Any arrays in them are
+    read-only, since they may be shared between callers.
+
+    Parameters
+    ----------
+    maxsize : int or None, optional
+        Maximum number of results to keep.  If more are added, those used
+        least recently are removed.  If `None`, all results are kept.
+        Default: 128.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Number of calls for which the result was or was not in the cache.
+
+    Notes
+    -----
+    Inputs are compared by value, so, e.g., times should be rounded to the
+    precision needed for the cache to be effective.  ERFA warnings are only
+    emitted when a result is calculated, not when it is taken from the cache.
+    The cache does not know about changes to the leap second table used by
+    `apco13`; use `cache_clear` after changing it with `erfa.leap_seconds`.
+    The cache can be shared between threads.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._results)
+
+    def cache_info(self):
+        """Cache statistics, like for `functools.lru_cache`.
+
+        Returns
+        -------
+        info : namedtuple
+            With ``hits``, ``misses``, ``maxsize``, and ``currsize``.
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+    def cache_clear(self):
+        """Remove all results from the cache and reset the statistics."""
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+    def _get(self, func_name, args, fast):
+        key = (func_name, fast, *map(_key, args))
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = _read_only(getattr(core, func_name)(*args, fast=fast))
+        with self._lock:
+            self._results[key] = result
+            if self.maxsize is not None and len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def apco13(self, utc1, utc2, dut1, elong, phi, hm, xp, yp, phpa, tc, rh, wl,
+               *, fast=False):
+        """Cached version of `erfa.apco13`.
+
+        Parameters and returns are as for `erfa.apco13`.
+        """
+        return self._get(
+            "apco13",
+            (utc1, utc2, dut1, elong, phi, hm, xp, yp, phpa, tc, rh, wl),
+            fast,
+        )
+
+    def apci13(self, date1, date2, *, fast=False):
+        """Cached version of `erfa.apci13`.
+
+        Parameters and returns are as for `erfa.apci13`.
+        """
+        return self._get("apci13", (date1, date2), fast)
+
+    def apcg13(self, date1, date2, *, fast=False):
+        """Cached version of `erfa.apcg13`.
+
+        Parameters and returns are as for `erfa.apcg13`.
+        """
+        return self._get("apcg13", (date1, date2), fast)
@@ -0,0 +1,373 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Earth orientation parameters.
+
+This module keeps a series of Earth orientation parameters (EOP), as
+published by the IERS, and interpolates it for arrays of epochs, using the
+functions 'set', 'get', 'write', 'load', and 'interpolate'.  The series has
+columns
+
+    mjd
+        UTC epoch as Modified Julian Date, strictly increasing.
+    dut1
+        UT1-UTC (s).
+    xp, yp
+        Coordinates of the pole (radians).
+    dx, dy
+        Celestial pole offsets dX, dY (radians).
+
+Note that the IERS tables give polar motion in arcsec and the celestial
+pole offsets in mas, which can be converted with `erfa.DAS2R`.
+
+The series is interpolated linearly, using an index computed directly from
+the epoch if the series is equally spaced (as the IERS daily series are).
+For UT1-UTC, the jumps at leap seconds are taken into account, i.e., within
+the day before a leap second, UT1-UTC continues to follow the trend of the
+previous days.
+
+With 'write', a series is stored in a binary file, which 'load' maps into
+memory, rather than reading it.  Hence, processes that load the same file,
+such as workers of `erfa.parallel.Executor` started with an initializer
+calling 'load', share the series through the page cache of the operating
+system.  If no series has been set or loaded, the file given by the
+``PYERFA_EOP_FILE`` environment variable, if any, is loaded on first use
+(so that this is also done in worker processes that inherit the
+environment).
+
+The functions 'apco13', 'atco13', 'c2t06a' and 'pom00' are versions of the
+`erfa` functions that take the Earth orientation parameters they need from
+the series, interpolated to the UTC epochs given.
+
+Example
+-------
+>>> import numpy as np
+>>> import erfa
+>>> from erfa import eop
+>>> mjd = np.arange(60000.0, 60010.0)
+>>> eop.set({"mjd": mjd, "dut1": -0.01 * (mjd - 60000.0),
+...          "xp": np.full(10, 0.1 * erfa.DAS2R),
+...          "yp": np.full(10, 0.3 * erfa.DAS2R)})
+>>> result = eop.interpolate(erfa.DJM0, [60001.0, 60001.5])
+>>> result.dut1
+array([-0.01 , -0.015])
+>>> eop.set(None)
+"""
+
+import os
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+from . import _table, core, leap_seconds, ufunc
+from .core import DJM0, ErfaWarning
+
+__all__ = [
+    "COLUMNS",
+    "EopResult",
+    "apco13",
+    "atco13",
+    "c2t06a",
+    "get",
+    "interpolate",
+    "load",
+    "pom00",
+    "set",
+    "validate",
+    "write",
+]
+
+COLUMNS = ("mjd", "dut1", "xp", "yp", "dx", "dy")
+"""Columns of the series, in the order in which they are stored."""
+_DTYPE = np.dtype([(name, "f8") for name in COLUMNS])
+
+EopResult = namedtuple("EopResult", "dut1, xp, yp, dx, dy")
+
+_data = None
+"""Current series, as a (n, 6) array of doubles (possibly memory-mapped)."""
+_step = None
+"""Spacing of the epochs in the current series, or `None` if not uniform."""
+
+
+def validate(table):
+    """Validate a series of Earth orientation parameters.
+
+    Parameters
+    ----------
+    table : dict, structured array or array_like
+        Should have 'mjd', 'dut1', 'xp', and 'yp' entries or fields, and can
+        have 'dx' and 'dy' (which are taken to be zero if absent), in the
+        units given in the module documentation.  Alternatively, an array
+        with shape ``(n, 6)``, with the columns in the order of `COLUMNS`.
+
+    Returns
+    -------
+    data : `~numpy.ndarray`
+        The series as a (n, 6) array of doubles, with the columns in the
+        order of `COLUMNS`.
+
+    Raises
+    ------
+    KeyError
+        If a required column is missing.
+    ValueError
+        If the series has fewer than two epochs, if the epochs are not
+        strictly increasing, or if columns do not have the same length.
+    """
+    if isinstance(table, dict):
+        names = table.keys()
+    else:
+        table = np.asanyarray(table)
+        if table.dtype.names is None:
+            if table.ndim != 2 or table.shape[1] != len(COLUMNS):
+                raise ValueError(
+                    f"an array without fields should have shape (n, {len(COLUMNS)}), "
+                    f"not {table.shape}."
+                )
+            table = dict(zip(COLUMNS, table.T))
+            names = COLUMNS
+        else:
+            names = table.dtype.names
+    for name in COLUMNS[:4]:
+        if name not in names:
+            raise KeyError(f"the series has no {name!r} column.")
+    mjd = np.asarray(table["mjd"], dtype=float)
+    if mjd.ndim != 1 or mjd.size < 2:
+        raise ValueError("need a one-dimensional series with at least two epochs.")
+    if not np.all(np.diff(mjd) > 0.0):
+        raise ValueError("the epochs of the series are not strictly increasing.")
+    data = np.zeros((mjd.size, len(COLUMNS)))
+    for i, name in enumerate(COLUMNS):
+        # Only the celestial pole offsets are optional.
+        if name in names:
+            data[:, i] = table[name]
+    return data
+
+
+def _use(data):
+    global _data, _step
+    diff = np.diff(data[:, 0])
+    _step = diff[0] if np.all(diff == diff[0]) else None
+    _data = data
+
+
+def set(table=None):
+    """Set the series of Earth orientation parameters.
+
+    Parameters
+    ----------
+    table : dict, structured array, array_like or `None`
+        Series with 'mjd', 'dut1', 'xp', 'yp', and, optionally, 'dx' and
+        'dy' entries, or an array with shape ``(n, 6)``, as for `validate`.
+        If `None`, remove the current series.
+
+    Raises
+    ------
+    KeyError
+        If a required column is missing.
+    ValueError
+        If the series is not valid.
+    """
+    global _data, _step
+    if table is None:
+        _data = _step = None
+    else:
+        _use(validate(table))
+
+
+def load(path):
+    """Memory-map a series of Earth orientation parameters from a file.
+
+    Parameters
+    ----------
+    path : str or `~pathlib.Path`
+        File written by `write`.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a valid file of Earth orientation parameters.
+    """
+    data, meta = _table.read(path)
+    if tuple(meta.get("columns", ())) != COLUMNS or data.ndim != 2:
+        raise ValueError(f"{path} does not hold Earth orientation parameters.")
+    _use(data)
+
+
+def write(path, table=None):
+    """Write a series of Earth orientation parameters to a file.
+
+    The file can be memory-mapped with `load`.
+
+    Parameters
+    ----------
+    path : str or `~pathlib.Path`
+        Name of the file to write.
+    table : dict, structured array, array_like or `None`
+        Series to write, as for `set`.  Default: the current one.
+    """
+    data = _current() if table is None else validate(table)
+    _table.write(path, data, columns=COLUMNS)
+
+
+def _current():
+    if _data is None:
+        if path := os.environ.get("PYERFA_EOP_FILE"):
+            load(path)
+        else:
+            raise ValueError(
+                "no Earth orientation parameters available; use "
+                "erfa.eop.set() or erfa.eop.load(), or set PYERFA_EOP_FILE."
+            )
+    return _data
+
+
+def get():
+    """Get the current series of Earth orientation parameters.
+
+    Returns
+    -------
+    table : `~numpy.ndarray`
+        Structured array with fields as given by `COLUMNS`, which shares
+        memory with the series.
+
+    Raises
+    ------
+    ValueError
+        If no series is set and ``PYERFA_EOP_FILE`` is not set either.
+    """
+    return _current().view(_DTYPE)[:, 0]
+
+
+def interpolate(utc1, utc2):
+    """Interpolate the Earth orientation parameters to UTC epochs.
+
+    Parameters
+    ----------
+    utc1, utc2 : double array
+        UTC as a 2-part quasi Julian Date.
+
+    Returns
+    -------
+    A ``EopResult`` namedtuple with the following attributes:
+    dut1 : double array
+        UT1-UTC (s).
+    xp, yp : double array
+        Coordinates of the pole (radians).
+    dx, dy : double array
+        Celestial pole offsets (radians).
+
+    Raises
+    ------
+    ValueError
+        If no series is set and ``PYERFA_EOP_FILE`` is not set either.
+
+    Notes
+    -----
+    For epochs outside the series, the values at its first or last epoch are
+    used, and an `ErfaWarning` is emitted.
+    """
+    data = _current()
+    mjd = (np.asarray(utc1, dtype=float) - DJM0) + utc2
+    epochs = data[:, 0]
+    last = len(epochs) - 1
+    if _step is not None:
+        x = (mjd - epochs[0]) / _step
+    else:
+        x = np.searchsorted(epochs, mjd, side="right") - 1.0
+    # Index of the interval (fmax and fmin map NaN to the first one, for
+    # which the weight will then be NaN).
+    index = np.fmin(np.fmax(x, 0.0), last - 1.0).astype(np.intp)
+    start = epochs.take(index)
+    weight = (mjd - start) / (epochs.take(index + 1) - start)
+    outside = (weight < 0.0) | (weight > 1.0)
+    if outside.any():
+        warnings.warn(
+            f"{np.count_nonzero(outside)} of {outside.size} epochs outside "
+            f"the Earth orientation parameters (MJD {epochs[0]} to "
+            f"{epochs[last]}); using the values at the nearest end.",
+            ErfaWarning,
+            stacklevel=2,
+        )
+        weight = np.clip(weight, 0.0, 1.0)
+    values = []
+    for i in range(1, len(COLUMNS)):
+        value0 = data[:, i].take(index)
+        change = data[:, i].take(index + 1) - value0
+        if i == 1:
+            # Remove any leap second from the change in UT1-UTC.
+            change -= np.round(change)
+        values.append(value0 + weight * change)
+    return EopResult(*values)
+
+
+def apco13(utc1, utc2, elong, phi, hm, phpa, tc, rh, wl, **kwargs):
+    """Prepare for ICRS <-> observed transformations, as `erfa.apco13`.
+
+    Takes the same arguments as `erfa.apco13`, except ``dut1``, ``xp`` and
+    ``yp``, which are interpolated from the Earth orientation parameters.
+    """
+    eop = interpolate(utc1, utc2)
+    return core.apco13(utc1, utc2, eop.dut1, elong, phi, hm, eop.xp, eop.yp,
+                       phpa, tc, rh, wl, **kwargs)
+
+
+def atco13(rc, dc, pr, pd, px, rv, utc1, utc2, elong, phi, hm, phpa, tc, rh,
+           wl, **kwargs):
+    """ICRS RA,Dec to observed place, as `erfa.atco13`.
+
+    Takes the same arguments as `erfa.atco13`, except ``dut1``, ``xp`` and
+    ``yp``, which are interpolated from the Earth orientation parameters.
+    """
+    eop = interpolate(utc1, utc2)
+    return core.atco13(rc, dc, pr, pd, px, rv, utc1, utc2, eop.dut1, elong,
+                       phi, hm, eop.xp, eop.yp, phpa, tc, rh, wl, **kwargs)
+
+
+def _utctt(utc1, utc2):
+    tai1, tai2 = leap_seconds.utctai(utc1, utc2)
+    return core.taitt(tai1, tai2)
+
+
+def c2t06a(utc1, utc2, **kwargs):
+    """Form the celestial to terrestrial matrix, as `erfa.c2t06a`.
+
+    Parameters
+    ----------
+    utc1, utc2 : double array
+        UTC as a 2-part quasi Julian Date, from which TT and UT1 are derived
+        using the leap-second table and the interpolated UT1-UTC.
+    **kwargs
+        Further arguments for `erfa.c2t06a`, such as ``out``.
+
+    Returns
+    -------
+    rc2t : double array
+        Celestial-to-terrestrial matrix, including polar motion from the
+        interpolated Earth orientation parameters.
+    """
+    eop = interpolate(utc1, utc2)
+    tt1, tt2 = _utctt(utc1, utc2)
+    ut11, ut12 = core.utcut1(utc1, utc2, eop.dut1)
+    return core.c2t06a(tt1, tt2, ut11, ut12, eop.xp, eop.yp, **kwargs)
+
+
+def pom00(utc1, utc2, **kwargs):
+    """Form the polar motion matrix, as `erfa.pom00`.
+
+    Parameters
+    ----------
+    utc1, utc2 : double array
+        UTC as a 2-part quasi Julian Date, for which to interpolate the
+        coordinates of the pole, and, after conversion to TT, to calculate
+        the TIO locator s' with `erfa.sp00`.
+    **kwargs
+        Further arguments for `erfa.pom00`, such as ``out``.
+
+    Returns
+    -------
+    rpom : double array
+        Polar-motion matrix.
+    """
+    eop = interpolate(utc1, utc2)
+    sp = ufunc.sp00(*_utctt(utc1, utc2))
+    return core.pom00(eop.xp, eop.yp, sp, **kwargs)
@@ -0,0 +1,433 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Fast approximations of expensive ERFA functions.
+
+`epv00` evaluates the Earth ephemeris from a table of Chebyshev series,
+each covering 10 days between 1900 and 2100 (the range for which the
+full series of `erfa.epv00` is valid), rather than summing the full series.
+The Chebyshev series differ from the full series by less than 1e-12 au for
+positions and 1e-12 au/d for velocities, i.e., much less than the
+uncertainty of the series itself (a few km and mm/s, respectively).
+
+Similarly, `dtdb` evaluates the geocentric part of TDB-TT from a table of
+Chebyshev series, each covering 15 days, which differ from the full
+Fairhead & Bretagnon series by less than 1e-12 s.  The topocentric terms
+are calculated exactly as in `erfa.dtdb`.
+
+For dates outside the tables, the full series are used.
+
+The tables are generated the first time they are needed, which takes some
+seconds, and then stored in ``<name>-<liberfa version>.bin`` files in the
+directory given by the ``PYERFA_CACHE_DIR`` environment variable, defaulting
+to ``$XDG_CACHE_HOME/pyerfa`` (or ``~/.cache/pyerfa``).  Later uses
+memory-map the stored tables.  If the directory is not writable, the tables
+are only kept in memory.  Tables can also be generated explicitly using
+`generate_table`.
+
+The functions `apcg13`, `apci13` and `apco13` are identical to their
+`erfa` counterparts, except that they use the fast `epv00`.  All functions
+can also be accessed via a ``fast=True`` argument of their `erfa`
+counterparts.
+"""
+
+import contextlib
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from . import _table, core, ufunc
+from .interp import _chebyshev_evaluate, _chebyshev_fit_matrices
+from .version import erfa_version
+
+__all__ = ["apcg13", "apci13", "apco13", "dtdb", "epv00", "generate_table"]
+
+
+def _cache_dir():
+    if cache_dir := os.environ.get("PYERFA_CACHE_DIR"):
+        return Path(cache_dir)
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg_cache) / "pyerfa"
+
+
+class _ChebyshevTable:
+    """Table of Chebyshev series for a function of a two-part date.
+
+    Parameters
+    ----------
+    name : str
+        Name of the table, used for the cache file.
+    func : callable
+        Function that calculates the values to tabulate for a two-part
+        date, with all components along the last axis.
+    start, stop : float
+        Julian dates delimiting the table.
+    segment : float
+        Number of days covered by each Chebyshev series.
+    degree : int
+        Degree of the Chebyshev series.
+    """
+
+    def __init__(self, name, func, start, stop, segment, degree):
+        self.name = name
+        self.func = func
+        self.start = start
+        self.stop = stop
+        self.segment = segment
+        self.degree = degree
+        self._coefficients = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return _cache_dir() / f"{self.name}-{erfa_version}.bin"
+
+    @property
+    def layout(self):
+        return {
+            "start": self.start,
+            "stop": self.stop,
+            "segment": self.segment,
+            "degree": self.degree,
+            "erfa_version": erfa_version,
+        }
+
+    def fit(self):
+        """Fit the Chebyshev series.
+
+        Returns the coefficients, and metadata including the maximum error
+        for each component, found halfway between the nodes.
+        """
+        nodes, transform, checks, check_transform = _chebyshev_fit_matrices(
+            self.degree
+        )
+        n_segment = round((self.stop - self.start) / self.segment)
+        mid = (np.arange(n_segment)[:, np.newaxis] + 0.5) * self.segment
+        half = self.segment / 2
+        values = self.func(self.start, mid + half * nodes)
+        coefficients = np.einsum("jk,skc->sjc", transform, values)
+        expected = self.func(self.start, mid + half * checks)
+        fitted = np.einsum("kj,sjc->skc", check_transform, coefficients)
+        error = np.abs(fitted - expected).max(axis=(0, 1))
+        return coefficients, {**self.layout, "max_error": error.tolist()}
+
+    @property
+    def coefficients(self):
+        """The coefficients, read from the cache or fitted if needed."""
+        with self._lock:
+            if self._coefficients is None:
+                try:
+                    coefficients, meta = _table.read(self.path)
+                    if any(meta.get(k) != v for k, v in self.layout.items()):
+                        raise ValueError(
+                            f"{self.path} does not match the current layout."
+                        )
+                except (OSError, ValueError):
+                    coefficients, meta = self.fit()
+                    with contextlib.suppress(OSError):
+                        _table.write(self.path, coefficients, **meta)
+                self._coefficients = coefficients
+        return self._coefficients
+
+    def __call__(self, date1, date2):
+        """Evaluate the table.
+
+        Returns
+        -------
+        values : ndarray
+            With all components along the last axis.
+        outside : ndarray of bool
+            Whether the date was outside of the table, in which case the
+            corresponding values are not valid.
+        """
+        coefficients = self.coefficients
+        t = (np.asanyarray(date1, dtype=float) - self.start) + date2
+        segment = np.floor(t / self.segment).astype(np.intp)
+        segment = np.clip(segment, 0, coefficients.shape[0] - 1)
+        x = 2.0 * (t - segment * self.segment) / self.segment - 1.0
+        values = _chebyshev_evaluate(coefficients, segment, x)
+        return values, (t < 0.0) | (t > self.stop - self.start)
+
+
+def _epv00_components(date1, date2):
+    """Full epv00 series, with all pv components along the last axis."""
+    pvh, pvb, _ = ufunc.epv00(date1, date2)
+    return np.stack([pvh, pvb], axis=-1).view(float).reshape(*pvh.shape, 12)
+
+
+def _dtdb_geocentric(date1, date2):
+    """Full dtdb series for the geocenter, with a length-1 last axis."""
+    return ufunc.dtdb(date1, date2, 0.0, 0.0, 0.0, 0.0)[..., np.newaxis]
+
+
+# Between 1900.0 and 2100.0 (Julian epochs), the validity range of eraEpv00.
+_TABLES = {
+    "epv00": _ChebyshevTable(
+        "epv00", _epv00_components, 2415020.0, 2488070.0, segment=10.0, degree=12
+    ),
+    "dtdb": _ChebyshevTable(
+        "dtdb", _dtdb_geocentric, 2415020.0, 2488070.0, segment=15.0, degree=12
+    ),
+}
+
+
+def generate_table(name, path=None):
+    """Generate one of the Chebyshev tables used by the fast functions.
+
+    Parameters
+    ----------
+    name : {"epv00", "dtdb"}
+        The function to generate the table for.
+    path : str or `~pathlib.Path`, optional
+        Where to store the table.  By default, it is stored in the cache
+        directory, where the fast function will find it.
+
+    Returns
+    -------
+    path : `~pathlib.Path`
+        Name of the file with the table.
+    """
+    table = _TABLES[name]
+    path = table.path if path is None else Path(path)
+    coefficients, meta = table.fit()
+    _table.write(path, coefficients, **meta)
+    return path
+
+
+def _epv00(date1, date2):
+    date1, date2 = np.broadcast_arrays(
+        np.asanyarray(date1, dtype=float), np.asanyarray(date2, dtype=float)
+    )
+    values, outside = _TABLES["epv00"](date1, date2)
+    pv = np.ascontiguousarray(values).view(ufunc.dt_pv)
+    pvh, pvb = pv[..., 0], pv[..., 1]
+    status = np.zeros(date1.shape, dtype=np.intc)
+    if outside.any():
+        pvh[outside], pvb[outside], status[outside] = ufunc.epv00(
+            date1[outside], date2[outside]
+        )
+    return pvh, pvb, status
+
+
+def epv00(date1, date2, *, unique_epochs=False, status="raise"):
+    """Earth position and velocity, heliocentric and barycentric.
+
+    Like `erfa.epv00`, but using Chebyshev series between 1900 and 2100.
+
+    Parameters
+    ----------
+    date1, date2 : double array
+        TDB as a two-part Julian date.
+    unique_epochs : bool, optional
+        If `True`, only evaluate for each unique combination of ``date1,
+        date2``, and broadcast the result.  Default: `False`.
+    status : {'raise', 'ignore', 'count'}, optional
+        How to deal with status codes, as for `erfa.epv00`, except that
+        'count' is the same as 'raise'.  Default: 'raise'.
+
+    Returns
+    -------
+    A ``Epv00Result`` namedtuple with the following attributes:
+    pvh : pv array
+        Heliocentric Earth position/velocity (au, au/d).
+    pvb : pv array
+        Barycentric Earth position/velocity (au, au/d).
+    """
+    core._check_status_argument(status)
+    if unique_epochs:
+        (date1, date2), inverse = core._unique_epochs((date1, date2))
+        pvh, pvb, codes = _epv00(date1, date2)
+        pvh, pvb, codes = pvh[inverse], pvb[inverse], codes[inverse]
+    else:
+        pvh, pvb, codes = _epv00(date1, date2)
+    if status != "ignore":
+        core.check_errwarn(codes, "epv00")
+    return core.Epv00Result(pvh, pvb)
+
+
+def _dtdb(date1, date2, ut, elong, u, v):
+    values, outside = _TABLES["dtdb"](date1, date2)
+    # Topocentric terms, as in eraDtdb.
+    t = ((date1 - core.DJ00) + date2) / core.DJM
+    tsol = np.fmod(ut, 1.0) * core.D2PI + elong
+    w = t / 3600.0
+    elsun = np.fmod(280.46645683 + 1296027711.03429 * w, 360.0) * core.DD2R
+    emsun = np.fmod(357.52910918 + 1295965810.481 * w, 360.0) * core.DD2R
+    d = np.fmod(297.85019547 + 16029616012.090 * w, 360.0) * core.DD2R
+    elj = np.fmod(34.35151874 + 109306899.89453 * w, 360.0) * core.DD2R
+    els = np.fmod(50.07744430 + 44046398.47038 * w, 360.0) * core.DD2R
+    wt = (
+        + 0.00029e-10 * u * np.sin(tsol + elsun - els)
+        + 0.00100e-10 * u * np.sin(tsol - 2.0 * emsun)
+        + 0.00133e-10 * u * np.sin(tsol - d)
+        + 0.00133e-10 * u * np.sin(tsol + elsun - elj)
+        - 0.00229e-10 * u * np.sin(tsol + 2.0 * elsun + emsun)
+        - 0.02200e-10 * v * np.cos(elsun + emsun)
+        + 0.05312e-10 * u * np.sin(tsol - emsun)
+        - 0.13677e-10 * u * np.sin(tsol + 2.0 * elsun)
+        - 1.31840e-10 * v * np.cos(elsun)
+        + 3.17679e-10 * u * np.sin(tsol)
+    )
+    result = np.array(wt + values[..., 0])
+    if outside.any():
+        result[outside] = ufunc.dtdb(
+            date1[outside], date2[outside], ut[outside], elong[outside],
+            u[outside], v[outside]
+        )
+    return result
+
+
+def dtdb(date1, date2, ut, elong, u, v, *, unique_epochs=False):
+    """An approximation to TDB-TT.
+
+    Like `erfa.dtdb`, but using Chebyshev series for the geocentric part
+    between 1900 and 2100.
+
+    Parameters
+    ----------
+    date1, date2 : double array
+        TDB as a two-part Julian date (TT can be used instead).
+    ut : double array
+        Universal time (UT1, fraction of one day).
+    elong : double array
+        Longitude (east positive, radians).
+    u : double array
+        Distance from Earth spin axis (km).
+    v : double array
+        Distance north of equatorial plane (km).
+    unique_epochs : bool, optional
+        If `True`, only evaluate for each unique combination of the inputs,
+        and broadcast the result.  Default: `False`.
+
+    Returns
+    -------
+    c_retval : double array
+        TDB-TT (seconds).
+    """
+    args = np.broadcast_arrays(
+        *(np.asanyarray(arg, dtype=float) for arg in (date1, date2, ut, elong, u, v))
+    )
+    if unique_epochs:
+        args, inverse = core._unique_epochs(args)
+        return _dtdb(*args)[inverse]
+    return _dtdb(*args)[()]
+
+
+def apcg13(date1, date2, *, unique_epochs=False):
+    """Like `erfa.apcg13`, but using the fast `epv00`.
+
+    Parameters
+    ----------
+    date1, date2 : double array
+        TDB as a two-part Julian date.
+    unique_epochs : bool, optional
+        If `True`, only evaluate for each unique combination of ``date1,
+        date2``, and broadcast the result.  Default: `False`.
+
+    Returns
+    -------
+    astrom : eraASTROM array
+        Star-independent astrometry parameters.
+    """
+    if unique_epochs:
+        (date1, date2), inverse = core._unique_epochs((date1, date2))
+    pvh, pvb, _ = _epv00(date1, date2)
+    astrom = ufunc.apcg(date1, date2, pvb, pvh["p"])
+    return astrom[inverse] if unique_epochs else astrom
+
+
+def apci13(date1, date2, *, unique_epochs=False):
+    """Like `erfa.apci13`, but using the fast `epv00`.
+
+    Parameters
+    ----------
+    date1, date2 : double array
+        TDB as a two-part Julian date.
+    unique_epochs : bool, optional
+        If `True`, only evaluate for each unique combination of ``date1,
+        date2``, and broadcast the result.  Default: `False`.
+
+    Returns
+    -------
+    A ``Apci13Result`` namedtuple with the following attributes:
+    astrom : eraASTROM array
+        Star-independent astrometry parameters.
+    eo : double array
+        Equation of the origins (ERA-GST, radians).
+    """
+    if unique_epochs:
+        (date1, date2), inverse = core._unique_epochs((date1, date2))
+    pvh, pvb, _ = _epv00(date1, date2)
+    r = ufunc.pnm06a(date1, date2)
+    x, y = ufunc.bpn2xy(r)
+    s = ufunc.s06(date1, date2, x, y)
+    astrom = ufunc.apci(date1, date2, pvb, pvh["p"], x, y, s)
+    eo = ufunc.eors(r, s)
+    if unique_epochs:
+        astrom, eo = astrom[inverse], eo[inverse]
+    return core.Apci13Result(astrom, eo)
+
+
+def apco13(utc1, utc2, dut1, elong, phi, hm, xp, yp, phpa, tc, rh, wl, *,
+           unique_epochs=False, status="raise"):
+    """Like `erfa.apco13`, but using the fast `epv00`.
+
+    Parameters
+    ----------
+    utc1, utc2 : double array
+        UTC as a two-part quasi Julian date.
+    dut1 : double array
+        UT1-UTC (seconds).
+    elong, phi, hm : double array
+        Longitude (radians, east +ve), geodetic latitude (radians) and
+        height above ellipsoid (m, geodetic) of the observer.
+    xp, yp : double array
+        Polar motion coordinates (radians).
+    phpa, tc, rh, wl : double array
+        Pressure (hPa), ambient temperature (deg C), relative humidity
+        (0-1) and wavelength (micrometers) at the observer.
+    unique_epochs : bool, optional
+        If `True`, only evaluate for each unique combination of the inputs,
+        and broadcast the result.  Default: `False`.
+    status : {'raise', 'ignore', 'count'}, optional
+        How to deal with status codes, as for `erfa.apco13`, except that
+        'count' is the same as 'raise', since the codes are combined from
+        those of several functions anyway.  Default: 'raise'.
+
+    Returns
+    -------
+    A ``Apco13Result`` namedtuple with the following attributes:
+    astrom : eraASTROM array
+        Star-independent astrometry parameters.
+    eo : double array
+        Equation of the origins (ERA-GST, radians).
+    """
+    core._check_status_argument(status)
+    args = (utc1, utc2, dut1, elong, phi, hm, xp, yp, phpa, tc, rh, wl)
+    if unique_epochs:
+        args, inverse = core._unique_epochs(args)
+    else:
+        # Ensure all outputs get the full shape, also ones that only depend
+        # on time, like eo.
+        args = np.broadcast_arrays(*args)
+    utc1, utc2, dut1, elong, phi, hm, xp, yp, phpa, tc, rh, wl = args
+    tai1, tai2, j_tai = ufunc.utctai(utc1, utc2)
+    tt1, tt2, _ = ufunc.taitt(tai1, tai2)
+    ut11, ut12, j_ut1 = ufunc.utcut1(utc1, utc2, dut1)
+    pvh, pvb, _ = _epv00(tt1, tt2)
+    r = ufunc.pnm06a(tt1, tt2)
+    x, y = ufunc.bpn2xy(r)
+    s = ufunc.s06(tt1, tt2, x, y)
+    theta = ufunc.era00(ut11, ut12)
+    sp = ufunc.sp00(tt1, tt2)
+    refa, refb = ufunc.refco(phpa, tc, rh, wl)
+    astrom = ufunc.apco(tt1, tt2, pvb, pvh["p"], x, y, s, theta,
+                        elong, phi, hm, xp, yp, sp, refa, refb)
+    eo = ufunc.eors(r, s)
+    # Like eraApco13, pass on warnings from eraUtcut1 and errors from both.
+    codes = np.where((j_tai < 0) | (j_ut1 < 0), -1, j_ut1)
+    if unique_epochs:
+        astrom, eo, codes = astrom[inverse], eo[inverse], codes[inverse]
+    if status != "ignore":
+        core.check_errwarn(codes, "apco13")
+    return core.Apco13Result(astrom, eo)
@@ -0,0 +1,211 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Interpolation of slowly varying ERFA functions of time.
+
+Functions like `~erfa.pnm06a`, `~erfa.nut06a`, `~erfa.xys06a` and
+`~erfa.s06` evaluate the full IAU 2000A/2006 series for every epoch, which
+is wasteful for densely sampled times.  An `Interpolator` instead evaluates
+such a function only at the nodes of piecewise Chebyshev polynomials that
+cover a given time range, and interpolates for any other epoch.
+
+Example
+-------
+>>> import numpy as np
+>>> import erfa
+>>> from erfa.interp import Interpolator
+>>> pnm06a = Interpolator(erfa.pnm06a, 2460000.5, 2460001.5, atol=1e-12)
+>>> pnm06a.max_error < 1e-12
+True
+>>> jd2 = np.linspace(0, 1, 8641)  # one day, every 10 seconds
+>>> np.allclose(pnm06a(2460000.5, jd2), erfa.pnm06a(2460000.5, jd2),
+...             rtol=0, atol=1e-12)
+True
+"""
+
+import numpy as np
+
+from . import core
+
+__all__ = ["Interpolator"]
+
+
+def _chebyshev_fit_matrices(degree):
+    """Matrices to fit Chebyshev series, and check the fit.
+
+    Returns the Chebyshev nodes on [-1, 1], the matrix transforming the
+    values at those nodes to Chebyshev coefficients, the check points halfway
+    between the nodes (where the interpolation error is largest), and the
+    matrix transforming coefficients to values at those points.
+    """
+    n = degree + 1
+    nodes = np.cos(np.pi * (np.arange(n) + 0.5) / n)
+    transform = (2 / n) * np.cos(np.outer(np.arange(n), np.arccos(nodes)))
+    transform[0] /= 2
+    checks = np.cos(np.pi * np.arange(1, n) / n)
+    check_transform = np.cos(np.outer(np.arccos(checks), np.arange(n)))
+    return nodes, transform, checks, check_transform
+
+
+def _chebyshev_evaluate(coefficients, segment, x):
+    """Evaluate Chebyshev series using Clenshaw's recurrence.
+
+    Parameters
+    ----------
+    coefficients : ndarray
+        Coefficients of all segments, with shape (n_segment, degree+1, n_comp).
+    segment : array of int
+        Index of the segment for each point.
+    x : ndarray
+        Positions of the points on [-1, 1] within their segments.
+
+    Returns
+    -------
+    values : ndarray
+        With shape ``x.shape + (n_comp,)``.
+    """
+    # Get the coefficients of each order for all points at once, to avoid
+    # making a copy of all coefficients for every point.
+    x = np.asanyarray(x)[..., np.newaxis]
+    b1 = b2 = 0.0
+    for k in range(coefficients.shape[1] - 1, 0, -1):
+        b1, b2 = coefficients[segment, k] + 2 * x * b1 - b2, b1
+    return coefficients[segment, 0] + x * b1 - b2
+
+
+class Interpolator:
+    """Piecewise Chebyshev interpolation of an ERFA function of time.
+
+    The time range is covered by segments, in each of which the function is
+    represented by a Chebyshev series fitted to its values at the Chebyshev
+    nodes.  Starting from a single segment, segments are halved until the
+    interpolation error is below the requested tolerance.
+
+    Parameters
+    ----------
+    func : callable
+        The function to interpolate, which should take a two-part Julian
+        date as its only arguments, like `~erfa.pnm06a`, `~erfa.nut06a` and
+        `~erfa.xys06a`.  As a special case, one can also pass in
+        `~erfa.s06` (see Notes).
+    start, stop : float
+        Julian dates delimiting the range over which to interpolate.
+    atol : float, optional
+        Absolute tolerance for the interpolated values (i.e., radians for
+        angles, or matrix elements).  Default: 1e-12 (about 0.2 uas).
+    degree : int, optional
+        Degree of the Chebyshev series in each segment.  Default: 10.
+    min_span : float, optional
+        Segments are not halved further if they would become shorter than
+        this number of days, even if the tolerance has not been reached.
+        In that case, `max_error` will exceed ``atol``.  Default: 0.001.
+
+    Attributes
+    ----------
+    max_error : float
+        Largest absolute interpolation error found while fitting, at points
+        halfway between the nodes of the Chebyshev series (where the error
+        is largest).
+    jd0 : float
+        Reference Julian date, equal to ``start``.
+    breaks : ndarray
+        Boundaries of the segments, in days relative to ``jd0``.
+
+    Notes
+    -----
+    The CIO locator ``s`` calculated by `~erfa.s06` is a series in time minus
+    ``x * y / 2``.  For this function, only the series is interpolated and
+    the interpolator should be called with ``date1, date2, x, y``, like
+    `~erfa.s06` itself.
+    """
+
+    def __init__(self, func, start, stop, *, atol=1e-12, degree=10, min_span=0.001):
+        if not stop > start:
+            raise ValueError("stop should be after start.")
+        self.func = func
+        self.atol = atol
+        self.degree = degree
+        self.min_span = min_span
+        self.jd0 = float(start)
+        self._fit(float(stop) - self.jd0)
+
+    def _evaluate_func(self, t):
+        if self.func is core.s06:
+            return core.s06(self.jd0, t, 0.0, 0.0)
+        return self.func(self.jd0, t)
+
+    def _evaluate_components(self, t):
+        """Evaluate the function at t, with all components as last axis."""
+        result = self._evaluate_func(t)
+        if isinstance(result, tuple):
+            self._result_type = type(result)
+            self._shape = (len(result),)
+            return np.stack(result, axis=-1)
+        self._result_type = None
+        self._shape = result.shape[t.ndim :]
+        return result.reshape((*t.shape, -1))
+
+    def _fit(self, span):
+        nodes, transform, checks, check_transform = _chebyshev_fit_matrices(
+            self.degree
+        )
+        lo = np.array([0.0])
+        hi = np.array([span])
+        done_lo, done_coefficients = [], []
+        self.max_error = 0.0
+        while lo.size:
+            mid = (lo + hi)[:, np.newaxis] / 2
+            half = (hi - lo)[:, np.newaxis] / 2
+            values = self._evaluate_components(mid + half * nodes)
+            coefficients = np.einsum("jk,skc->sjc", transform, values)
+            expected = self._evaluate_components(mid + half * checks)
+            fitted = np.einsum("kj,sjc->skc", check_transform, coefficients)
+            error = np.abs(fitted - expected).max(axis=(1, 2))
+            ok = (error <= self.atol) | (hi - lo < 2 * self.min_span)
+            if ok.any():
+                done_lo.append(lo[ok])
+                done_coefficients.append(coefficients[ok])
+                self.max_error = max(self.max_error, float(error[ok].max()))
+            lo, hi = lo[~ok], hi[~ok]
+            mid = (lo + hi) / 2
+            lo, hi = np.concatenate([lo, mid]), np.concatenate([mid, hi])
+
+        lo = np.concatenate(done_lo)
+        order = np.argsort(lo)
+        self.breaks = np.append(lo[order], span)
+        self._coefficients = np.concatenate(done_coefficients)[order]
+
+    def _interpolate(self, t):
+        breaks = self.breaks
+        if np.any(t < breaks[0]) or np.any(t > breaks[-1]):
+            raise ValueError(
+                f"dates should be between {self.jd0} and {self.jd0 + breaks[-1]}."
+            )
+        segment = np.searchsorted(breaks, t, side="right") - 1
+        segment = np.clip(segment, 0, breaks.size - 2)
+        lo, hi = breaks[segment], breaks[segment + 1]
+        x = (2 * t - lo - hi) / (hi - lo)
+        return _chebyshev_evaluate(self._coefficients, segment, x)
+
+    def __call__(self, date1, date2, *args):
+        """Interpolate the function for the given two-part Julian dates.
+
+        Parameters
+        ----------
+        date1, date2 : array_like
+            Two-part Julian date, as for the function itself.
+        *args
+            For `~erfa.s06`, the CIP coordinates ``x`` and ``y``.
+
+        Returns
+        -------
+        result : ndarray or namedtuple
+            Interpolated values, in the same form as the function returns.
+        """
+        t = (np.asanyarray(date1, dtype=float) - self.jd0) + date2
+        values = self._interpolate(t)
+        if self._result_type is not None:
+            return self._result_type(*np.moveaxis(values, -1, 0))
+        result = values.reshape(t.shape + self._shape)
+        if self.func is core.s06:
+            x, y = args
+            result = result - x * y / 2
+        return result
@@ -8,6 +8,12 @@
 This module allows access to ERFA's leap second table,
 using the functions 'get', 'set', and 'update'.
 
+For arrays of dates, the functions 'dat', 'utctai', and 'taiutc' give the
+same results as their ERFA counterparts, but look up TAI-UTC in a per-day
+index of the leap-second table rather than scanning the table for every
+element.  The index is rebuilt whenever the table is changed with 'set'
+or 'update'.
+
 One can also check expiration with two attributes:
 
     expired
@@ -23,14 +29,15 @@ Note that usage of the module is similar to a ``ScienceState`` class,
 but it cannot be used as a context manager.
 """
 
-__all__ = ["get", "set", "update", "validate"]
+__all__ = ["dat", "get", "set", "taiutc", "update", "utctai", "validate"]
 
 from datetime import datetime, timedelta
 from warnings import warn
 
 import numpy as np
 
-from .core import ErfaWarning
+from . import ufunc
+from .core import DAYSEC, ErfaWarning, check_errwarn
 from .ufunc import dt_eraLEAPSECOND, get_leap_seconds, set_leap_seconds
 
 NUMPY_LT_2_0 = np.__version__.startswith("1.")
@@ -45,13 +52,38 @@ def __getattr__(name):
 
 
 def __dir__():
-    return ["expired", "expires", "get", "set", "update", "validate"]
+    return ["dat", "expired", "expires", "get", "set", "taiutc", "update",
+            "utctai", "validate"]
 
 
 _expires = None
 """Explicit expiration date inferred from leap-second table."""
 _expiration_days = 180
 """Number of days beyond last leap second at which table expires."""
+_lookup = None
+"""Per-day index into the current leap-second table (see `_build_lookup`)."""
+_dubious_year = None
+"""First year for which ERFA considers TAI-UTC dubious."""
+
+# Reference dates (MJD) and drift rates (s/day) of the Delta(AT) expressions
+# before leap seconds were introduced, as in eraDat.  Like eraDat, these are
+# applied to the first entries of the table, whatever those are.
+_DRIFT = np.array([
+    [37300.0, 0.0012960],
+    [37300.0, 0.0012960],
+    [37300.0, 0.0012960],
+    [37665.0, 0.0011232],
+    [37665.0, 0.0011232],
+    [38761.0, 0.0012960],
+    [38761.0, 0.0012960],
+    [38761.0, 0.0012960],
+    [38761.0, 0.0012960],
+    [38761.0, 0.0012960],
+    [38761.0, 0.0012960],
+    [38761.0, 0.0012960],
+    [39126.0, 0.0025920],
+    [39126.0, 0.0025920],
+])
 
 
 def get():
@@ -161,6 +193,7 @@ def set(table=None):
 
     set_leap_seconds(table)
     _expires = expires
+    _build_lookup()
 
 
 def _expires_property():
@@ -231,3 +264,219 @@ def update(table):
              ErfaWarning)
 
     return len(ls) - len(erfa_ls)
+
+
+def _build_lookup():
+    """Index the current leap-second table by integer MJD.
+
+    For every day from the one before the first year in the table up to
+    the start of the year from which ERFA considers dates dubious, or the
+    day after the last entry if that is later, the index holds the row that
+    applies.  Apart from the rows of the table, there are rows for dates
+    before UTC, for dates before the first entry in its year, and copies of
+    the rows of the table for dubious dates, with TAI-UTC and status as
+    given by eraDat.  Hence, a lookup needs no searching nor any further
+    checks.
+    """
+    global _lookup, _dubious_year
+    if _dubious_year is None:
+        # The year from which eraDat warns does not depend on the table.
+        years = np.arange(2000, 3000)
+        _dubious_year = int(years[ufunc.dat(years, 1, 1, 0.0)[1] == 1][0])
+    table = get()
+    n = len(table)
+    mjd = ufunc.cal2jd(table["year"], table["month"], 1)[1]
+    start = ufunc.cal2jd(table["year"][0], 1, 1)[1] - 1.0
+    dubious = ufunc.cal2jd(_dubious_year, 1, 1)[1]
+    days = np.arange(start, max(dubious, mjd[-1]) + 1.0)
+    # Row 0 is for dates before UTC, row 1 for dates before the first entry,
+    # rows 2 to n+1 for the entries, and rows n+2 to 2n+1 for the entries
+    # for dubious dates.  Days past the end of the index map to its last
+    # row, which is a dubious date after the last entry.
+    rows = np.searchsorted(mjd, days, side="right") + 1
+    rows[0] = 0
+    rows[days >= dubious] += n
+    tai_utc = np.concatenate([[0.0, 0.0], table["tai_utc"], table["tai_utc"]])
+    n_drift = min(n, len(_DRIFT))
+    reference = np.zeros(2 * n + 2)
+    rate = np.zeros(2 * n + 2)
+    reference[2 : n_drift + 2], rate[2 : n_drift + 2] = _DRIFT[:n_drift].T
+    # Only dubious rows that are used get drift, so that, normally, only
+    # rows with index below n_drift, for the first few entries, have drift.
+    used = np.unique(rows[rows >= n + 2])
+    reference[used], rate[used] = reference[used - n], rate[used - n]
+    n_drift = np.flatnonzero(rate)[-1] + 1 if rate.any() else 0
+    status = np.repeat([1, -5, 0, 1], [1, 1, n, n])
+    _lookup = (start, rows, tai_utc, reference, rate, n_drift, status)
+
+
+def _lookup_rows(djm):
+    """Rows in the lookup arrays for days starting at MJD djm."""
+    if _lookup is None:
+        _build_lookup()
+    start, rows = _lookup[:2]
+    # Clip before casting, with fmax mapping invalid days (NaN) to row 0.
+    index = np.fmin(np.fmax(np.subtract(djm, start), 0.0), len(rows) - 1.0)
+    return rows.take(index.astype(np.intp))
+
+
+def _delta_at(row, djm, fd):
+    """TAI-UTC for valid dates, as calculated by eraDat.
+
+    Parameters
+    ----------
+    row : `~numpy.ndarray`
+        Rows in the lookup arrays, as given by `_lookup_rows`.
+    djm : array_like
+        MJD at the start of the day.
+    fd : array_like
+        Fraction of the day.
+
+    Returns
+    -------
+    deltat : `~numpy.ndarray`
+        TAI minus UTC, in seconds.
+    """
+    _, _, tai_utc, reference, rate, n_drift, _ = _lookup
+    shape = np.shape(row)
+    row = np.atleast_1d(row)
+    deltat = tai_utc[row]
+    drift = row < n_drift
+    if drift.any():
+        djm, fd, _ = np.broadcast_arrays(djm, fd, row, subok=True)
+        row = row[drift]
+        deltat[drift] += (djm[drift] + fd[drift] - reference[row]) * rate[row]
+    return deltat.reshape(shape)
+
+
+def dat(iy, im, id, fd):
+    """For a given UTC date, calculate Delta(AT) = TAI-UTC.
+
+    This gives the same results as `erfa.dat`, but uses an index of the
+    leap-second table to look up values, which is much faster for arrays.
+
+    Parameters
+    ----------
+    iy, im, id : int array
+        UTC year, month and day.
+    fd : double array
+        Fraction of day, used only before 1972.
+
+    Returns
+    -------
+    deltat : double array
+        TAI minus UTC, in seconds.
+    """
+    iy, im, id, fd = np.broadcast_arrays(iy, im, id, fd)
+    _, djm, status = ufunc.cal2jd(iy, im, id)
+    row = _lookup_rows(djm)
+    deltat = _delta_at(row, djm, fd)
+    status = np.where(status < 0, status, _lookup[-1][row])
+    bad_fd = (fd < 0.0) | (fd > 1.0)
+    status = np.where(bad_fd, -4, status)
+    deltat = np.where(bad_fd | (status < 0), 0.0, deltat)
+    check_errwarn(status, "dat")
+    return deltat[()]
+
+
+def _utctai(utc1, utc2):
+    # Follows eraUtctai, but with the Delta(AT) lookups vectorized.
+    utc1, utc2 = np.broadcast_arrays(utc1, utc2)
+    big1 = np.abs(utc1) >= np.abs(utc2)
+    if big1.all():
+        u1, u2 = utc1, utc2
+    else:
+        u1, u2 = np.where(big1, utc1, utc2), np.where(big1, utc2, utc1)
+    # TAI-UTC at 0h and 12h today (the latter to detect drift), and at
+    # 0h tomorrow (to detect jumps).
+    iy, im, id, fd, status = ufunc.jd2cal(u1, u2)
+    z1, z2, _ = ufunc.cal2jd(iy, im, id)
+    today = _lookup_rows(z2)
+    tomorrow = _lookup_rows(z2 + 1.0)
+    dat0 = _delta_at(today, z2, 0.0)
+    dat24 = _delta_at(tomorrow, z2 + 1.0, 0.0)
+    # Errors for today take precedence, otherwise the status is that for
+    # tomorrow, which can only be an invalid date if beyond eraJd2cal's
+    # upper limit.
+    *_, n_drift, dat_status = _lookup
+    tomorrow_status = dat_status[tomorrow]
+    if np.max(u1) + np.max(u2) > 1e9 - 2.0:
+        dj = (u1 + 1.5) + (u2 - fd)
+        tomorrow_status[dj > 1e9] = -1
+    today_status = dat_status[today]
+    status = np.where(status < 0, status,
+                      np.where(today_status < 0, today_status, tomorrow_status))
+    # Separate TAI-UTC change into per-day (DLOD) and any jump (DLEAP).
+    # Without drift, DLOD is zero and the scaling with it can be skipped.
+    if drift := (today < n_drift).any():
+        dat12 = _delta_at(today, z2, 0.5)
+        dlod = 2.0 * (dat12 - dat0)
+        dleap = dat24 - (dat0 + dlod)
+    else:
+        dleap = dat24 - dat0
+    # Remove any scaling applied to spread leap into preceding day, and
+    # scale from (pre-1972) UTC seconds to SI seconds.
+    fd = fd * ((DAYSEC + dleap) / DAYSEC)
+    if drift:
+        fd = fd * ((DAYSEC + dlod) / DAYSEC)
+    a2 = z1 - u1
+    a2 = a2 + z2
+    a2 = a2 + (fd + dat0 / DAYSEC)
+    if big1.all():
+        return u1, a2, status
+    return np.where(big1, u1, a2), np.where(big1, a2, u1), status
+
+
+def utctai(utc1, utc2):
+    """Time scale transformation:  Coordinated Universal Time, UTC, to
+    International Atomic Time, TAI.
+
+    This gives the same results as `erfa.utctai`, but uses an index of the
+    leap-second table to look up TAI-UTC, which is much faster for arrays.
+
+    Parameters
+    ----------
+    utc1, utc2 : double array
+        UTC as a 2-part quasi Julian Date.
+
+    Returns
+    -------
+    tai1, tai2 : double array
+        TAI as a 2-part Julian Date.
+    """
+    tai1, tai2, status = _utctai(utc1, utc2)
+    check_errwarn(status, "utctai")
+    return tai1[()], tai2[()]
+
+
+def taiutc(tai1, tai2):
+    """Time scale transformation:  International Atomic Time, TAI, to
+    Coordinated Universal Time, UTC.
+
+    This gives the same results as `erfa.taiutc`, but uses an index of the
+    leap-second table to look up TAI-UTC, which is much faster for arrays.
+
+    Parameters
+    ----------
+    tai1, tai2 : double array
+        TAI as a 2-part Julian Date.
+
+    Returns
+    -------
+    utc1, utc2 : double array
+        UTC as a 2-part quasi Julian Date.
+    """
+    tai1, tai2 = np.broadcast_arrays(tai1, tai2)
+    big1 = np.abs(tai1) >= np.abs(tai2)
+    a1 = np.where(big1, tai1, tai2)
+    a2 = np.where(big1, tai2, tai1)
+    u1, u2 = a1, a2
+    status = np.zeros(a1.shape, dtype=int)
+    # Iterate (though in most cases just once is enough).
+    for _ in range(3):
+        g1, g2, j = _utctai(u1, u2)
+        status = np.where(status < 0, status, j)
+        u2 = u2 + (a1 - g1)
+        u2 = u2 + (a2 - g2)
+    check_errwarn(status, "taiutc")
+    return np.where(big1, u1, u2)[()], np.where(big1, u2, u1)[()]
@@ -0,0 +1,275 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Evaluation of ERFA functions in a pool of processes.
+
+An `Executor` splits the dimensions a function loops over in chunks, which
+are evaluated by worker processes.  Inputs and outputs are passed through
+`multiprocessing.shared_memory`, so that arrays, including structured ones
+such as ``eraASTROM`` contexts, position-velocity vectors and ``eraLDBODY``
+lists of bodies, are not pickled.  The workers are started once, and keep
+``erfa`` imported between calls.
+
+Example
+-------
+>>> import numpy as np
+>>> import erfa
+>>> from erfa import parallel
+>>> jd2 = np.linspace(0.0, 1.0, 1000)
+>>> with parallel.Executor(max_workers=2) as executor:  # doctest: +SKIP
+...     result = executor.apply(erfa.apci13, 2460000.5, jd2)
+>>> result.astrom.shape  # doctest: +SKIP
+(1000,)
+
+For `erfa.set_num_threads`, the work of a single ufunc call is divided over
+threads instead, which has no overhead for starting processes or copying
+inputs, and is usually faster for functions that take microseconds per
+element.  Processes help for slower functions and very large inputs.
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+import erfa
+
+from . import core
+from .stream import _first_row, _loop_shapes, _move_args, _move_results
+
+__all__ = ["Executor", "apply"]
+
+
+def _shared_empty(shape, dtype, blocks):
+    """Allocate an array in a new block of shared memory.
+
+    Returns the array and a description from which workers can attach it.
+    """
+    dtype = np.dtype(dtype)
+    size = int(np.prod(shape)) * dtype.itemsize
+    block = SharedMemory(create=True, size=max(size, 1))
+    blocks.append(block)
+    return np.ndarray(shape, dtype, buffer=block.buf), (block.name, shape, dtype)
+
+
+def _from_shared(spec, blocks):
+    name, shape, dtype = spec
+    block = SharedMemory(name=name)
+    blocks.append(block)
+    return np.ndarray(shape, dtype, buffer=block.buf)
+
+
+def _close(blocks, unlink=False):
+    for block in blocks:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def _run_chunk(func_name, arg_specs, out_specs, item, kwargs):
+    """Evaluate a function for one chunk, in a worker process.
+
+    Inputs described by ``("shared", spec, sliced)`` are attached from
+    shared memory (and sliced with ``item`` if ``sliced``), while those
+    described by ``("value", value)`` are used as is.  The outputs are
+    written to the shared-memory arrays described by ``out_specs``.
+
+    Returns the warnings emitted, as (message, category) pairs, and the
+    counts of the status codes returned by ERFA, by function name, which
+    are not checked, so that this can be done once for all chunks.
+    """
+    blocks = []
+    args = out = None
+    try:
+        args = [
+            spec[0] if kind == "value"
+            else _from_shared(spec[0], blocks)[item if spec[1] else ...]
+            for kind, *spec in arg_specs
+        ]
+        out = tuple(_from_shared(spec, blocks)[item] for spec in out_specs)
+        with (warnings.catch_warnings(record=True) as emitted,
+              core._collect_status_counts({}) as counts):
+            warnings.simplefilter("always")
+            getattr(erfa, func_name)(
+                *args, out=out if len(out) > 1 else out[0], **kwargs
+            )
+        return [(str(w.message), w.category) for w in emitted], counts
+    except Exception as exc:
+        # The frames in the traceback hold views of the shared memory.
+        raise exc.with_traceback(None) from None
+    finally:
+        # Views of the shared memory have to be gone before it is closed.
+        args = out = None
+        _close(blocks)
+
+
+class Executor:
+    """Evaluate ERFA functions with a pool of worker processes.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of worker processes.  Default: the number of CPUs.
+    mp_context : `multiprocessing.context.BaseContext`, optional
+        Context used to start the workers.  Default: that of
+        `multiprocessing`.
+
+    Notes
+    -----
+    The executor can be used as a context manager, which shuts down the
+    workers on exit.
+    """
+
+    def __init__(self, max_workers=None, mp_context=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(self.max_workers, mp_context=mp_context)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self, wait=True):
+        """Stop the worker processes."""
+        self._pool.shutdown(wait=wait)
+
+    def apply(self, func, *args, chunk_size=None, out=None, **kwargs):
+        """Evaluate an ERFA function, dividing its inputs over the workers.
+
+        Parameters
+        ----------
+        func : callable
+            Function from `erfa`, such as `erfa.atco13`.
+        *args : array_like
+            Inputs for ``func``.  These are broadcast against each other as
+            usual, and split in chunks along the first of the axes the
+            function loops over.
+        chunk_size : int, optional
+            Approximate number of elements per chunk, not counting vector
+            and matrix dimensions.  Default: such that each worker gets
+            about four chunks.
+        out : array or tuple of array, optional
+            Arrays in which to store the results.  By default, new arrays
+            are allocated.
+        **kwargs
+            Further keyword arguments for ``func``, such as ``status`` or
+            ``axis``.
+
+        Returns
+        -------
+        result : array or tuple of array
+            As for ``func``.  Any warnings emitted by ``func`` in the workers
+            are emitted again, except those for ERFA status codes, which
+            are counted over all chunks, and then raised or emitted as for
+            a single call.
+        """
+        func_name = func.__name__
+        if getattr(erfa, func_name, None) is None:
+            raise ValueError(f"{func_name!r} is not a function in erfa.")
+        if (axis := kwargs.pop("axis", None)) is not None:
+            # Share and chunk the inputs and outputs viewed with the vector
+            # and matrix axes last, and move those back in the results.
+            args, n_loop = _move_args(func, args, axis)
+            result = self.apply(
+                func, *args, chunk_size=chunk_size,
+                out=None if out is None else _move_results(out, axis, n_loop),
+                **kwargs,
+            )
+            if out is not None:
+                return out
+            return _move_results(result, axis, n_loop, back=True)
+        loop_shapes = _loop_shapes(func, args)
+        loop_shape = np.broadcast_shapes(*loop_shapes)
+        if not loop_shape:
+            return func(*args, out=out, **kwargs)
+
+        # Get the types and shapes of the outputs from the first row.
+        first = _first_row(func, args, loop_shapes, kwargs)
+        n_loop = len(loop_shape)
+        sliced = [len(shape) == n_loop and shape[0] != 1 for shape in loop_shapes]
+        results = first if isinstance(first, tuple) else (first,)
+        if chunk_size is None:
+            rows = -(-loop_shape[0] // (4 * self.max_workers))
+        else:
+            rows = max(1, chunk_size // max(1, int(np.prod(loop_shape[1:]))))
+
+        blocks = []
+        out_arrays = []
+        array = None
+        try:
+            arg_specs = []
+            for arg, s in zip(args, sliced):
+                if s or np.ndim(arg):
+                    arg = np.asanyarray(arg)
+                    array, spec = _shared_empty(arg.shape, arg.dtype, blocks)
+                    array[...] = arg
+                    arg_specs.append(("shared", spec, s))
+                else:
+                    arg_specs.append(("value", arg))
+            out_specs = []
+            for r in results:
+                array, spec = _shared_empty((loop_shape[0], *r.shape[1:]),
+                                            r.dtype, blocks)
+                out_arrays.append(array)
+                out_specs.append(spec)
+            futures = [
+                self._pool.submit(_run_chunk, func_name, arg_specs, out_specs,
+                                  slice(start, start + rows), kwargs)
+                for start in range(0, loop_shape[0], rows)
+            ]
+            counts = {}
+            for future in futures:
+                emitted, chunk_counts = future.result()
+                for message, category in emitted:
+                    warnings.warn(message, category, stacklevel=2)
+                for name, new in chunk_counts.items():
+                    core._add_status_counts(counts, name, new)
+            core._check_collected(counts)
+            if out is None:
+                result = [array.copy() for array in out_arrays]
+            else:
+                result = list(out) if isinstance(out, tuple) else [out]
+                for o, a in zip(result, out_arrays):
+                    np.copyto(o, a)
+        finally:
+            # Views of the shared memory have to be gone before it is closed.
+            array = None
+            out_arrays.clear()
+            _close(blocks, unlink=True)
+        if isinstance(first, tuple):
+            return type(first)(*result)
+        return result[0]
+
+
+def apply(func, *args, max_workers=None, chunk_size=None, out=None, **kwargs):
+    """Evaluate an ERFA function with a temporary pool of worker processes.
+
+    Like `Executor.apply`, but starting (and stopping) the workers for this
+    call only.  For repeated calls, use an `Executor`, which keeps its
+    workers.
+
+    Parameters
+    ----------
+    func : callable
+        Function from `erfa`, such as `erfa.atco13`.
+    *args : array_like
+        Inputs for ``func``.
+    max_workers : int, optional
+        Number of worker processes.  Default: the number of CPUs.
+    chunk_size : int, optional
+        Approximate number of elements per chunk.  Default: such that each
+        worker gets about four chunks.
+    out : array or tuple of array, optional
+        Arrays in which to store the results.
+    **kwargs
+        Further keyword arguments for ``func``.
+
+    Returns
+    -------
+    result : array or tuple of array
+        As for ``func``.
+    """
+    with Executor(max_workers) as executor:
+        return executor.apply(func, *args, chunk_size=chunk_size, out=out,
+                              **kwargs)
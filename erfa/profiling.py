@@ -0,0 +1,227 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Profiling of calls of the ERFA functions.
+
+Within a `profile` context, the python wrappers in `erfa` are replaced by
+versions that record, for each function, the number of calls, the number of
+elements calculated, the time spent, and how often ERFA reported errors or
+warnings, by status code.  Outside of the context, the wrappers are the
+original functions, so there is no cost when not profiling.
+
+Example
+-------
+>>> import erfa
+>>> with erfa.profile() as profile:
+...     djm0, djm = erfa.cal2jd([2024, 2025], 1, 1)
+...     pnm = erfa.pnm06a(djm0, djm)
+>>> profile.stats["cal2jd"]["calls"], profile.stats["cal2jd"]["elements"]
+(1, 2)
+>>> sorted(record["function"] for record in profile.records())
+['cal2jd', 'pnm06a']
+
+Only calls through the module attributes of `erfa` and `erfa.core` are
+recorded, i.e., not calls of functions imported with ``from erfa import ...``
+before the context was entered.  The records can be turned into a table with,
+e.g., ``pandas.DataFrame(profile.records())``.
+"""
+
+import functools
+import importlib
+import inspect
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+import erfa
+
+from . import core, ufunc
+
+__all__ = ["Profile", "profile"]
+
+
+class Profile:
+    """Statistics of calls of the ERFA functions, collected by `profile`.
+
+    Attributes
+    ----------
+    stats : dict
+        Statistics by function name.  Each entry is a `dict` with the number
+        of ``calls``, the number of ``elements`` calculated (i.e., the size
+        of the broadcast inputs, not counting vector or matrix dimensions),
+        the wall-clock ``time`` in seconds, and ``errors`` and ``warnings``,
+        which are dicts with the number of elements for which ERFA returned
+        a given status code.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def _entry(self, func_name):
+        entry = self.stats.get(func_name)
+        if entry is None:
+            entry = self.stats[func_name] = {
+                "calls": 0,
+                "elements": 0,
+                "time": 0.0,
+                "errors": {},
+                "warnings": {},
+            }
+        return entry
+
+    def _add_status_counts(self, func_name, counts):
+        entry = self._entry(func_name)
+        remap = core.STATUS_CODES_REMAP.get(func_name, {})
+        for code, count in counts.items():
+            code = remap.get(code, code)
+            tally = entry["errors"] if code < 0 else entry["warnings"]
+            tally[code] = tally.get(code, 0) + count
+
+    def records(self):
+        """Statistics as a list of flat records, sorted by decreasing time.
+
+        Returns
+        -------
+        records : list of dict
+            One for each function called, with the function name as
+            ``function`` and further the entries of `stats`.
+        """
+        return [
+            {"function": func_name, **entry}
+            for func_name, entry in sorted(
+                self.stats.items(), key=lambda item: -item[1]["time"]
+            )
+        ]
+
+
+def _n_core_dims(func):
+    """Number of core dimensions of the first output of a gufunc."""
+    if func is None or func.signature is None:
+        return 0
+    first = re.match(r"\(([^)]*)\)", func.signature.split("->")[1]).group(1)
+    return len(first.split(",")) if first else 0
+
+
+def _n_elements(result, n_core_dims):
+    first = result[0] if isinstance(result, tuple) else result
+    return int(np.prod(np.shape(first)[: np.ndim(first) - n_core_dims]))
+
+
+_active = []
+"""Profiles that are currently recording."""
+_original = {}
+"""Functions in erfa.core that are replaced while profiling."""
+_patches = []
+"""Module attributes that are replaced, as tuples of module and name."""
+_lock = threading.Lock()
+
+
+def _profiled(func):
+    """Wrap an ERFA wrapper such that its calls get recorded."""
+    n_core_dims = _n_core_dims(getattr(ufunc, func.__name__, None))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        entries = [prof._entry(func.__name__) for prof in tuple(_active)]
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            for entry in entries:
+                entry["time"] += elapsed
+                entry["calls"] += 1
+        n_elements = _n_elements(result, n_core_dims)
+        for entry in entries:
+            entry["elements"] += n_elements
+        return result
+
+    return wrapper
+
+
+def _check_errwarn(statcodes, func_name):
+    if profiles := tuple(_active):
+        codes, counts = np.unique(statcodes, return_counts=True)
+        counts = {code: count for code, count in zip(codes.tolist(), counts.tolist())
+                  if code}
+        for prof in profiles:
+            prof._add_status_counts(func_name, counts)
+    return _original["check_errwarn"](statcodes, func_name)
+
+
+def _check_status_counts(counts, func_name):
+    for prof in tuple(_active):
+        prof._add_status_counts(func_name, counts)
+    return _original["check_status_counts"](counts, func_name)
+
+
+_CHECKS = {
+    "check_errwarn": _check_errwarn,
+    "check_status_counts": _check_status_counts,
+}
+
+
+def _install():
+    """Replace the wrappers by ones that record calls in the active profiles."""
+    _original.update(
+        {name: getattr(core, name) for name in [*core.__all__, *_CHECKS]}
+    )
+    replaced = _CHECKS | {
+        name: _profiled(func)
+        for name, func in _original.items()
+        if name not in _CHECKS and inspect.isfunction(func)
+    }
+    # The wrappers are defined in the modules in erfa._core (which have been
+    # imported above), and use the status checks imported from erfa.core.
+    groups = {
+        importlib.import_module(f"._core.{group}", core.__package__)
+        for group in core._WRAPPER_GROUPS.values()
+    }
+    _patches[:] = [
+        *((core, name) for name in replaced),
+        *((erfa, name) for name in replaced
+          if getattr(erfa, name, None) is _original[name]),
+        *((group, name) for group in groups for name in _CHECKS
+          if hasattr(group, name)),
+    ]
+    for module, name in _patches:
+        setattr(module, name, replaced[name])
+
+
+def _uninstall():
+    for module, name in _patches:
+        setattr(module, name, _original[name])
+    _patches.clear()
+
+
+@contextmanager
+def profile():
+    """Record statistics of calls of the ERFA functions.
+
+    Yields
+    ------
+    profile : `Profile`
+        Which holds the statistics of all calls made within the context.
+
+    Notes
+    -----
+    The wrappers are replaced for the whole process, so calls from all
+    threads are recorded.  Contexts can be nested or overlap (e.g., when
+    used in different threads), in which case calls get recorded in all
+    `Profile` instances whose context is active.  The wrappers are replaced
+    when the first context is entered, and restored when the last one is
+    exited.
+    """
+    prof = Profile()
+    with _lock:
+        if not _active:
+            _install()
+        _active.append(prof)
+    try:
+        yield prof
+    finally:
+        with _lock:
+            _active.remove(prof)
+            if not _active:
+                _uninstall()
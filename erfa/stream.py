@@ -0,0 +1,339 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Evaluation of ERFA functions in chunks, for inputs too large for memory.
+
+`apply` evaluates any function in `erfa` for arrays, typically memory-mapped
+ones, a chunk at a time, and `apply_chunks` does the same for chunks of
+inputs produced by an iterator.  The results are stored in given output
+arrays (which can be memory-mapped as well), or passed on to a callback in
+output buffers that are reused between chunks, so that the memory used is
+bounded by the chunk size.
+
+Example
+-------
+>>> import numpy as np
+>>> import erfa
+>>> from erfa import stream
+>>> theta = np.linspace(0.0, 6.0, 10_000)
+>>> out = np.empty((10_000, 3))
+>>> stream.apply(erfa.s2c, theta, 0.5, chunk_size=1024, out=out) is out
+True
+>>> np.all(out == erfa.s2c(theta, 0.5))
+np.True_
+
+Chunks are taken along the first axis longer than one that the function
+loops over, i.e., not along the axes of inputs that hold vectors or matrices
+(the last ones, as given by the signature of the ufunc, or those set by an
+``axis`` argument), nor along the size-``n`` list of bodies for
+`~erfa.ldn`.  Structured inputs and outputs, such as ``eraASTROM`` contexts
+or position-velocity vectors, are chunked like any other array.
+
+ERFA status codes are counted over all chunks, and only checked at the end,
+so that errors and warnings are as for a single call (but note that any
+error is raised only after all chunks have been evaluated).
+"""
+
+import inspect
+import re
+import warnings
+
+import numpy as np
+
+from . import core, ufunc
+from .core import ErfaWarning
+
+__all__ = ["apply", "apply_chunks"]
+
+
+def _core_ndims(func):
+    """Number of core dimensions of each input of the ufunc for a wrapper."""
+    signature = getattr(getattr(ufunc, func.__name__, None), "signature", None)
+    if signature is None:
+        return None
+    return [
+        len(dims.split(",")) if dims else 0
+        for dims in re.findall(r"\(([^)]*)\)", signature.split("->")[0])
+    ]
+
+
+def _loop_shapes(func, args):
+    """Shapes of the inputs without their core dimensions."""
+    core_ndims = _core_ndims(func) or [0] * len(args)
+    return [
+        np.shape(arg)[: np.ndim(arg) - n_core]
+        for arg, n_core in zip(args, core_ndims)
+    ]
+
+
+def _core_axes(axis, n_core):
+    """Axes holding vectors or matrices, for a given ``axis`` argument."""
+    matrix_axes = (axis, axis + 1) if axis >= 0 else (axis - 1, axis)
+    return {0: (), 1: (axis,), 2: matrix_axes}[n_core]
+
+
+def _move_core_axes(a, axis, n_core, *, back=False):
+    """Move the axes holding vectors or matrices to the end, or back."""
+    if not n_core:
+        return a
+    source, destination = _core_axes(axis, n_core), tuple(range(-n_core, 0))
+    if back:
+        source, destination = destination, source
+    return np.moveaxis(a, source, destination)
+
+
+def _move_args(func, args, axis):
+    """Move the vector and matrix axes of inputs to the end.
+
+    Returns the moved inputs and the number of loop dimensions.
+    """
+    core_ndims = _core_ndims(func) or [0] * len(args)
+    args = [_move_core_axes(arg, axis, n_core)
+            for arg, n_core in zip(args, core_ndims)]
+    return args, len(np.broadcast_shapes(*_loop_shapes(func, args)))
+
+
+def _move_results(result, axis, n_loop, *, back=False):
+    """Move the vector and matrix axes of outputs to the end, or back."""
+    if isinstance(result, tuple):
+        return type(result)(*(_move_results(r, axis, n_loop, back=back)
+                              for r in result))
+    return _move_core_axes(result, axis, np.ndim(result) - n_loop, back=back)
+
+
+def _first_row(func, args, loop_shapes, kwargs):
+    """Evaluate a function for the first row, to get the type of its results.
+
+    Any ERFA status codes are ignored, since the row will be done again.
+    """
+    n_loop = max(len(shape) for shape in loop_shapes)
+    args = [arg[:1] if len(shape) == n_loop else arg
+            for arg, shape in zip(args, loop_shapes)]
+    if "status" in inspect.signature(func).parameters:
+        kwargs = kwargs | {"status": "ignore"}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ErfaWarning)
+        return func(*args, **kwargs)
+
+
+def _chunk_slices(n, chunk_size):
+    return [slice(start, min(start + chunk_size, n))
+            for start in range(0, n, chunk_size)]
+
+
+def _slice_out(out, item):
+    if isinstance(out, tuple):
+        return tuple(o[item] for o in out)
+    return out[item]
+
+
+def _reusable(result, n):
+    """Whether result arrays can be reused as outputs for n elements."""
+    results = result if isinstance(result, tuple) else (result,)
+    return all(isinstance(r, np.ndarray) and r.ndim and len(r) >= n
+               for r in results)
+
+
+def _empty_like_rows(result, n):
+    """Allocate an array like a result for one row, for n rows."""
+    return np.empty((n, *result.shape[1:]), result.dtype)
+
+
+def apply_chunks(func, chunks, *, out=None, callback=None, **kwargs):
+    """Evaluate an ERFA function for chunks of inputs from an iterator.
+
+    Parameters
+    ----------
+    func : callable
+        Function from `erfa`, such as `erfa.atco13`.
+    chunks : iterable of tuple
+        Each item holds the inputs for one call of ``func``.  The function
+        should loop over the first axis of the inputs, which together should
+        cover that axis of the full result in order.
+    out : array or tuple of array, optional
+        Arrays, possibly memory-mapped, in which to store the results.  For
+        each chunk, the part of these covering it is passed on as ``out``
+        to ``func``, so the results are written in place.
+    callback : callable, optional
+        Called as ``callback(result, item)`` for each chunk, with the
+        results for the chunk and the `slice` of the first axis of the full
+        result they are for.  Unless ``out`` is given, ``result`` is in
+        buffers that are overwritten by the next chunk, so the callback
+        should copy any data it wants to keep.
+    **kwargs
+        Further keyword arguments for ``func``, such as ``status``.
+
+    Returns
+    -------
+    n : int
+        Length of the first axis of the full result.
+
+    Notes
+    -----
+    ERFA status codes are counted over all chunks, and only checked after
+    the last one, so that any warning or error is as for a single call.
+
+    Raises
+    ------
+    TypeError
+        If neither ``out`` nor ``callback`` is given.
+    ValueError
+        If an ``axis`` argument is given, as chunks are taken along the
+        first axis.
+    """
+    if out is None and callback is None:
+        raise TypeError("either out or callback should be given.")
+    if kwargs.get("axis") is not None:
+        raise ValueError(
+            "apply_chunks needs vectors and matrices along the last axes, "
+            "so cannot take an axis argument; use apply instead."
+        )
+    start = 0
+    buffers = None
+    counts = {}
+    for args in chunks:
+        loop_shape = np.broadcast_shapes(*_loop_shapes(func, args))
+        if not loop_shape:
+            raise ValueError("chunks should have at least one loop dimension.")
+        item = slice(start, start + loop_shape[0])
+        with core._collect_status_counts(counts):
+            if out is not None:
+                result = func(*args, out=_slice_out(out, item), **kwargs)
+            elif buffers is not None and _reusable(buffers, loop_shape[0]):
+                result = func(*args, **kwargs,
+                              out=_slice_out(buffers, slice(loop_shape[0])))
+            else:
+                result = buffers = func(*args, **kwargs)
+        if callback is not None:
+            callback(result, item)
+        start = item.stop
+    core._check_collected(counts)
+    return start
+
+
+def apply(func, *args, chunk_size=1_000_000, out=None, callback=None,
+          **kwargs):
+    """Evaluate an ERFA function in chunks of the given inputs.
+
+    Parameters
+    ----------
+    func : callable
+        Function from `erfa`, such as `erfa.atco13`.
+    *args : array_like
+        Inputs for ``func``, possibly memory-mapped.  These are broadcast
+        against each other as usual, and split in chunks along the first of
+        the axes the function loops over that is longer than one.
+    chunk_size : int, optional
+        Approximate number of elements per chunk, not counting vector and
+        matrix dimensions.  Default: one million.
+    out : array or tuple of array, optional
+        Arrays, possibly memory-mapped, in which to store the results,
+        with the full broadcast shape.  The results are written in place.
+        If neither ``out`` nor ``callback`` is given, arrays are allocated.
+    callback : callable, optional
+        Called as ``callback(result, item)`` for each chunk, with the
+        results for the chunk and the `slice` of the axis along which the
+        full result is chunked.  Unless ``out`` is given, ``result`` is in
+        buffers that are overwritten by the next chunk, so the callback
+        should copy any data it wants to keep.
+    **kwargs
+        Further keyword arguments for ``func``, such as ``status`` or
+        ``axis``.
+
+    Returns
+    -------
+    out : array, tuple of array, or None
+        The output arrays, or `None` if only ``callback`` was given.
+    """
+    if (axis := kwargs.pop("axis", None)) is not None:
+        return _apply_along_axis(func, axis, args, chunk_size, out, callback,
+                                 kwargs)
+    loop_shapes = _loop_shapes(func, args)
+    loop_shape = np.broadcast_shapes(*loop_shapes)
+    n_unit = next((i for i, n in enumerate(loop_shape) if n != 1), 0)
+    if n_unit:
+        return _apply_without_unit_axes(func, n_unit, args, loop_shapes,
+                                        chunk_size, out, callback, kwargs)
+    if not loop_shape:
+        result = func(*args, out=out, **kwargs)
+        if callback is not None:
+            callback(result, slice(None))
+        return result if out is not None or callback is None else None
+
+    if out is None and callback is None:
+        # Allocate outputs like those of the first chunk, but for all rows.
+        first = _first_row(func, args, loop_shapes, kwargs)
+        out = (
+            type(first)(*(_empty_like_rows(r, loop_shape[0]) for r in first))
+            if isinstance(first, tuple)
+            else _empty_like_rows(first, loop_shape[0])
+        )
+
+    rows = max(1, chunk_size // max(1, int(np.prod(loop_shape[1:]))))
+    n_loop = len(loop_shape)
+
+    def chunks():
+        for item in _chunk_slices(loop_shape[0], rows):
+            yield tuple(
+                arg[item] if len(shape) == n_loop and shape[0] != 1 else arg
+                for arg, shape in zip(args, loop_shapes)
+            )
+
+    apply_chunks(func, chunks(), out=out, callback=callback, **kwargs)
+    return out
+
+
+def _apply_along_axis(func, axis, args, chunk_size, out, callback, kwargs):
+    """Apply with vectors and matrices along ``axis``, by moving those axes.
+
+    The inputs and outputs are viewed with the vector and matrix axes last,
+    where the function expects them by default, and the results are viewed
+    with those axes moved back.
+    """
+    args, n_loop = _move_args(func, args, axis)
+    moved_callback = None
+    if callback is not None:
+        def moved_callback(result, item):
+            callback(_move_results(result, axis, n_loop, back=True), item)
+
+    result = apply(func, *args, chunk_size=chunk_size,
+                   out=None if out is None else _move_results(out, axis, n_loop),
+                   callback=moved_callback, **kwargs)
+    if out is not None or result is None:
+        return out
+    return _move_results(result, axis, n_loop, back=True)
+
+
+def _apply_without_unit_axes(func, n_unit, args, loop_shapes, chunk_size, out,
+                             callback, kwargs):
+    """Apply for inputs whose first ``n_unit`` loop axes have length one.
+
+    These axes are removed from the inputs and outputs, so that chunks are
+    taken along the first longer axis, and added back to the results.
+    """
+    n_loop = max(len(shape) for shape in loop_shapes)
+    args = [
+        np.asanyarray(arg)[(0,) * n] if (n := len(shape) - n_loop + n_unit) > 0
+        else arg
+        for arg, shape in zip(args, loop_shapes)
+    ]
+
+    def remove(result):
+        if isinstance(result, tuple):
+            return type(result)(*(remove(r) for r in result))
+        return result[(0,) * n_unit]
+
+    def add(result):
+        if isinstance(result, tuple):
+            return type(result)(*(add(r) for r in result))
+        return result[(np.newaxis,) * n_unit]
+
+    added_callback = None
+    if callback is not None:
+        def added_callback(result, item):
+            callback(add(result), item)
+
+    result = apply(func, *args, chunk_size=chunk_size,
+                   out=None if out is None else remove(out),
+                   callback=added_callback, **kwargs)
+    if out is not None or result is None:
+        return out
+    return add(result)
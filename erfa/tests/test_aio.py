@@ -0,0 +1,114 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+import erfa
+from erfa import ErfaError, aio
+
+N = 200_000
+
+
+def ldn_args(contiguous=True):
+    b = np.zeros(3 if contiguous else 6, erfa.dt_eraLDBODY)
+    if not contiguous:
+        b = b[::2]
+    b["bm"] = 1.0
+    b["dl"] = 1e-6
+    b["pv"]["p"] = [[-7.8, -5.6, -1.9], [0.7, -0.2, -0.1], [0.0, 0.0, 0.0]]
+    return b, np.array([-0.9, -0.4, -0.2]), np.tile([0.0, 0.6, 0.8], (N, 1))
+
+
+@pytest.mark.parametrize("call", [
+    pytest.param(lambda: erfa.ufunc.s2c(np.zeros(5 * N), 0.5), id="double"),
+    pytest.param(
+        lambda: erfa.ufunc.atciq(
+            1.0, 0.5, 0.0, 0.0, 0.0, 0.0,
+            np.repeat(erfa.apci13(2460000.5, 0.0).astrom, N)),
+        id="structured"),
+    pytest.param(lambda: erfa.ufunc.ldn(*ldn_args()), id="ldbody"),
+    pytest.param(lambda: erfa.ufunc.ldn(*ldn_args(contiguous=False)),
+                 id="ldbody-copy"),
+])
+def test_ufunc_loops_release_gil(call):
+    # With a long switch interval, the calling thread can only get the GIL
+    # back before the call in the other thread is done if the ufunc
+    # released it.
+    started = threading.Event()
+    times = {}
+
+    def work():
+        started.set()
+        call()
+        times["call"] = time.perf_counter()
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(10.0)
+    try:
+        thread = threading.Thread(target=work)
+        thread.start()
+        started.wait()
+        times["main"] = time.perf_counter()
+        thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert times["main"] < times["call"]
+
+
+def test_same_results():
+    jd2 = np.linspace(0.0, 1.0, 11)
+
+    async def main():
+        return await asyncio.gather(
+            aio.pnm06a(2451545.0, jd2),
+            aio.apci13(2460000.5, jd2),
+            aio.s2c(jd2, 0.5, out=np.empty((11, 3))),
+        )
+
+    pnm, apci, c = asyncio.run(main())
+    assert_array_equal(pnm, erfa.pnm06a(2451545.0, jd2))
+    assert type(apci) is erfa.core.Apci13Result
+    assert_array_equal(apci.eo, erfa.apci13(2460000.5, jd2).eo)
+    assert_array_equal(c, erfa.s2c(jd2, 0.5))
+
+
+def test_event_loop_not_blocked():
+    ticks = 0
+
+    async def ticker(done):
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    async def main():
+        done = asyncio.Event()
+        task = asyncio.create_task(ticker(done))
+        await aio.pnm06a(2451545.0, np.linspace(0.0, 1.0, 2000))
+        done.set()
+        await task
+
+    asyncio.run(main())
+    assert ticks > 1
+
+
+def test_executor_and_errors():
+    async def main(executor):
+        await aio.run(erfa.anp, 1.0, executor=executor)
+        return await aio.cal2jd(-5000, 1, 1, executor=executor)
+
+    with ThreadPoolExecutor(1) as executor, pytest.raises(ErfaError):
+        asyncio.run(main(executor))
+
+
+def test_only_functions():
+    assert aio.anp.__name__ == "anp"
+    assert "erfa.anp" in aio.anp.__doc__
+    with pytest.raises(AttributeError):
+        aio.ErfaError  # noqa: B018
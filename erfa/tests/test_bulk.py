@@ -0,0 +1,77 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+import erfa
+from erfa import bulk
+
+
+@pytest.fixture
+def r():
+    return erfa.pnm06a(2460000.5, 0.0)
+
+
+@pytest.fixture
+def p():
+    return np.random.default_rng(0).normal(size=(100, 3))
+
+
+@pytest.mark.parametrize("func", ["rxp", "trxp"])
+@pytest.mark.parametrize("axis", [None, -1, 0])
+def test_vectors(func, axis, r, p):
+    if axis == 0:
+        p = np.ascontiguousarray(p.T)
+    expected = getattr(erfa, func)(r, p, axis=axis)
+    result = getattr(erfa, func)(r, p, axis=axis, bulk=True)
+    assert_allclose(result, expected, rtol=0, atol=1e-15)
+    out = np.empty_like(expected)
+    assert getattr(bulk, func)(r, p, axis=axis, out=out) is out
+    assert_array_equal(out, result)
+
+
+def test_vectors_other_shapes(r, p):
+    # Vectors along the first of three axes, and a non-contiguous output.
+    p = p.reshape(3, 10, 10)
+    result = bulk.rxp(r, p, axis=0)
+    assert_allclose(result, erfa.rxp(r, p, axis=0), rtol=0, atol=1e-15)
+    out = np.empty((20, 3))[::2]
+    assert bulk.rxp(r, p[:, 0].T, out=out) is out
+    assert_allclose(out, erfa.rxp(r, p[:, 0].T), rtol=0, atol=1e-15)
+
+
+def test_pv(r, p):
+    pv = erfa.p2pv(np.repeat(p, 2, axis=0))[::2]
+    pv["v"] = p[::-1]
+    expected = erfa.rxpv(r, pv)
+    result = erfa.rxpv(r, pv, bulk=True)
+    assert result.dtype == erfa.dt_pv
+    for name in ("p", "v"):
+        assert_allclose(result[name], expected[name], rtol=0, atol=1e-15)
+    # The result type does not change for a single pv-vector.
+    single = erfa.rxpv(r, pv[0], bulk=True)
+    assert type(single) is type(erfa.rxpv(r, pv[0])) is np.void
+
+
+def test_matrices(r):
+    a = np.stack([erfa.rx(angle, np.eye(3)) for angle in np.linspace(0, 1, 10)])
+    expected = erfa.rxr(a, r)
+    out = np.empty_like(expected)
+    assert erfa.rxr(a, r, out=out, bulk=True) is out
+    assert_allclose(out, expected, rtol=0, atol=1e-15)
+
+
+def test_fallback_to_ufunc(r, p):
+    # Stacks of matrices, and subclasses, go through the ufuncs.
+    rs = np.stack([r, r.T])[:, np.newaxis]
+    assert_array_equal(bulk.rxp(rs, p), erfa.rxp(rs, p))
+    assert_array_equal(bulk.rxr(r, rs), erfa.rxr(r, rs))
+
+    class Vectors(np.ndarray):
+        pass
+
+    result = bulk.rxp(r, p.view(Vectors))
+    assert type(result) is Vectors
+    assert_array_equal(result, erfa.rxp(r, p))
+    with pytest.raises(ValueError, match="mismatch in its core dimension"):
+        bulk.rxp(r, p[:, :2])
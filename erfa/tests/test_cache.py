@@ -0,0 +1,92 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import threading
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+import erfa
+from erfa import ErfaWarning
+
+SITE = (0.0, -1.228798, -0.42982, 2669.0, 0.0, 0.0, 0.0, 0.0, 0.0, 2.5)
+# Fields set by all of apcg13, apci13 and apco13 (others can be left as is).
+GEOCENTRIC = ("pmt", "eb", "eh", "em", "v", "bm1", "bpn")
+
+
+def assert_astrom_equal(astrom, expected, names=GEOCENTRIC):
+    for name in names:
+        assert_array_equal(astrom[name], expected[name])
+
+
+def test_same_as_erfa():
+    cache = erfa.AstromCache()
+    for _ in range(2):
+        astrom, eo = cache.apco13(2460000.5, 0.25, *SITE)
+        expected = erfa.apco13(2460000.5, 0.25, *SITE)
+        # apco13 does not set phi.
+        assert_astrom_equal(astrom, expected.astrom,
+                            set(astrom.dtype.names) - {"phi"})
+        assert eo == expected.eo
+        assert_astrom_equal(cache.apcg13(2460000.5, [0.25, 0.5]),
+                            erfa.apcg13(2460000.5, [0.25, 0.5]))
+        ri, di = erfa.atciq(1.0, 0.5, 0.0, 0.0, 0.0, 0.0, astrom)
+        assert (ri, di) == tuple(erfa.atciq(1.0, 0.5, 0.0, 0.0, 0.0, 0.0,
+                                            expected.astrom))
+    assert cache.cache_info() == (2, 2, 128, 2)
+
+
+def test_hits_and_eviction():
+    cache = erfa.AstromCache(maxsize=2)
+    first = cache.apci13(2460000.5, 0.25)
+    assert cache.apci13(2460000.5, 0.25) is first
+    # Same values with a different type still hit.
+    assert cache.apci13(np.float32(2460000.5), 0.25) is first
+    cache.apci13(2460000.5, 0.5)
+    # Refresh the first, so that the second gets evicted.
+    cache.apci13(2460000.5, 0.25)
+    cache.apci13(2460000.5, 0.75)
+    assert len(cache) == 2
+    assert cache.apci13(2460000.5, 0.25) is first
+    assert cache.hits == 4
+    assert cache.misses == 3
+    cache.apci13(2460000.5, 0.5)
+    assert cache.misses == 4
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+def test_read_only():
+    cache = erfa.AstromCache()
+    astrom, _ = cache.apci13(2460000.5, [0.25, 0.5])
+    with pytest.raises(ValueError, match="read-only"):
+        astrom["eral"] = 0.0
+    astrom, _ = cache.apci13(2460000.5, 0.25)
+    assert isinstance(astrom, np.void)
+    with pytest.raises(ValueError, match="read-only"):
+        astrom["eral"] = 0.0
+    # Functions that copy astrom can still be used.
+    erfa.aper13(2460000.5, 0.25, astrom)
+
+
+def test_warning_only_on_miss():
+    cache = erfa.AstromCache(maxsize=None)
+    with pytest.warns(ErfaWarning, match="dubious year"):
+        cache.apco13(2600000.5, 0.25, *SITE)
+    cache.apco13(2600000.5, 0.25, *SITE)
+    assert cache.cache_info() == (1, 1, None, 1)
+
+
+def test_threads():
+    cache = erfa.AstromCache(maxsize=4)
+
+    def work():
+        for i in range(20):
+            cache.apcg13(2460000.5, (i % 8) / 8)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.hits + cache.misses == 80
+    assert len(cache) == 4
@@ -0,0 +1,131 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+import erfa
+from erfa import ErfaWarning, eop
+
+MJD = np.arange(57150.0, 57250.0)
+# UT1-UTC drifting by -1 ms/day, with a leap second at the start of MJD 57204
+# (2015 July 1), and polar motion changing linearly.
+TABLE = {
+    "mjd": MJD,
+    "dut1": 0.3 - 0.001 * (MJD - 57150.0) + (MJD >= 57204.0),
+    "xp": (0.1 + 0.001 * (MJD - 57150.0)) * erfa.DAS2R,
+    "yp": np.full(MJD.shape, 0.4 * erfa.DAS2R),
+}
+
+
+@pytest.fixture(autouse=True)
+def reset(monkeypatch):
+    monkeypatch.delenv("PYERFA_EOP_FILE", raising=False)
+    eop.set(TABLE)
+    yield
+    eop.set(None)
+
+
+@pytest.mark.parametrize("uniform", [True, False])
+def test_interpolate(uniform):
+    if not uniform:
+        eop.set({name: np.delete(value, [3, 40]) for name, value in TABLE.items()})
+    mjd = np.array([57153.25, 57190.5, 57203.5, 57203.999, 57204.0, 57204.5])
+    result = eop.interpolate(erfa.DJM0, mjd)
+    assert type(result) is eop.EopResult
+    expected = 0.3 - 0.001 * (mjd - 57150.0) + (mjd >= 57204.0)
+    assert_allclose(result.dut1, expected, rtol=0, atol=1e-12)
+    assert_allclose(result.xp, (0.1 + 0.001 * (mjd - 57150.0)) * erfa.DAS2R)
+    assert_array_equal(result.yp, 0.4 * erfa.DAS2R)
+    assert_array_equal(result.dx, 0.0)
+    # Two-part dates and scalars.
+    scalar = eop.interpolate(erfa.DJM0 + 57190.0, 0.5)
+    assert scalar.dut1.shape == ()
+    assert_allclose(scalar.dut1, result.dut1[1], rtol=0, atol=1e-12)
+
+
+def test_outside_and_nan():
+    with pytest.warns(ErfaWarning, match="2 of 4 epochs outside"):
+        result = eop.interpolate(erfa.DJM0, [57000.0, 57160.0, np.nan, 58000.0])
+    assert_array_equal(result.dut1[[0, 3]], TABLE["dut1"][[0, -1]])
+    assert np.isnan(result.dut1[2])
+
+
+def test_validate():
+    with pytest.raises(ValueError, match="strictly increasing"):
+        eop.set({**TABLE, "mjd": MJD[::-1]})
+    with pytest.raises(ValueError, match="at least two"):
+        eop.set({name: value[:1] for name, value in TABLE.items()})
+    with pytest.raises(KeyError, match="'xp'"):
+        eop.set({"mjd": MJD, "dut1": TABLE["dut1"]})
+    # Optional columns can be absent, but not have the wrong length.
+    with pytest.raises(ValueError, match="broadcast"):
+        eop.set({**TABLE, "dx": [1e-9, 2e-9]})
+    with pytest.raises(ValueError, match=r"shape \(n, 6\)"):
+        eop.set(np.zeros((10, 4)))
+    eop.set(None)
+    with pytest.raises(ValueError, match="no Earth orientation"):
+        eop.get()
+
+
+def test_table_types():
+    structured = np.zeros(MJD.size, [(name, "f8") for name in TABLE])
+    for name, value in TABLE.items():
+        structured[name] = value
+    eop.set(structured)
+    expected = eop.get().copy()
+    assert_array_equal(expected["dx"], 0.0)
+    plain = np.stack([expected[name] for name in eop.COLUMNS], axis=-1)
+    eop.set(plain)
+    assert_array_equal(eop.get(), expected)
+
+
+def test_write_and_load(tmp_path):
+    path = tmp_path / "eop.bin"
+    eop.write(path)
+    eop.set(None)
+    eop.load(path)
+    table = eop.get()
+    assert isinstance(table.base, np.memmap)
+    assert_array_equal(table["dut1"], TABLE["dut1"])
+    with pytest.raises(ValueError, match="not an ERFA table"):
+        eop.load(__file__)
+
+
+def test_environment_variable(tmp_path):
+    path = tmp_path / "eop.bin"
+    eop.write(path)
+    code = (
+        "import erfa.eop; "
+        "print(erfa.eop.interpolate(2400000.5, 57190.5).dut1)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], env={"PYERFA_EOP_FILE": str(path)},
+        capture_output=True, check=True, text=True,
+    ).stdout
+    assert float(output) == pytest.approx(0.2595, abs=1e-12)
+
+
+def test_wrappers():
+    utc1, utc2 = erfa.DJM0, np.array([57160.25, 57230.75])
+    dut1, xp, yp, *_ = eop.interpolate(utc1, utc2)
+    site = (0.1, 0.5, 100.0)
+    weather = (1000.0, 10.0, 0.5, 0.55)
+    astrom, eo = eop.apco13(utc1, utc2, *site, *weather)
+    expected = erfa.apco13(utc1, utc2, dut1, *site, xp, yp, *weather)
+    assert_array_equal(astrom["eral"], expected.astrom["eral"])
+    assert_array_equal(eo, expected.eo)
+    star = (1.0, 0.5, 0.0, 0.0, 0.0, 0.0)
+    assert_array_equal(
+        eop.atco13(*star, utc1, utc2, *site, *weather).aob,
+        erfa.atco13(*star, utc1, utc2, dut1, *site, xp, yp, *weather).aob,
+    )
+    tai1, tai2 = erfa.utctai(utc1, utc2)
+    tt1, tt2 = erfa.taitt(tai1, tai2)
+    ut11, ut12 = erfa.utcut1(utc1, utc2, dut1)
+    assert_array_equal(eop.c2t06a(utc1, utc2),
+                       erfa.c2t06a(tt1, tt2, ut11, ut12, xp, yp))
+    assert_array_equal(eop.pom00(utc1, utc2),
+                       erfa.pom00(xp, yp, erfa.sp00(tt1, tt2)))
@@ -1,6 +1,9 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import gc
+import importlib.util
 import platform
 import subprocess
+import sys
 from datetime import datetime
 
 import numpy as np
@@ -322,6 +325,28 @@ def test_struct_ldbody():
                                   -0.2167355420646328159]))
 
 
+@pytest.mark.parametrize("nb", [3, 40])
+# A system liberfa may have been compiled with contraction to FMA.
+@pytest.mark.usefixtures("check_embedded_liberfa")
+def test_ldn_shared_bodies(nb):
+    # If the bodies and observer are the same for all stars, a dedicated loop
+    # is used, which should give identical results to eraLdn for each star,
+    # whether the bodies fit on the stack or not, and for multiple epochs.
+    rng = np.random.default_rng(0)
+    b = np.zeros((2, 2 * nb), erfa.dt_eraLDBODY)[:, ::2]
+    b["bm"] = rng.uniform(1e-6, 1.0, b.shape)
+    b["dl"] = rng.choice([3e-10, 6e-6], b.shape)
+    b["pv"]["p"] = rng.normal(scale=5.0, size=(*b.shape, 3))
+    b["pv"]["v"] = rng.normal(scale=0.005, size=(*b.shape, 3))
+    ob = rng.normal(size=(2, 3))
+    sc = rng.normal(size=(100, 3))
+    sc /= np.linalg.norm(sc, axis=-1, keepdims=True)
+    sn = erfa.ldn(b[:, np.newaxis], ob[:, np.newaxis], sc)
+    assert sn.shape == (2, 100, 3)
+    for i in range(2):
+        assert_array_equal(sn[i], [erfa.ldn(b[i], ob[i], s) for s in sc])
+
+
 def test_struct_astrom():
     """
     Checks producing and consuming of ERFA c struct astrom
@@ -402,6 +427,390 @@ def test_scalar_cal2jd_warning():
         erfa.cal2jd(2026, 11, 2026)
 
 
+class TestThreads:
+    def setup_method(self):
+        self.n_threads = erfa.get_num_threads()
+        self.jd = np.linspace(2450000.0, 2460000.0, 10000)
+
+    def teardown_method(self):
+        erfa.set_num_threads(self.n_threads)
+
+    def check_threaded_equals_serial(self, func, *args):
+        erfa.set_num_threads(1)
+        expected = func(*args)
+        erfa.set_num_threads(4)
+        result = func(*args)
+        for r, e in zip(result, expected):
+            assert_array_equal(r, e)
+
+    def test_ufunc(self):
+        self.check_threaded_equals_serial(
+            erfa.ufunc.atco13, 0.1, 0.2, 0, 0, 0, 0, self.jd, 0.5, 0, 0, 0.7, 100,
+            0, 0, 1000, 10, 0.5, 0.55)
+
+    def test_gufunc(self):
+        self.check_threaded_equals_serial(erfa.ufunc.pnm06a, self.jd[::-2], 0.5)
+
+    def test_ldbody_gufunc(self):
+        b = np.zeros(2, erfa.dt_eraLDBODY)
+        b["bm"] = [0.00028574, 1.0]
+        b["dl"] = [3e-10, 6e-6]
+        b["pv"]["p"] = [[-7.81014427, -5.60956681, -1.98079819],
+                        [-0.000712174377, -0.00230478303, -0.00105865966]]
+        sc = erfa.s2c(np.linspace(0, 2 * np.pi, self.jd.size), 0.1)
+        self.check_threaded_equals_serial(
+            erfa.ufunc.ldn, b, [-0.974170437, -0.2115201, -0.0917583114], sc)
+
+    def test_status_codes(self):
+        iy = np.where(np.arange(self.jd.size) % 7 == 0, 100, 2000)
+        erfa.set_num_threads(4)
+        with pytest.warns(ErfaWarning, match=r'1429 of "dubious year \(Note 1\)"'):
+            erfa.dat(iy, 1, 1, 0.5)
+
+    @pytest.mark.parametrize("n_threads", [0, -1, 100000])
+    def test_invalid_number(self, n_threads):
+        with pytest.raises(ValueError, match="number of threads"):
+            erfa.set_num_threads(n_threads)
+        assert erfa.get_num_threads() == self.n_threads
+
+
+class TestUniqueEpochs:
+    def setup_class(self):
+        rng = np.random.default_rng(0)
+        self.jd = rng.choice([2456855.5, 2456856.5, 2456857.5], size=(20, 30))
+        self.ra = np.linspace(0, 2 * np.pi, 30)
+        self.dec = np.linspace(-1.0, 1.0, 20)[:, None]
+
+    def check_unique_equals_direct(self, func, *args):
+        expected = func(*args)
+        result = func(*args, unique_epochs=True)
+        if not isinstance(expected, tuple):
+            result, expected = (result,), (expected,)
+        assert type(result) is type(expected)
+        for r, e in zip(result, expected):
+            assert r.shape == e.shape
+            assert_array_equal(r, e)
+
+    def test_unique_epochs(self):
+        (jd1, jd2), inverse = erfa.core._unique_epochs((self.jd, 0.25), (self.ra,))
+        assert_array_equal(jd1, [2456855.5, 2456856.5, 2456857.5])
+        assert_array_equal(jd2, 0.25)
+        assert inverse.shape == (20, 30)
+        assert_array_equal(jd1[inverse], self.jd)
+
+    @pytest.mark.parametrize("func", [erfa.pnm06a, erfa.era00, erfa.taitt])
+    def test_time_only(self, func):
+        self.check_unique_equals_direct(func, self.jd, 0.25)
+
+    def test_scalar(self):
+        self.check_unique_equals_direct(erfa.pnm06a, 2456855.5, 0.25)
+
+    def test_apco13(self):
+        args = (self.jd, 0.25, 0.1, 0.2, self.dec, 100, 0, 0, 1000, 10, 0.5, 0.55)
+        expected = erfa.apco13(*args)
+        result = erfa.apco13(*args, unique_epochs=True)
+        assert_array_equal(result.eo, expected.eo)
+        # Note that apco13 does not set astrom.phi.
+        assert result.astrom.shape == expected.astrom.shape
+        for name in set(erfa.dt_eraASTROM.names) - {"phi"}:
+            assert_array_equal(result.astrom[name], expected.astrom[name])
+
+    def test_atco13(self):
+        self.check_unique_equals_direct(
+            erfa.atco13, self.ra, self.dec, 0, 0, 0, 0, self.jd, 0.25, 0.1, 0.2,
+            0.7, 100, 0, 0, 1000, 10, 0.5, 0.55)
+
+    def test_atco13_broadcast_epochs(self):
+        # A single epoch shared by all stars.
+        self.check_unique_equals_direct(
+            erfa.atco13, self.ra, self.dec, 0, 0, 0, 0, 2456855.5, 0.25, 0.1, 0.2,
+            0.7, 100, 0, 0, 1000, 10, 0.5, 0.55)
+
+    @pytest.mark.parametrize(
+        ("func", "n_star_args"), [(erfa.atcc13, 6), (erfa.atci13, 6), (erfa.atic13, 2)]
+    )
+    def test_geocentric(self, func, n_star_args):
+        star_args = (self.ra, self.dec, 1e-7, 2e-7, 0.1, 10.0)[:n_star_args]
+        self.check_unique_equals_direct(func, *star_args, self.jd, 0.25)
+
+    def test_atio13(self):
+        self.check_unique_equals_direct(
+            erfa.atio13, self.ra, self.dec, self.jd, 0.25, 0.1, 0.2, 0.7, 100, 0, 0,
+            1000, 10, 0.5, 0.55)
+
+    def test_status_counts(self):
+        # Every element should be counted, not just the unique ones.
+        jd = np.full(100, 2400000.5)
+        with pytest.warns(ErfaWarning, match=r'100 of "dubious year \(Note 3\)"'):
+            erfa.utctai(jd, 0.5, unique_epochs=True)
+
+
+class TestStatusOptions:
+    def setup_method(self):
+        self.n_threads = erfa.get_num_threads()
+        self.iy = np.where(np.arange(10000) % 7 == 0, 100, 2000)
+
+    def teardown_method(self):
+        erfa.set_num_threads(self.n_threads)
+
+    @pytest.mark.parametrize("n_threads", [1, 4])
+    def test_count(self, n_threads):
+        erfa.set_num_threads(n_threads)
+        with pytest.warns(ErfaWarning, match=r'1429 of "dubious year \(Note 1\)"'):
+            expected = erfa.dat(self.iy, 1, 1, 0.5)
+        with pytest.warns(ErfaWarning, match=r'1429 of "dubious year \(Note 1\)"'):
+            result = erfa.dat(self.iy, 1, 1, 0.5, status="count")
+        assert_array_equal(result, expected)
+        # Any errors take precedence.
+        with pytest.raises(ErfaError, match=r'yielded 1 of "bad day.*, 1 of "bad month"$'):
+            erfa.dat([100, 2000, 2000], [1, 13, 2], [1, 1, 30], 0.5, status="count")
+        assert erfa.ufunc.pop_status_counts() == {}
+
+    def test_count_remap(self):
+        with pytest.warns(ErfaWarning, match='1 of "bad day'):
+            erfa.cal2jd([2000, 2000], 1, [1, 40], status="count")
+
+    def test_ignore(self):
+        expected = erfa.dat(2000, 1, 1, 0.5)
+        result = erfa.dat(self.iy, 1, 1, 0.5, status="ignore")
+        assert_array_equal(result[self.iy == 2000], expected)
+        assert_array_equal(result[self.iy == 100], 0.0)
+        # Codes are still counted, but this does not affect later calls.
+        assert erfa.ufunc.pop_status_counts() == {1: 1429}
+        erfa.dat(self.iy, 1, 1, 0.5, status="ignore")
+        with pytest.warns(ErfaWarning, match='^[^,]*"dubious year[^,]*$'):
+            erfa.dat([100, 2000], 1, 1, 0.5, status="count")
+
+    def test_ignore_unique_epochs(self):
+        erfa.utctai(np.full(100, 2400000.5), 0.5, unique_epochs=True,
+                    status="ignore")
+
+    def test_multiple_outputs(self):
+        result = erfa.utctai([2450000.5, 2400000.5], 0.5, status="ignore")
+        assert isinstance(result, erfa.core.UtctaiResult)
+        assert result.tai2[0] == erfa.utctai(2450000.5, 0.5).tai2
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="status should be"):
+            erfa.dat(2000, 1, 1, 0.5, status="warn")
+        # Also for paths that do not use the status-counting ufuncs.
+        with pytest.raises(ValueError, match="status should be"):
+            erfa.atco13(1.0, 0.5, 0.0, 0.0, 0.0, 0.0, 2460000.5, 0.0, 0.1, 0.2,
+                        0.7, 100.0, 0.0, 0.0, 1000.0, 10.0, 0.5, 0.55,
+                        unique_epochs=True, status="bogus")
+        with pytest.raises(ValueError, match="status should be"):
+            erfa.epv00(2460000.5, 0.0, fast=True, status="bogus")
+
+
+class TestOutArgument:
+    def setup_method(self):
+        self.jd2 = np.linspace(0.0, 1000.0, 11)
+
+    def test_single_output(self):
+        out = np.empty(3)
+        result = erfa.anp(np.array([-1.0, 7.0, 8.0]), out=out)
+        assert result is out
+        assert_array_equal(out, erfa.anp([-1.0, 7.0, 8.0]))
+
+    @pytest.mark.parametrize("unique_epochs", [False, True])
+    def test_result_tuple(self, unique_epochs):
+        expected = erfa.pn06a(2451545.0, self.jd2)
+        out = erfa.core.Pn06aResult(*[np.empty_like(e) for e in expected])
+        result = erfa.pn06a(2451545.0, self.jd2, out=out,
+                            unique_epochs=unique_epochs)
+        assert type(result) is erfa.core.Pn06aResult
+        for r, o, e in zip(result, out, expected):
+            assert r is o
+            assert_array_equal(r, e)
+        # A plain tuple works too.
+        result2 = erfa.pn06a(2451545.0, self.jd2 + 1.0, out=tuple(out),
+                             unique_epochs=unique_epochs)
+        assert type(result2) is erfa.core.Pn06aResult
+        assert result2.rbpn is out.rbpn
+        assert_array_equal(out.rbpn, erfa.pn06a(2451545.0, self.jd2 + 1.0).rbpn)
+
+    def test_sign(self):
+        expected = erfa.a2af(3, [-1.0, 1.0])
+        out = (np.empty(2, "S1"), np.empty_like(expected.idmsf))
+        result = erfa.a2af(3, [-1.0, 1.0], out=out)
+        assert_array_equal(out[0], [b"-", b"+"])
+        assert_array_equal(result.sign, expected.sign)
+        assert result.idmsf is out[1]
+
+    @pytest.mark.parametrize("status", ["raise", "count", "ignore"])
+    def test_status(self, status):
+        out = (np.empty(2), np.empty(2))
+        result = erfa.cal2jd(2000, [1, 2], 1, out=out, status=status)
+        assert result.djm is out[1]
+        assert_array_equal(out[1], [51544.0, 51575.0])
+        out = np.empty(2)
+        assert erfa.dat(2000, [1, 2], 1, 0.0, out=out, status=status) is out
+        assert_array_equal(out, 32.0)
+
+    def test_inout_in_place(self):
+        astrom = np.zeros(2, erfa.dt_eraASTROM)
+        astrom["along"] = 0.5
+        result = erfa.aper([1.0, 2.0], astrom, out=astrom)
+        assert result is astrom
+        assert_array_equal(astrom["eral"], [1.5, 2.5])
+
+    def test_wrong_number(self):
+        with pytest.raises(ValueError, match="out should have 8 arrays"):
+            erfa.pn06a(2451545.0, self.jd2, out=(np.empty(11),),
+                       unique_epochs=True)
+
+
+class TestAxis:
+    """Vectors and matrices along other axes than the last ones."""
+
+    def setup_method(self):
+        rng = np.random.default_rng(42)
+        self.a = rng.normal(size=(3, 10))
+        self.b = rng.normal(size=(3, 10))
+        self.r = rng.normal(size=(3, 3, 10))
+
+    def test_vector_inputs(self):
+        assert_array_equal(erfa.pdp(self.a, self.b, axis=0),
+                           erfa.pdp(self.a.T, self.b.T))
+        result = erfa.pxp(self.a, self.b, axis=0)
+        assert result.shape == (3, 10)
+        assert_array_equal(result, erfa.pxp(self.a.T, self.b.T).T)
+
+    def test_spherical_cartesian(self):
+        theta, phi = erfa.c2s(self.a, axis=0)
+        assert_array_equal(theta, erfa.c2s(self.a.T).theta)
+        assert_array_equal(phi, erfa.c2s(self.a.T).phi)
+        result = erfa.s2c(theta, phi, axis=0)
+        assert result.shape == (3, 10)
+        assert_array_equal(result, erfa.s2c(theta, phi).T)
+
+    def test_matrix(self):
+        r = np.moveaxis(self.r, -1, 0)
+        result = erfa.rxp(self.r, self.a, axis=0)
+        assert_array_equal(result, erfa.rxp(r, self.a.T).T)
+        assert_array_equal(erfa.rxr(self.r, self.r, axis=0),
+                           np.moveaxis(erfa.rxr(r, r), 0, -1))
+        # Negative axes count from the end, with matrix rows before columns.
+        assert_array_equal(erfa.rxp(r, self.a.T, axis=-1), erfa.rxp(r, self.a.T))
+
+    @pytest.mark.parametrize("status", ["raise", "count", "ignore"])
+    def test_status_and_out(self, status):
+        v0 = np.array([[1.0], [0.0], [0.0]])
+        v = v0 + np.array([[0.0], [0.1], [0.2]]) * np.arange(1, 5)
+        out = (np.empty(4), np.empty(4))
+        result = erfa.tpxev(v, v0, axis=0, status=status, out=out)
+        assert result.xi is out[0]
+        expected = erfa.tpxev(v.T, v0.T)
+        assert_array_equal(result.xi, expected.xi)
+        assert_array_equal(result.eta, expected.eta)
+
+    def test_no_copy_of_out(self):
+        out = np.empty((3, 10))
+        assert erfa.pxp(self.a, self.b, axis=0, out=out) is out
+        assert_array_equal(out, erfa.pxp(self.a.T, self.b.T).T)
+
+
+class TestStridedLoops:
+    """Cheap functions have their own loops for operands in whole doubles."""
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        self.scalars = np.concatenate(
+            [[0.0, -0.0, np.pi, -np.pi, 2 * np.pi, 1e10, np.nan],
+             rng.normal(scale=10.0, size=93)])
+        self.vectors = np.concatenate(
+            [[[0.0, 0.0, 0.0], [-0.0, 0.0, -0.0], [0.0, 0.0, 1.0],
+              [1e300, 1e300, 0.0], [np.nan, 1.0, 0.0]],
+             rng.normal(size=(95, 3))])
+        self.matrices = rng.normal(size=(100, 3, 3))
+
+    @pytest.mark.parametrize(("func", "args"), [
+        ("anp", ["scalars"]),
+        ("anpm", ["scalars"]),
+        ("pdp", ["vectors", "vectors"]),
+        ("pxp", ["vectors", "vectors"]),
+        ("pn", ["vectors"]),
+        ("rxp", ["matrices", "vectors"]),
+        ("rxr", ["matrices", "matrices"]),
+        ("s2c", ["scalars", "scalars"]),
+        ("c2s", ["vectors"]),
+    ])
+    @pytest.mark.filterwarnings("ignore:(overflow|invalid value):RuntimeWarning")
+    # A system liberfa may have been compiled with contraction to FMA.
+    @pytest.mark.usefixtures("check_embedded_liberfa")
+    def test_identical_to_liberfa(self, func, args):
+        # The functions in erfa.scalar call liberfa for each element.
+        ufunc = getattr(erfa.ufunc, func)
+        args = [getattr(self, arg) for arg in args]
+        expected = [getattr(erfa.scalar, func)(*items) for items in zip(*args)]
+        expected = [np.array(e) for e in
+                    (zip(*expected) if ufunc.nout > 1 else [expected])]
+        results = {
+            "contiguous": ufunc(*args),
+            "reversed": ufunc(*(a[::-1] for a in args)),
+        }
+        if ufunc.signature:
+            # Vectors and matrices as planes, read and written in place.
+            planes = [np.ascontiguousarray(np.moveaxis(a, 0, -1)) for a in args]
+            out = tuple(np.empty(e.shape[1:] + e.shape[:1]) for e in expected)
+            results["axis"] = getattr(erfa, func)(
+                *planes, axis=0, out=out if ufunc.nout > 1 else out[0])
+        for layout, result in results.items():
+            if ufunc.nout == 1:
+                result = (result,)
+            for r, e in zip(result, expected):
+                if layout == "reversed":
+                    r = r[::-1]
+                elif layout == "axis":
+                    r = np.moveaxis(r, -1, 0)
+                assert_array_equal(r.view("i8"), e.view("i8"), err_msg=layout)
+
+    def test_in_place(self):
+        vectors = self.vectors[5:].copy()
+        expected = erfa.rxp(self.matrices[5:], vectors)
+        result = erfa.rxp(self.matrices[5:], vectors, out=vectors)
+        assert result is vectors
+        assert_array_equal(vectors, expected)
+
+
+class TestBroadcastInputs:
+    """Inputs that are the same for all elements are converted only once."""
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        self.r = rng.normal(size=(3, 3))
+        self.p = rng.normal(size=(10, 3))
+
+    @pytest.mark.parametrize("func", ["rxp", "trxp", "rxpv"])
+    @pytest.mark.parametrize("transpose", [False, True])
+    def test_matrix(self, func, transpose):
+        # Transposed, the matrix has to be copied to a buffer.
+        r = self.r.T if transpose else self.r
+        p = erfa.p2pv(self.p) if func == "rxpv" else self.p
+        result = getattr(erfa, func)(r, p)
+        for i in range(len(p)):
+            assert_array_equal(result[i], getattr(erfa, func)(r, p[i]))
+
+    def test_vector_for_matrices(self):
+        r = np.stack([erfa.rx(a, self.r) for a in np.linspace(0, 1, 10)])
+        p = np.repeat(self.p[0], 2)[::2]
+        result = erfa.rxp(r, p)
+        assert_array_equal(result, [erfa.rxp(ri, self.p[0]) for ri in r])
+
+    def test_bodies(self):
+        astrom = erfa.apci13(2456165.5, 0.401182685).astrom
+        b = np.zeros(4, erfa.dt_eraLDBODY)[::2]
+        b["bm"] = [0.00028574, 1.0]
+        b["dl"] = [3e-10, 6e-6]
+        b["pv"]["p"] = [[-7.81014427, -5.60956681, -1.98079819],
+                        [-0.000712174377, -0.00230478303, -0.00105865966]]
+        rc = np.linspace(0.0, 6.0, 10)
+        ri, di = erfa.atciqn(rc, 0.5, 0.0, 0.0, 0.0, 0.0, astrom, b)
+        for i in range(len(rc)):
+            expected = erfa.atciqn(rc[i], 0.5, 0.0, 0.0, 0.0, 0.0, astrom, b)
+            assert_array_equal((ri[i], di[i]), expected)
+
+
 class TestAstromNotInplace:
     def setup_method(self):
         self.mjd_array = np.array(
@@ -452,6 +861,88 @@ class TestOutputType:
         assert out.dtype.names == ('p', 'v')
 
 
+class TestConvertTimescale:
+    def setup_class(self):
+        self.jd1 = 2457754.5
+        self.jd2 = np.array([0.1, 0.3, 0.75])
+
+    def test_utc_tdb(self):
+        tdb = erfa.convert_timescale(self.jd1, self.jd2, "utc", "tdb")
+        tt = erfa.taitt(*erfa.utctai(self.jd1, self.jd2))
+        dtr = erfa.dtdb(*tt, 0.0, 0.0, 0.0, 0.0)
+        expected = erfa.tttdb(*tt, dtr)
+        assert_array_equal(tdb.jd1, expected.tdb1)
+        assert_array_equal(tdb.jd2, expected.tdb2)
+        utc = erfa.convert_timescale(*tdb, "TDB", "UTC")
+        assert_allclose((utc.jd1 - self.jd1) + (utc.jd2 - self.jd2), 0,
+                        atol=1e-15)
+
+    def test_topocentric_tdb(self):
+        tt = erfa.convert_timescale(self.jd1, self.jd2, "tai", "tt")
+        tdb = erfa.convert_timescale(*tt, "tt", "tdb", elong=0.3, u=5000.0,
+                                     v=2000.0)
+        ut = np.fmod(tt.jd1 - 0.5, 1.0) + np.fmod(tt.jd2, 1.0)
+        expected = erfa.tttdb(*tt, erfa.dtdb(*tt, ut, 0.3, 5000.0, 2000.0))
+        assert_array_equal(tdb.jd2, expected.tdb2)
+
+    def test_ut1(self):
+        tai = erfa.convert_timescale(self.jd1, self.jd2, "ut1", "tai",
+                                     dut1=[0.1, 0.2, 0.3])
+        expected = erfa.utctai(*erfa.ut1utc(self.jd1, self.jd2, [0.1, 0.2, 0.3]))
+        assert_array_equal(tai.jd2, expected.tai2)
+        tcg = erfa.convert_timescale(self.jd1, self.jd2, "tcb", "tcg")
+        expected = erfa.tttcg(*erfa.tdbtt(
+            *erfa.tcbtdb(self.jd1, self.jd2),
+            erfa.dtdb(*erfa.tcbtdb(self.jd1, self.jd2), 0.0, 0.0, 0.0, 0.0),
+        ))
+        assert_array_equal(tcg.jd2, expected.tcg2)
+
+    def test_same_scale(self):
+        tt = erfa.convert_timescale(self.jd1, self.jd2, "tt", "tt")
+        assert_array_equal(tt.jd2, self.jd2)
+
+    def test_scalar(self):
+        tai = erfa.convert_timescale(self.jd1, 0.1, "utc", "tai")
+        assert tai == erfa.utctai(self.jd1, 0.1)
+
+    def test_status_and_out(self):
+        with pytest.warns(ErfaWarning, match="2 of .dubious year"):
+            erfa.convert_timescale(2415020.5, [0.0, 0.5], "tt", "utc")
+        with pytest.raises(ErfaError, match="unacceptable date"):
+            erfa.convert_timescale(-1e6, 0.0, "utc", "tai", status="count")
+        out = erfa.core.ConvertTimescaleResult(np.empty(3), np.empty(3))
+        tai = erfa.convert_timescale(self.jd1, self.jd2, "utc", "tai", out=out)
+        assert tai.jd2 is out[1]
+        assert_array_equal(tai.jd2, erfa.utctai(self.jd1, self.jd2).tai2)
+
+    def test_unknown_scale(self):
+        with pytest.raises(ValueError, match="time scale should be one of"):
+            erfa.convert_timescale(self.jd1, self.jd2, "utc", "gps")
+
+
+class TestLazyWrappers:
+    def test_not_imported_with_erfa(self):
+        code = (
+            "import sys, erfa;"
+            "print(sorted(m for m in sys.modules if m.startswith('erfa._core.')));"
+            "erfa.cal2jd(2024, 1, 1);"
+            "print(sorted(m for m in sys.modules if m.startswith('erfa._core.')))"
+        )
+        out = subprocess.check_output([sys.executable, "-c", code], text=True)
+        assert out.splitlines() == ["[]", "['erfa._core.calendars']"]
+
+    def test_all_available(self):
+        assert set(erfa.core.__all__) <= set(erfa.__all__)
+        assert set(erfa.core.__all__) <= set(dir(erfa))
+        for name in erfa.core.__all__:
+            assert getattr(erfa, name) is getattr(erfa.core, name)
+        assert erfa.core.Cal2jdResult is type(erfa.cal2jd(2024, 1, 1))
+
+    def test_missing(self):
+        assert not hasattr(erfa, "cal2jdx")
+        assert not hasattr(erfa.core, "cal2jdx")
+
+
 class TestLeapSecondsBasics:
     def test_get_leap_seconds(self):
         leap_seconds = erfa.leap_seconds.get()
@@ -589,3 +1080,111 @@ class TestLeapSeconds:
         with pytest.warns(erfa.ErfaWarning,
                           match='non-datetime.*parsing it raised'):
             erfa.leap_seconds.set(leap_seconds.view(ExpiringArray))
+
+    def test_module_instances(self):
+        # Each import of the extension gives an independent module, with its
+        # own dtypes and leap-second array.
+        spec = importlib.util.spec_from_file_location(erfa.ufunc.__name__,
+                                                      erfa.ufunc.__file__)
+        other = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(other)
+        assert other is not erfa.ufunc
+        assert other.dt_eraASTROM is not erfa.ufunc.dt_eraASTROM
+        assert other.dt_eraASTROM == erfa.ufunc.dt_eraASTROM
+        assert other.cal2jd(2000, 1, 1) == erfa.ufunc.cal2jd(2000, 1, 1)
+        # But ERFA has only one table, which is shared.
+        other.set_leap_seconds(self.erfa_ls[:-1])
+        assert_array_equal(erfa.leap_seconds.get(), self.erfa_ls[:-1])
+        # If the module is removed, ERFA should stop using its table.
+        del other
+        gc.collect()
+        assert_array_equal(erfa.leap_seconds.get(), self.erfa_ls)
+
+
+class TestLeapSecondLookup:
+    """Test the vectorized functions using the indexed leap-second table."""
+
+    def setup_method(self):
+        self.erfa_ls = erfa.leap_seconds.get()
+        self._expires = erfa.leap_seconds._expires
+        # Dates from before UTC to dubious years, including days with
+        # leap seconds, with both orders of the two-part dates.
+        days = np.arange(2436500.5, 2465000.5, 7.0)
+        leap_days = erfa.ufunc.cal2jd(self.erfa_ls["year"],
+                                      self.erfa_ls["month"], 1)[:2]
+        days = np.concatenate([days, sum(leap_days) - 1.0, sum(leap_days)])
+        fraction = np.linspace(0.0, 1.0, days.size)
+        self.jd1 = np.concatenate([days, fraction])
+        self.jd2 = np.concatenate([fraction, days])
+
+    def teardown_method(self):
+        erfa.leap_seconds.set(self.erfa_ls)
+        erfa.leap_seconds._expires = self._expires
+
+    def check(self):
+        iy, im, id, _ = erfa.jd2cal(self.jd1, self.jd2)
+        fd = np.linspace(0.0, 1.0, iy.size)
+        with pytest.warns(ErfaWarning):
+            result = erfa.leap_seconds.dat(iy, im, id, fd)
+        with pytest.warns(ErfaWarning):
+            expected = erfa.dat(iy, im, id, fd)
+        assert_array_equal(result, expected)
+        for func in ("utctai", "taiutc"):
+            with pytest.warns(ErfaWarning):
+                result = getattr(erfa.leap_seconds, func)(self.jd1, self.jd2)
+            with pytest.warns(ErfaWarning):
+                expected = getattr(erfa, func)(self.jd1, self.jd2)
+            assert_array_equal(result, expected)
+
+    def test_builtin_table(self):
+        self.check()
+
+    def test_changed_table(self):
+        # Start with an entry in July, so that earlier dates in the same
+        # year are invalid, and check the lookup follows an update.
+        table = self.erfa_ls[self.erfa_ls["year"] < 2000]
+        erfa.leap_seconds.set(table[table["year"] >= 1972][1:])
+        for func in (erfa.leap_seconds.dat, erfa.dat):
+            with pytest.raises(ErfaError, match="internal error"):
+                func(1972, [1, 6, 7], 1, 0.0)
+        after = self.jd1 >= 2441499.5
+        self.jd1, self.jd2 = self.jd1[after], self.jd2[after]
+        self.check()
+        erfa.leap_seconds.update(self.erfa_ls)
+        self.check()
+
+    def test_scalar(self):
+        assert erfa.leap_seconds.dat(2020, 1, 1, 0.0) == 37.0
+        tai = erfa.leap_seconds.utctai(2458849.5, 0.5)
+        assert tai == erfa.utctai(2458849.5, 0.5)
+        assert all(np.ndim(part) == 0 for part in tai)
+        utc = erfa.leap_seconds.taiutc(*tai)
+        assert utc == erfa.taiutc(*tai)
+
+    @pytest.mark.parametrize("jd", [2438000.5, 2441300.5])
+    def test_scalar_drift(self, jd):
+        # Before 1972, TAI-UTC drifts.
+        iy, im, id, _ = erfa.jd2cal(jd, 0.0)
+        assert erfa.leap_seconds.dat(iy, im, id, 0.5) == erfa.dat(iy, im, id, 0.5)
+        tai = erfa.leap_seconds.utctai(jd, 0.3)
+        assert tai == erfa.utctai(jd, 0.3)
+        assert erfa.leap_seconds.taiutc(*tai) == erfa.taiutc(*tai)
+
+    def test_entry_after_dubious_year(self):
+        erfa.leap_seconds.update([(2035, 1, 38.0)])
+        self.jd1 = np.concatenate([self.jd1, np.arange(2462000.5, 2467000.5)])
+        self.jd2 = np.concatenate([self.jd2, np.full(5000, 0.25)])
+        self.check()
+
+    def test_errors(self):
+        with pytest.raises(ErfaError, match=r'1 of "bad day.*1 of "bad month"'):
+            erfa.leap_seconds.dat(2000, [1, 13, 2], [1, 1, 30], 0.0)
+        with pytest.raises(ErfaError, match='1 of "bad fraction'):
+            erfa.leap_seconds.dat(2000, 1, 1, [0.0, 1.5])
+        # Scalars, including ones that map to the row for dates before UTC.
+        with pytest.raises(ErfaError, match='1 of "bad month"'):
+            erfa.leap_seconds.dat(2020, 13, 1, 0.5)
+        with pytest.raises(ErfaError, match='1 of "bad year"'):
+            erfa.leap_seconds.dat(-5000, 1, 1, 0.5)
+        with pytest.raises(ErfaError, match='1 of "unacceptable date"'):
+            erfa.leap_seconds.utctai([2451545.0, -1e6], 0.0)
@@ -0,0 +1,173 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+import erfa
+from erfa import _table, fast
+
+# Use tables that only cover 1000 days, to keep tests fast.
+START = 2451545.0
+STOP = START + 1000.0
+JD = np.linspace(START, STOP, 201)
+ASTROM_SET_BY_APCG = ("pmt", "eb", "eh", "em", "v", "bm1", "bpn")
+
+
+@pytest.fixture(autouse=True)
+def short_tables(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYERFA_CACHE_DIR", str(tmp_path))
+    for table in fast._TABLES.values():
+        monkeypatch.setattr(table, "start", START)
+        monkeypatch.setattr(table, "stop", STOP)
+        monkeypatch.setattr(table, "_coefficients", None)
+
+
+def test_table_round_trip(tmp_path):
+    data = np.arange(24.0).reshape(2, 3, 4)
+    _table.write(tmp_path / "table.bin", data, answer=42, name="test")
+    result, meta = _table.read(tmp_path / "table.bin")
+    assert isinstance(result, np.memmap)
+    assert_array_equal(result, data)
+    assert meta == {"answer": 42, "name": "test"}
+    assert result.offset % _table.ALIGNMENT == 0
+
+
+def test_table_invalid(tmp_path):
+    (tmp_path / "table.bin").write_bytes(b"not a table")
+    with pytest.raises(ValueError, match="not an ERFA table"):
+        _table.read(tmp_path / "table.bin")
+    _table.write(tmp_path / "table.bin", np.zeros(10))
+    with (tmp_path / "table.bin").open("r+b") as f:
+        f.truncate(100)
+    with pytest.raises(ValueError, match="truncated"):
+        _table.read(tmp_path / "table.bin")
+
+
+def test_epv00():
+    result = fast.epv00(JD, 0.5)
+    expected = erfa.epv00(JD, 0.5)
+    for r, e in zip(result, expected):
+        assert r.shape == e.shape
+        assert_allclose(r["p"], e["p"], rtol=0, atol=1e-12)
+        assert_allclose(r["v"], e["v"], rtol=0, atol=1e-12)
+
+
+def test_epv00_outside_table():
+    jd = np.array([START - 1.0, START + 1.0, STOP + 1.0])
+    result = fast.epv00(jd, 0.0)
+    expected = erfa.epv00(jd, 0.0)
+    for r, e in zip(result, expected):
+        assert_array_equal(r[[0, 2]], e[[0, 2]])
+        assert_allclose(r[1]["p"], e[1]["p"], rtol=0, atol=1e-12)
+    # Outside of the range of the full series, we get its warning.
+    with pytest.warns(erfa.ErfaWarning, match='1 of "warning: date outside'):
+        fast.epv00([START, 2488071.0], 0.0)
+    with pytest.warns(erfa.ErfaWarning, match='1 of "warning: date outside'):
+        erfa.epv00([START, 2488071.0], 0.0, fast=True)
+    erfa.epv00([START, 2488071.0], 0.0, fast=True, status="ignore")
+
+
+def test_epv00_scalar():
+    result = fast.epv00(START, 100.25)
+    assert result.pvh.shape == result.pvb.shape == ()
+    assert_allclose(
+        result.pvh["p"], erfa.epv00(START, 100.25).pvh["p"], rtol=0, atol=1e-12
+    )
+
+
+def test_table_cached(tmp_path):
+    table = fast._TABLES["epv00"]
+    fast.epv00(START, 0.0)
+    path = tmp_path / f"epv00-{erfa.version.erfa_version}.bin"
+    coefficients, meta = _table.read(path)
+    assert meta["start"] == START
+    assert meta["stop"] == STOP
+    assert len(meta["max_error"]) == 12
+    assert max(meta["max_error"]) < 1e-12
+    assert_array_equal(coefficients, table._coefficients)
+    # Check the cached table gets used.
+    table._coefficients = None
+    fast.epv00(START, 0.0)
+    assert isinstance(table._coefficients, np.memmap)
+
+
+def test_table_mismatch(tmp_path, monkeypatch):
+    path = fast.generate_table("epv00")
+    assert path == tmp_path / f"epv00-{erfa.version.erfa_version}.bin"
+    table = fast._TABLES["epv00"]
+    monkeypatch.setattr(table, "stop", STOP - 100.0)
+    result = fast.epv00(START + 50.0, 0.0)
+    assert table.coefficients.shape[0] == 90
+    assert_allclose(
+        result.pvh["p"], erfa.epv00(START + 50.0, 0.0).pvh["p"], rtol=0, atol=1e-12
+    )
+
+
+def test_dtdb():
+    rng = np.random.default_rng(0)
+    ut, elong = rng.uniform(0.0, 1.0, JD.size), rng.uniform(-np.pi, np.pi, JD.size)
+    u, v = rng.uniform(0.0, 6400.0, JD.size), rng.uniform(-6400.0, 6400.0, JD.size)
+    result = fast.dtdb(JD, 0.5, ut, elong, u, v)
+    assert_allclose(result, erfa.dtdb(JD, 0.5, ut, elong, u, v), rtol=0, atol=1e-12)
+    max_error = max(_table.read(fast._TABLES["dtdb"].path)[1]["max_error"])
+    assert max_error < 1e-12
+
+
+@pytest.mark.parametrize("unique_epochs", [False, True])
+def test_dtdb_shapes(unique_epochs):
+    jd = np.array([START - 1.0, START, STOP, STOP + 1.0])
+    args = (jd[:, np.newaxis], 0.5, [0.25, 0.75], 1.0, 5000.0, 1000.0)
+    result = erfa.dtdb(*args, fast=True, unique_epochs=unique_epochs)
+    expected = erfa.dtdb(*args)
+    assert result.shape == expected.shape == (4, 2)
+    assert_array_equal(result[[0, 3]], expected[[0, 3]])
+    assert_allclose(result, expected, rtol=0, atol=1e-12)
+    scalar = erfa.dtdb(START, 0.5, 0.25, 1.0, 5000.0, 1000.0, fast=True)
+    assert type(scalar) is type(erfa.dtdb(START, 0.5, 0.25, 1.0, 5000.0, 1000.0))
+    out = np.empty((4, 2))
+    assert erfa.dtdb(*args, fast=True, unique_epochs=unique_epochs, out=out) is out
+    assert_array_equal(out, result)
+
+
+@pytest.mark.parametrize("unique_epochs", [False, True])
+def test_apcg13(unique_epochs):
+    result = erfa.apcg13(JD, 0.5, fast=True, unique_epochs=unique_epochs)
+    expected = erfa.apcg13(JD, 0.5)
+    for name in ASTROM_SET_BY_APCG:
+        assert_allclose(result[name], expected[name], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("unique_epochs", [False, True])
+def test_apci13(unique_epochs):
+    result = erfa.apci13(JD, 0.5, fast=True, unique_epochs=unique_epochs)
+    expected = erfa.apci13(JD, 0.5)
+    assert_array_equal(result.eo, expected.eo)
+    for name in (*ASTROM_SET_BY_APCG, "bpn"):
+        assert_allclose(result.astrom[name], expected.astrom[name], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("unique_epochs", [False, True])
+def test_apco13(unique_epochs):
+    args = (JD[:, np.newaxis], 0.5, 0.1, 0.2, [0.7, 0.8], 100, 0, 0, 1000, 10, 0.5,
+            0.55)
+    result = erfa.apco13(*args, fast=True, unique_epochs=unique_epochs)
+    expected = erfa.apco13(*args)
+    assert_array_equal(result.eo, expected.eo)
+    for name in set(erfa.dt_eraASTROM.names) - {"phi"}:
+        assert_allclose(result.astrom[name], expected.astrom[name], rtol=0, atol=1e-12)
+
+
+def test_apco13_status():
+    with pytest.warns(erfa.ErfaWarning, match='1 of "dubious year'):
+        erfa.apco13(2400000.5, 0.5, 0.1, 0.2, 0.7, 100, 0, 0, 1000, 10, 0.5, 0.55,
+                    fast=True)
+    with pytest.raises(erfa.ErfaError, match='1 of "unacceptable date"'):
+        erfa.apco13([START, 1e9], 0.5, 0.1, 0.2, 0.7, 100, 0, 0, 1000, 10, 0.5, 0.55,
+                    fast=True)
+    erfa.apco13([START, 1e9], 0.5, 0.1, 0.2, 0.7, 100, 0, 0, 1000, 10, 0.5, 0.55,
+                fast=True, status="ignore")
+    with pytest.raises(ValueError, match="status should be"):
+        erfa.apco13(START, 0.5, 0.1, 0.2, 0.7, 100, 0, 0, 1000, 10, 0.5, 0.55,
+                    fast=True, status="bogus")
+    with pytest.raises(ValueError, match="status should be"):
+        fast.epv00(START, 0.5, status="bogus")
@@ -0,0 +1,68 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+import erfa
+from erfa.interp import Interpolator
+
+JD0 = 2460000.5
+
+
+@pytest.mark.parametrize("func", [erfa.pnm06a, erfa.nut06a, erfa.xys06a])
+@pytest.mark.parametrize("atol", [1e-9, 1e-12])
+def test_interpolation(func, atol):
+    interpolator = Interpolator(func, JD0, JD0 + 10.0, atol=atol)
+    assert interpolator.max_error <= atol
+    jd2 = np.linspace(0.0, 10.0, 1001)
+    expected = func(JD0, jd2)
+    result = interpolator(JD0, jd2)
+    assert type(result) is type(expected)
+    for r, e in zip(result, expected):
+        assert r.shape == e.shape
+        assert_allclose(r, e, rtol=0, atol=2 * atol)
+
+
+def test_s06():
+    interpolator = Interpolator(erfa.s06, JD0, JD0 + 1.0)
+    jd2 = np.linspace(0.0, 1.0, 101)
+    x, y, _ = erfa.xys06a(JD0, jd2)
+    assert_allclose(
+        interpolator(JD0, jd2, x, y), erfa.s06(JD0, jd2, x, y), rtol=0, atol=2e-12
+    )
+
+
+def test_two_part_dates():
+    interpolator = Interpolator(erfa.pnm06a, JD0, JD0 + 1.0)
+    result = interpolator(JD0 + 0.5, np.array([0.0, 0.25]))
+    assert result.shape == (2, 3, 3)
+    assert_allclose(result, erfa.pnm06a(JD0 + 0.5, [0.0, 0.25]), atol=2e-12)
+    assert interpolator(JD0, 0.5).shape == (3, 3)
+
+
+def test_segments():
+    interpolator = Interpolator(erfa.nut06a, JD0, JD0 + 100.0, atol=1e-12)
+    assert interpolator.breaks[0] == 0.0
+    assert interpolator.breaks[-1] == 100.0
+    assert np.all(np.diff(interpolator.breaks) > 0)
+    # A lower degree needs more segments.
+    low = Interpolator(erfa.nut06a, JD0, JD0 + 100.0, atol=1e-12, degree=6)
+    assert low.breaks.size > interpolator.breaks.size
+    assert low.max_error <= 1e-12
+
+
+def test_min_span():
+    interpolator = Interpolator(erfa.pnm06a, JD0, JD0 + 1.0, atol=0.0, min_span=0.2)
+    assert interpolator.max_error > 0.0
+    assert np.all(np.diff(interpolator.breaks) >= 0.2)
+
+
+def test_out_of_range():
+    interpolator = Interpolator(erfa.pnm06a, JD0, JD0 + 1.0)
+    with pytest.raises(ValueError, match="dates should be between"):
+        interpolator(JD0, [0.5, 1.5])
+
+
+def test_invalid_range():
+    with pytest.raises(ValueError, match="stop should be after start"):
+        Interpolator(erfa.pnm06a, JD0, JD0)
@@ -0,0 +1,101 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import warnings
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+import erfa
+from erfa import ErfaError, ErfaWarning, parallel
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with parallel.Executor(max_workers=2) as executor:
+        yield executor
+
+
+def test_structured_outputs(executor):
+    jd2 = np.linspace(0.0, 1.0, 101)
+    result = executor.apply(erfa.apci13, 2460000.5, jd2, chunk_size=10)
+    expected = erfa.apci13(2460000.5, jd2)
+    assert type(result) is type(expected)
+    assert result.astrom.dtype == erfa.dt_eraASTROM
+    assert_array_equal(result.astrom["bpn"], expected.astrom["bpn"])
+    assert_array_equal(result.eo, expected.eo)
+    # Structured inputs.
+    pv = erfa.epv00(2460000.5, jd2).pvb
+    r, s = executor.apply(erfa.pvm, pv)
+    assert_array_equal(r, erfa.pvm(pv).r)
+    assert_array_equal(s, erfa.pvm(pv).s)
+
+
+def test_ldbody_and_out(executor):
+    b = np.zeros(3, erfa.dt_eraLDBODY)
+    b["bm"] = 1.0
+    b["dl"] = 1e-6
+    b["pv"]["p"] = [[-7.8, -5.6, -1.9], [0.7, -0.2, -0.1], [0.0, 0.0, 0.0]]
+    ob = np.array([-0.9, -0.4, -0.2])
+    sc = np.random.default_rng(0).normal(size=(50, 3))
+    sc /= np.linalg.norm(sc, axis=-1, keepdims=True)
+    out = np.empty((50, 3))
+    assert executor.apply(erfa.ldn, b, ob, sc, chunk_size=7, out=out) is out
+    assert_array_equal(out, erfa.ldn(b, ob, sc))
+
+
+def test_axis(executor):
+    # Vectors and matrices along the first axes, for inputs and outputs.
+    rng = np.random.default_rng(0)
+    p = rng.normal(size=(3, 1000))
+    result = executor.apply(erfa.c2s, p, axis=0)
+    expected = erfa.c2s(p, axis=0)
+    assert_array_equal(result.theta, expected.theta)
+    assert_array_equal(result.phi, expected.phi)
+    r = rng.normal(size=(3, 3, 100))
+    out = np.empty((3, 3, 100))
+    assert executor.apply(erfa.rxr, r, r[::-1], axis=0, chunk_size=30,
+                          out=out) is out
+    assert_array_equal(out, erfa.rxr(r, r[::-1], axis=0))
+    assert_array_equal(executor.apply(erfa.pn, p, axis=0).u,
+                       erfa.pn(p, axis=0).u)
+
+
+def test_errors_and_warnings(executor):
+    with pytest.warns(ErfaWarning, match="1 of \"dubious year") as record:
+        result = executor.apply(erfa.dat, [1900, 2000], 1, 1, 0.0)
+    assert len(record) == 1
+    assert_array_equal(result, [0.0, 32.0])
+    with pytest.raises(ErfaError, match="bad year"):
+        executor.apply(erfa.cal2jd, [2000, -5000], 1, 1)
+    # Status codes are counted over all chunks, for any status argument and
+    # also with unique epochs, where the codes are checked per epoch.
+    iy = np.full(10, 1900)
+    for kwargs in [{}, {"status": "count"}]:
+        with pytest.warns(ErfaWarning, match="10 of \"dubious year") as record:
+            executor.apply(erfa.dat, iy, 1, 1, 0.0, chunk_size=2, **kwargs)
+        assert len(record) == 1
+    with pytest.raises(ErfaError, match="10 of \"bad year"):
+        executor.apply(erfa.cal2jd, np.full(10, -5000), 1, 1, chunk_size=2)
+    with pytest.warns(ErfaWarning, match="6 of \"dubious year") as record:
+        executor.apply(erfa.apco13, [2400000.5] * 6 + [2460000.5] * 4, 0.0,
+                       0.0, 0.1, 0.5, 100.0, 0.0, 0.0, 1000.0, 10.0, 0.5, 0.55,
+                       chunk_size=3, unique_epochs=True)
+    assert len(record) == 1
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        executor.apply(erfa.dat, iy, 1, 1, 0.0, chunk_size=2, status="ignore")
+    # The pool still works after an error.
+    assert_array_equal(executor.apply(erfa.anp, [-1.0, 7.0]),
+                       erfa.anp([-1.0, 7.0]))
+
+
+def test_not_erfa():
+    with pytest.raises(ValueError, match="not a function in erfa"):
+        parallel.apply(np.sin, [1.0, 2.0], max_workers=1)
+
+
+def test_apply():
+    jd2 = np.linspace(0.0, 1.0, 11)
+    assert_array_equal(parallel.apply(erfa.pnm06a, 2451545.0, jd2,
+                                      max_workers=2),
+                       erfa.pnm06a(2451545.0, jd2))
@@ -0,0 +1,82 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import numpy as np
+import pytest
+
+import erfa
+from erfa import ErfaError, ErfaWarning, core
+
+
+def test_profile():
+    cal2jd = erfa.cal2jd
+    with erfa.profile() as profile:
+        assert erfa.cal2jd is not cal2jd
+        assert erfa.cal2jd.__doc__ == cal2jd.__doc__
+        erfa.cal2jd([2024, 2025, 2026], 1, 1)
+        erfa.rxp(np.eye(3), np.ones((5, 2, 3)))
+        erfa.pnm06a(2460000.5, 0.0)
+    assert erfa.cal2jd is cal2jd
+    assert core.cal2jd is cal2jd
+    assert set(profile.stats) == {"cal2jd", "rxp", "pnm06a"}
+    assert profile.stats["cal2jd"]["calls"] == 1
+    assert profile.stats["cal2jd"]["elements"] == 3
+    assert profile.stats["rxp"]["elements"] == 10
+    assert profile.stats["pnm06a"]["elements"] == 1
+    assert all(entry["time"] > 0 for entry in profile.stats.values())
+    records = profile.records()
+    assert [record["function"] for record in records] == sorted(
+        profile.stats, key=lambda name: -profile.stats[name]["time"]
+    )
+    assert records[0].keys() == {
+        "function", "calls", "elements", "time", "errors", "warnings"
+    }
+
+
+@pytest.mark.parametrize("status", ["raise", "count"])
+def test_profile_status(status):
+    with erfa.profile() as profile:
+        with pytest.warns(ErfaWarning):
+            erfa.cal2jd(2000, [1, 2, 2], [1, 31, 30], status=status)
+        with pytest.raises(ErfaError):
+            erfa.cal2jd(2000, [13, 1], 1, status=status)
+        erfa.cal2jd(2000, 13, 1, status="ignore")
+    stats = profile.stats["cal2jd"]
+    assert stats["calls"] == 3
+    assert stats["elements"] == 4
+    # Bad days are remapped from errors to warnings.
+    assert stats["warnings"] == {3: 2}
+    assert stats["errors"] == {-2: 1}
+
+
+def test_profile_nested():
+    with erfa.profile() as outer:
+        erfa.era00(2460000.5, 0.0)
+        with erfa.profile() as inner:
+            erfa.era00(2460000.5, [0.0, 0.5])
+        erfa.era00(2460000.5, 0.0)
+    assert outer.stats["era00"]["calls"] == 3
+    assert outer.stats["era00"]["elements"] == 4
+    assert inner.stats["era00"]["calls"] == 1
+    assert inner.stats["era00"]["elements"] == 2
+    assert erfa.era00 is core.era00
+
+
+def test_profile_overlapping():
+    # Contexts that are not exited in reverse order, as can happen when
+    # profiling in different threads or tasks.
+    era00 = erfa.era00
+    first, second = erfa.profile(), erfa.profile()
+    a = first.__enter__()
+    erfa.era00(2460000.5, 0.0)
+    b = second.__enter__()
+    erfa.era00(2460000.5, [0.0, 0.5])
+    first.__exit__(None, None, None)
+    erfa.era00(2460000.5, 0.0)
+    assert erfa.era00 is not era00
+    second.__exit__(None, None, None)
+    assert erfa.era00 is era00
+    assert core.era00 is era00
+    erfa.era00(2460000.5, 0.0)
+    assert a.stats["era00"]["calls"] == 2
+    assert a.stats["era00"]["elements"] == 3
+    assert b.stats["era00"]["calls"] == 2
+    assert b.stats["era00"]["elements"] == 3
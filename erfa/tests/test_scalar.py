@@ -0,0 +1,91 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+import erfa
+from erfa import ErfaError, ErfaWarning, scalar
+
+PV = np.array(((0.1, -0.2, 1.0), (1e-5, 2e-5, -3e-5)), erfa.dt_pv)[()]
+
+
+def as_plain(value):
+    """Convert an array to python numbers and (nested) tuples."""
+    if value.dtype.names:
+        return tuple(as_plain(value[name]) for name in value.dtype.names)
+    if value.ndim:
+        return tuple(as_plain(item) for item in value)
+    return value.item()
+
+
+@pytest.mark.parametrize(
+    ("func", "args"),
+    [
+        ("cal2jd", (2024, 1, 1)),
+        ("era00", (2460000.5, 0.25)),
+        ("dtdb", (2451545.0, 0.5, 0.25, 1.0, 5000.0, 1000.0)),
+        ("pn06a", (2451545.0, 100.0)),
+        ("s2c", (0.5, -0.25)),
+        ("rxp", (erfa.rx(0.1, np.eye(3)), (1.0, 2.0, 3.0))),
+        ("pvstar", (PV,)),
+        ("pvdpv", (PV, PV)),
+        ("atco13", (2.7, 0.1, 1e-6, 2e-6, 0.01, 10.0, 2456384.5, 0.97, 0.16,
+                    -0.03, 0.1, 2738.0, 2.5e-7, 1.8e-6, 730.0, 10.0, 0.7, 0.55)),
+        ("d2dtf", ("UTC", 3, 2451545.0, 0.3)),
+        ("dtf2d", ("UTC", 2016, 12, 31, 23, 59, 60.5)),
+        ("tpors", (1.0, 0.2, 1.1, 0.25)),
+        ("ir", ()),
+    ],
+)
+def test_same_as_wrapper(func, args):
+    result = getattr(scalar, func)(*args)
+    expected = getattr(erfa, func)(*args)
+    if isinstance(expected, tuple):
+        assert type(result) is tuple
+        assert result == tuple(as_plain(np.asanyarray(e)) for e in expected)
+    else:
+        assert result == as_plain(np.asanyarray(expected))
+
+
+def test_sign():
+    sign, idmsf = scalar.a2af(3, -1.0)
+    assert sign == b"-"
+    assert idmsf == (57, 17, 44, 806)
+    assert scalar.af2a("-", *idmsf[:2], 44.806) == scalar.af2a(b"-", 57, 17, 44.806)
+    with pytest.raises(ValueError, match="single character"):
+        scalar.af2a("+-", 57, 17, 44.806)
+
+
+def test_inout():
+    r = scalar.rz(0.5, scalar.ir())
+    assert_array_equal(r, erfa.rz(0.5, np.eye(3)))
+
+
+def test_status():
+    with pytest.raises(ErfaError, match='1 of "bad month'):
+        scalar.cal2jd(2000, 13, 1)
+    with pytest.warns(ErfaWarning, match='1 of "bad day'):
+        assert scalar.cal2jd(2000, 2, 31) == (2400000.5, 51605.0)
+    with pytest.warns(ErfaWarning, match='1 of "dubious year'):
+        scalar.dat(1900, 1, 1, 0.0)
+
+
+def test_invalid_arguments():
+    with pytest.raises(TypeError, match=r"takes exactly 3 arguments \(2 given\)"):
+        scalar.cal2jd(2000, 1)
+    with pytest.raises(TypeError, match="cannot be interpreted as an integer"):
+        scalar.cal2jd(2000.5, 1, 1)
+    with pytest.raises(ValueError, match="sequence of 3 numbers"):
+        scalar.s2c(*scalar.c2s((1.0, 0.0)))
+    with pytest.raises(ValueError, match="sequence of 3 3-vectors"):
+        scalar.rxr(np.eye(2), np.eye(3))
+
+
+def test_leap_seconds_shared():
+    leap_seconds = erfa.leap_seconds.get()
+    try:
+        erfa.leap_seconds.set(leap_seconds[leap_seconds["year"] < 2017])
+        assert scalar.dat(2018, 1, 1, 0.0) == 36.0
+    finally:
+        erfa.leap_seconds.set(leap_seconds)
+    assert scalar.dat(2018, 1, 1, 0.0) == 37.0
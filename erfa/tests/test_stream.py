@@ -0,0 +1,135 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+import erfa
+from erfa import ErfaError, ErfaWarning, stream
+
+
+def test_memmap(tmp_path):
+    ra = np.lib.format.open_memmap(tmp_path / "ra.npy", mode="w+",
+                                   shape=(1000,))
+    ra[:] = np.linspace(0.0, 6.0, 1000)
+    out = np.lib.format.open_memmap(tmp_path / "p.npy", mode="w+",
+                                    shape=(1000, 3))
+    assert stream.apply(erfa.s2c, ra, 0.5, chunk_size=128, out=out) is out
+    out.flush()
+    assert_array_equal(np.load(tmp_path / "p.npy"), erfa.s2c(ra, 0.5))
+
+
+def test_allocated_structured_outputs():
+    jd2 = np.linspace(0.0, 1.0, 101)
+    result = stream.apply(erfa.apci13, 2460000.5, jd2, chunk_size=10)
+    expected = erfa.apci13(2460000.5, jd2)
+    assert type(result) is type(expected)
+    assert result.astrom.dtype == erfa.dt_eraASTROM
+    assert_array_equal(result.astrom["bpn"], expected.astrom["bpn"])
+    assert_array_equal(result.eo, expected.eo)
+
+
+def test_loop_dimensions_only():
+    # Chunks are along the first loop axis, with the matrices broadcast,
+    # and the size of the chunks takes into account the other loop axes.
+    rng = np.random.default_rng(0)
+    r = rng.normal(size=(5, 1, 3, 3))
+    p = rng.normal(size=(5, 7, 3))
+    items = []
+    result = stream.apply(erfa.rxp, r, p, chunk_size=14,
+                          callback=lambda _, item: items.append(item))
+    assert result is None
+    assert items == [slice(0, 2), slice(2, 4), slice(4, 5)]
+    result = stream.apply(erfa.rxp, r, p, chunk_size=14)
+    assert_array_equal(result, erfa.rxp(r, p))
+    # The list of bodies for ldn is not split.
+    b = np.zeros(3, erfa.dt_eraLDBODY)
+    b["bm"] = 1.0
+    b["dl"] = 1e-6
+    b["pv"]["p"] = [[-7.8, -5.6, -1.9], [0.7, -0.2, -0.1], [0.0, 0.0, 0.0]]
+    ob = np.array([-0.9, -0.4, -0.2])
+    sc = rng.normal(size=(10, 3))
+    sc /= np.linalg.norm(sc, axis=-1, keepdims=True)
+    assert_array_equal(stream.apply(erfa.ldn, b, ob, sc, chunk_size=3),
+                       erfa.ldn(b, ob, sc))
+
+
+def test_callback_reuses_buffers():
+    jd2 = np.linspace(0.0, 1.0, 25)
+    seen = []
+
+    def callback(result, item):
+        seen.append((item, result.pvh.ctypes.data))
+        assert_array_equal(result.pvh, erfa.epv00(2460000.5, jd2[item]).pvh)
+
+    stream.apply(erfa.epv00, 2460000.5, jd2, chunk_size=10, callback=callback)
+    assert [item for item, _ in seen] == [slice(0, 10), slice(10, 20),
+                                          slice(20, 25)]
+    assert len({address for _, address in seen}) == 1
+
+
+def test_axis():
+    # Vectors and matrices along the first axes, as for the wrappers.
+    rng = np.random.default_rng(0)
+    p = rng.normal(size=(3, 100))
+    r = rng.normal(size=(3, 3, 100))
+    result = stream.apply(erfa.pn, p, axis=0, chunk_size=30)
+    expected = erfa.pn(p, axis=0)
+    assert type(result) is type(expected)
+    assert_array_equal(result.u, expected.u)
+    assert_array_equal(result.r, expected.r)
+    out = np.empty((3, 100))
+    items = []
+
+    def callback(result, item):
+        items.append(item)
+        assert_array_equal(result, erfa.rxp(r[..., item], p[:, item], axis=0))
+
+    assert stream.apply(erfa.rxp, r, p, axis=0, chunk_size=30, out=out,
+                        callback=callback) is out
+    assert_array_equal(out, erfa.rxp(r, p, axis=0))
+    assert items[-1] == slice(90, 100)
+    with pytest.raises(ValueError, match="use apply instead"):
+        stream.apply_chunks(erfa.pn, [(p,)], axis=0, callback=print)
+
+
+def test_leading_unit_axes():
+    # Chunks are along the first axis longer than one.
+    theta = np.linspace(0.0, 6.0, 100)[np.newaxis, np.newaxis]
+    items = []
+
+    def callback(result, item):
+        items.append(item)
+        assert result.shape == (1, 1, item.stop - item.start, 3)
+
+    stream.apply(erfa.s2c, theta, 0.5, chunk_size=30, callback=callback)
+    assert items == [slice(0, 30), slice(30, 60), slice(60, 90), slice(90, 100)]
+    result = stream.apply(erfa.s2c, theta, [[0.5]], chunk_size=30)
+    assert_array_equal(result, erfa.s2c(theta, 0.5))
+
+
+def test_status_counted_over_chunks():
+    with pytest.warns(ErfaWarning, match='1000 of "dubious year') as record:
+        stream.apply(erfa.dat, np.full(1000, 1900), 1, 1, 0.0, chunk_size=100)
+    assert len(record) == 1
+    with pytest.raises(ErfaError, match='900 of "bad year'):
+        stream.apply(erfa.cal2jd, np.repeat([2000, -5000], [100, 900]), 1, 1,
+                     chunk_size=100)
+
+
+def test_apply_chunks():
+    def chunks():
+        for year in range(2000, 2010):
+            yield year, np.arange(1, 13), 1
+
+    out = (np.empty(120), np.empty(120))
+    assert stream.apply_chunks(erfa.cal2jd, chunks(), out=out,
+                               status="count") == 120
+    expected = erfa.cal2jd(np.arange(2000, 2010).repeat(12),
+                           np.tile(np.arange(1, 13), 10), 1)
+    assert_array_equal(out[1], expected.djm)
+    with pytest.raises(TypeError, match="out or callback"):
+        stream.apply_chunks(erfa.cal2jd, chunks())
+
+
+def test_scalar():
+    assert stream.apply(erfa.anp, -1.0) == erfa.anp(-1.0)
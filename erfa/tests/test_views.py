@@ -0,0 +1,109 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import tracemalloc
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+import erfa
+from erfa import views
+
+
+def test_pv_round_trip():
+    buf = np.random.default_rng(0).normal(size=(4, 5, 2, 3))[:, ::2]
+    pv = views.as_pv(buf)
+    assert pv.dtype == erfa.dt_pv
+    assert pv.shape == (4, 3)
+    assert np.shares_memory(pv, buf)
+    assert_array_equal(pv["p"], buf[..., 0, :])
+    assert_array_equal(pv["v"], buf[..., 1, :])
+    doubles = views.as_doubles(pv)
+    assert doubles.shape == buf.shape
+    assert np.shares_memory(doubles, buf)
+    pv["v"] = 0.0
+    assert np.all(buf[..., 1, :] == 0.0)
+
+
+def test_pvdpv_and_astrom():
+    adb = erfa.pvdpv(erfa.p2pv([[1.0, 2.0, 3.0]]), erfa.p2pv([0.5, 0.5, 0.5]))
+    assert_array_equal(views.as_doubles(adb), [[3.0, 0.0]])
+    assert views.as_pvdpv(np.zeros((7, 2))).dtype == erfa.ufunc.dt_pvdpv
+    astrom = erfa.apci13(2460000.5, [0.0, 0.5]).astrom
+    doubles = views.as_doubles(astrom)
+    assert doubles.shape == (2, 31)
+    assert_array_equal(doubles[:, 12:21].reshape(2, 3, 3), astrom["bpn"])
+    again = views.as_astrom(doubles)
+    assert np.shares_memory(again, astrom)
+    assert_array_equal(again["bpn"], astrom["bpn"])
+
+
+def test_read_only():
+    buf = np.zeros((3, 2, 3))
+    buf.flags.writeable = False
+    assert not views.as_pv(buf).flags.writeable
+
+
+@pytest.mark.parametrize(("buf", "match"), [
+    (np.zeros((3, 3, 2)).transpose(0, 2, 1), "not contiguous"),
+    (np.zeros((3, 2, 6))[..., ::2], "not contiguous"),
+    (np.zeros(6 * 3 * 8 + 1, "u1")[1:].view("f8").reshape(3, 2, 3),
+     "not contiguous and aligned"),
+    (np.zeros((3, 2, 3), "f4"), "float32"),
+    (np.zeros((3, 2, 3), ">f8"), ">f8"),
+    (np.zeros((3, 3, 2)), "does not end in"),
+])
+def test_copy_needed(buf, match):
+    with pytest.raises(ValueError, match=match):
+        views.as_pv(buf)
+
+
+def test_not_array_or_dtype():
+    with pytest.raises(TypeError, match="list"):
+        views.as_pv([[1.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    with pytest.raises(ValueError, match="not a structured dtype"):
+        views.as_doubles(np.zeros(3, erfa.dt_ymdf))
+    with pytest.raises(TypeError, match="MaskedArray"):
+        views.as_pv(np.ma.zeros((5, 2, 3)))
+    with pytest.raises(TypeError, match="MaskedArray"):
+        views.as_doubles(np.ma.zeros(5, erfa.dt_pv))
+
+
+def test_memmap(tmp_path):
+    buf = np.lib.format.open_memmap(tmp_path / "pv.npy", mode="w+",
+                                    shape=(10, 2, 3))
+    pv = views.as_pv(buf)
+    assert type(pv) is np.ndarray
+    assert np.shares_memory(pv, buf)
+    structured = np.lib.format.open_memmap(tmp_path / "pv2.npy", mode="w+",
+                                           dtype=erfa.dt_pv, shape=(10,))
+    doubles = views.as_doubles(structured)
+    assert type(doubles) is np.ndarray
+    assert doubles.shape == (10, 2, 3)
+    assert np.shares_memory(doubles, structured)
+
+
+def allocated(func, *args, **kwargs):
+    """Peak memory allocated by a call, not counting what was there before."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+
+def test_ufuncs_do_not_copy():
+    # The only memory allocated should be that for the outputs.
+    buf = np.random.default_rng(0).normal(size=(100_000, 2, 3))
+    pv = views.as_pv(buf)
+    astrom = np.repeat(erfa.apci13(2460000.5, 0.0).astrom, 100_000)
+    astrom = views.as_astrom(views.as_doubles(astrom))
+    args = (1.0, 0.5, 0.0, 0.0, 0.0, 0.0)
+    # Ensure the wrappers are imported before tracing memory allocations.
+    erfa.pvm(pv[:1])
+    erfa.pvu(2.0, pv[:1])
+    erfa.atciq(*args, astrom[:1])
+    assert allocated(erfa.pvm, pv) < 1.1 * 2 * 8 * len(pv)
+    assert allocated(erfa.pvu, 2.0, pv, out=pv) < 0.1 * buf.nbytes
+    assert allocated(erfa.atciq, *args, astrom) < 1.1 * 2 * 8 * len(astrom)
@@ -0,0 +1,184 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Views between arrays of doubles and the ERFA structured dtypes.
+
+The structured dtypes `erfa.dt_pv`, ``erfa.ufunc.dt_pvdpv`` and
+`erfa.dt_eraASTROM` consist of doubles only, without padding, so that their
+memory can also be seen as an array of doubles with shape ``(..., 2, 3)``,
+``(..., 2)`` and ``(..., 31)``, respectively.  The functions here create
+such views in either direction.  They never copy: if the layout in memory
+does not allow a view, they raise `ValueError`.  Instances of
+`~numpy.ndarray` subclasses are rejected with `TypeError`, since what the
+subclass adds, such as the mask of a masked array, would be lost; the
+exception is `~numpy.memmap`, for which the view is a plain array that
+shares the mapped memory.
+
+The ufuncs use arrays with these views as is.  For instance, for a
+position-velocity buffer ``buf`` with shape ``(n, 2, 3)``:
+
+>>> import numpy as np
+>>> import erfa
+>>> from erfa import views
+>>> buf = np.zeros((1000, 2, 3))
+>>> buf[:, 0, 0] = 1.0
+>>> pv = views.as_pv(buf)
+>>> np.shares_memory(pv, buf)
+True
+>>> r, s = erfa.pvm(pv)
+>>> float(r[0])
+1.0
+>>> _ = erfa.pvu(2.0, pv, out=pv)  # in place, so buf changes too
+>>> views.as_doubles(pv).shape
+(1000, 2, 3)
+"""
+
+import numpy as np
+
+from . import ufunc
+
+__all__ = ["as_astrom", "as_doubles", "as_pv", "as_pvdpv"]
+
+# Shapes of the doubles that make up the structured dtypes.
+_DOUBLES_SHAPES = (
+    (ufunc.dt_pv, (2, 3)),
+    (ufunc.dt_pvdpv, (2,)),
+    (ufunc.dt_eraASTROM, (31,)),
+)
+
+
+class _Interface:
+    """Holder of an array interface, which keeps its base array alive."""
+
+    def __init__(self, interface, base):
+        self.__array_interface__ = interface
+        self.base = base
+
+
+def _check_array(a):
+    if not isinstance(a, np.ndarray):
+        raise TypeError(f"can only view arrays, not {type(a).__name__}.")
+    if type(a) not in (np.ndarray, np.memmap):
+        raise TypeError(f"cannot view {type(a).__name__} instances, as the "
+                        "information added by the subclass would be lost.")
+
+
+def _doubles_shape(dtype):
+    for structured, shape in _DOUBLES_SHAPES:
+        if dtype == structured:
+            return shape
+    raise ValueError(f"{dtype} is not a structured dtype of doubles used by erfa.")
+
+
+def _as_structured(a, dtype):
+    _check_array(a)
+    shape = _doubles_shape(dtype)
+    n = len(shape)
+    if a.dtype != np.float64:
+        raise ValueError(f"cannot view {a.dtype} as doubles without a copy.")
+    if a.shape[a.ndim - n:] != shape:
+        raise ValueError(f"array with shape {a.shape} does not end in {shape}.")
+    strides = tuple(8 * int(np.prod(shape[i + 1:])) for i in range(n))
+    if a.strides[a.ndim - n:] != strides or not a.flags.aligned:
+        raise ValueError(
+            f"the last {n} dimensions are not contiguous and aligned, "
+            "so a view would need a copy."
+        )
+    interface = dict(
+        a.__array_interface__,
+        shape=a.shape[:a.ndim - n],
+        strides=a.strides[:a.ndim - n],
+        typestr=f"|V{dtype.itemsize}",
+        descr=[("", f"|V{dtype.itemsize}")],
+    )
+    return np.asarray(_Interface(interface, a)).view(dtype)
+
+
+def as_pv(a):
+    """View an array of doubles as position-velocity vectors.
+
+    Parameters
+    ----------
+    a : `~numpy.ndarray`
+        Doubles with shape ``(..., 2, 3)``, for which the last two
+        dimensions are contiguous.
+
+    Returns
+    -------
+    pv : `~numpy.ndarray`
+        View with shape ``(...)`` and dtype `erfa.dt_pv`.
+
+    Raises
+    ------
+    ValueError
+        If a view is not possible without copying.
+    """
+    return _as_structured(a, ufunc.dt_pv)
+
+
+def as_pvdpv(a):
+    """View an array of doubles as pairs of inner products.
+
+    Parameters
+    ----------
+    a : `~numpy.ndarray`
+        Doubles with shape ``(..., 2)``, for which the last dimension is
+        contiguous.
+
+    Returns
+    -------
+    adb : `~numpy.ndarray`
+        View with shape ``(...)`` and dtype ``erfa.ufunc.dt_pvdpv``, as
+        returned by `erfa.pvdpv`.
+
+    Raises
+    ------
+    ValueError
+        If a view is not possible without copying.
+    """
+    return _as_structured(a, ufunc.dt_pvdpv)
+
+
+def as_astrom(a):
+    """View an array of doubles as star-independent astrometry parameters.
+
+    Parameters
+    ----------
+    a : `~numpy.ndarray`
+        Doubles with shape ``(..., 31)``, for which the last dimension is
+        contiguous, with the values in the order of the fields of
+        `erfa.dt_eraASTROM`.
+
+    Returns
+    -------
+    astrom : `~numpy.ndarray`
+        View with shape ``(...)`` and dtype `erfa.dt_eraASTROM`.
+
+    Raises
+    ------
+    ValueError
+        If a view is not possible without copying.
+    """
+    return _as_structured(a, ufunc.dt_eraASTROM)
+
+
+def as_doubles(a):
+    """View an array with an ERFA structured dtype as an array of doubles.
+
+    Parameters
+    ----------
+    a : `~numpy.ndarray`
+        Array with dtype `erfa.dt_pv`, ``erfa.ufunc.dt_pvdpv`` or
+        `erfa.dt_eraASTROM`.
+
+    Returns
+    -------
+    doubles : `~numpy.ndarray`
+        View with shape ``(..., 2, 3)``, ``(..., 2)`` or ``(..., 31)``,
+        respectively.
+
+    Raises
+    ------
+    ValueError
+        If the dtype is not one of the above.
+    """
+    _check_array(a)
+    return np.asarray(a).view((np.float64, _doubles_shape(a.dtype)))
@@ -7,12 +7,14 @@ Note that this does *not* currently automate the process of creating structs
 or dtypes for those structs.  They should be added manually in the template file.
 """
 
+import copy
 import functools
+import math
 import re
 import textwrap
 from abc import ABC, abstractproperty
 from collections.abc import Iterable, Mapping, Sequence
-from itertools import chain
+from itertools import chain, pairwise, product
 from pathlib import Path
 from string import Template
 from typing import Final, final
@@ -20,6 +22,53 @@ from typing import Final, final
 DEFAULT_ERFA_LOC = Path(__file__).with_name("liberfa") / "erfa" / "src"
 DEFAULT_TEMPLATE_LOC = Path(__file__).with_name("erfa")
 
+# Functions that ERFA implements as a call of a time-only function, which
+# sets up the astrom context, followed by calls of per-star functions. With
+# unique_epochs=True, the wrappers evaluate the time-only part only once per
+# unique epoch and pass the expanded results on to the per-star part.
+EPOCH_SPLITS: Final = {
+    "atcc13": ("apci13", "atccq"),
+    "atci13": ("apci13", "atciq"),
+    "atco13": ("apco13", "atciq", "atioq"),
+    "atic13": ("apci13", "aticq"),
+    "atio13": ("apio13", "atioq"),
+}
+# Functions for which erfa.fast provides a faster version, which the
+# wrappers will use if passed fast=True, with what it approximates and
+# the maximum error of the approximation.
+FAST_FUNCTIONS: Final = {
+    "apcg13": ("Earth ephemeris", "1e-12 au"),
+    "apci13": ("Earth ephemeris", "1e-12 au"),
+    "apco13": ("Earth ephemeris", "1e-12 au"),
+    "dtdb": ("geocentric part of TDB-TT", "1e-12 s"),
+    "epv00": ("Earth ephemeris", "1e-12 au"),
+}
+# Functions for which erfa.bulk provides a version that evaluates products
+# with a single matrix with BLAS, which the wrappers use if passed bulk=True.
+BULK_FUNCTIONS: Final = ("rxp", "rxpv", "rxr", "trxp")
+# Helpers from erfa.core that the generated wrappers may use.
+CORE_HELPERS: Final = (
+    "_call_without_status",
+    "_check_status_argument",
+    "_copy_to_out",
+    "_core_axes",
+    "_ufunc_out",
+    "_unique_epochs",
+    "check_errwarn",
+    "dt_bytes1",
+)
+# Cheap functions for which ufunc.c.templ has a loop for operands with steps
+# in whole doubles, which does the calculation directly rather than via liberfa.
+STRIDED_LOOPS: Final = (
+    "anp", "anpm", "c2s", "pdp", "pn", "pxp", "rxp", "rxr", "s2c",
+)
+# Functions with a list of bodies for which ufunc.c.templ has a loop that
+# precomputes what depends on the bodies only once if they are shared.
+SHARED_BODIES_LOOPS: Final = ("ldn",)
+# Functions taking a two-part date that are nevertheless per-star, so that
+# deduplicating epochs would not help.
+NO_UNIQUE_EPOCHS: Final = ("eceq06", "eqec06", "fk5hz", "hfk5z")
+
 
 class FunctionDoc:
     def __init__(self, doc: str, pyname: str) -> None:
@@ -99,6 +148,21 @@ class Variable:
     def signature_shape(self) -> str:
         return "()"
 
+    @property
+    def scalar_declaration(self) -> str:
+        return f"{self.ctype} {self.name};"
+
+    @property
+    def scalar_format(self) -> str:
+        """Py_BuildValue format for creating the python object in erfa.scalar."""
+        return {"double": "d", "int": "i", "char": "c"}[self.ctype]
+
+    @property
+    def scalar_values(self) -> list[str]:
+        """The C values used by scalar_format."""
+        return [self.name]
+
+
 class Argument(Variable):
     def __init__(self, definition: str) -> None:
         ctype, ptr_name_arr = definition.strip().rsplit(" ", 1)
@@ -210,6 +274,53 @@ class Argument(Variable):
         args = [name, *[f"is_{name}{i}" for i in range(self.ndim)], self.name_for_call]
         return _assemble_func_call(func_name, args) + ";"
 
+    @property
+    def scalar_declaration(self) -> str:
+        if self.ctype == "const char":
+            return f"const char *{self.name};"
+        return f"{self.ctype} {self.name}{self.cshape};"
+
+    def scalar_converter(self, index: int) -> str:
+        """Call converting python argument ``index`` for erfa.scalar."""
+        match self.ctype, self.shape:
+            case "double" | "int" | "char", ():
+                return f"get_{self.ctype}(args[{index}], &{self.name})"
+            case "const char", ():
+                return f"get_type(args[{index}], &{self.name})"
+            case "double", (n,):
+                return f"get_doubles(args[{index}], {self.name}, {n})"
+            case "double", (n, 3):
+                return f"get_vectors(args[{index}], {self.name}, {n})"
+        raise ValueError(f"cannot convert {self.ctype} with shape {self.shape}.")
+
+    @property
+    def scalar_name_for_call(self) -> str:
+        if self.is_ptr and not self.shape and self.ctype != "const char":
+            return f"&{self.name}"
+        return self.name
+
+    @property
+    def fixed_shape(self) -> tuple[int, ...]:
+        """Shape of the argument, which should not have variable dimensions."""
+        shape = tuple(n for n in self.shape if n is not None)
+        if len(shape) != len(self.shape):
+            raise ValueError(f"{self.name} does not have a fixed shape.")
+        return shape
+
+    @property
+    def scalar_format(self) -> str:
+        item = {"double": "d", "int": "i", "char": "c"}[self.ctype]
+        for n in reversed(self.fixed_shape):
+            item = f"({n * item})"
+        return item
+
+    @property
+    def scalar_values(self) -> list[str]:
+        return [
+            self.name + "".join(f"[{i}]" for i in index)
+            for index in product(*map(range, self.fixed_shape))
+        ]
+
 
 class StatusCode(Variable):
     def __init__(self, ctype: str, doc: FunctionDoc, funcname: str) -> None:
@@ -287,6 +398,10 @@ class Function(ABC):
 
         self.py_args: Final = (*self.in_args, *self.inout_args)
         self.c_args: Final = (*self.py_args, *self.out_args)
+        # Functions this one is composed of, if listed in EPOCH_SPLITS.
+        self.epoch_split: tuple[Function, ...] = ()
+        # Whether the ufunc counts status codes rather than returning them.
+        self.tally_status = False
 
     @classmethod
     def from_c_code(cls, name: str, source_path: Path, templateloc: Path) -> "Function":
@@ -326,10 +441,28 @@ class Function(ABC):
     def ufunc_return(self) -> tuple[Variable, ...]:
         return (
             (*self.inout_args, *self.out_args)
-            if self.c_retval is None
+            if self.c_retval is None or self.tally_status
             else (*self.inout_args, *self.out_args, self.c_retval)
         )
 
+    @property
+    def checks_status(self) -> bool:
+        """Whether the python wrapper checks the status code."""
+        return isinstance(self.c_retval, StatusCode) and bool(self.c_retval.descriptons)
+
+    @property
+    def ufunc_name(self) -> str:
+        return f"{self.pyname}_nostatus" if self.tally_status else self.pyname
+
+    def without_status(self) -> "Function":
+        """A copy for a ufunc that counts status codes instead of returning them.
+
+        Should be made before any cached properties are used.
+        """
+        variant = copy.copy(self)
+        variant.tally_status = True
+        return variant
+
     @property
     def user_dtype(self) -> str | None:
         """The non-standard dtype, if any, needed by this function's ufunc.
@@ -351,25 +484,185 @@ class Function(ABC):
     def signature(self) -> str:
         """Possible signature, if this function should be a gufunc."""
 
+    @functools.cached_property
+    def epoch_args(self) -> tuple[Argument, ...]:
+        """The inputs the function can be evaluated for unique values of.
+
+        These are the inputs of the time-only part for functions listed in
+        EPOCH_SPLITS, and otherwise all inputs for functions that take a
+        two-part date and only further scalar numbers.
+        """
+        if self.epoch_split:
+            return self.epoch_split[0].py_args
+        if self.pyname in NO_UNIQUE_EPOCHS:
+            return ()
+        names = [arg.name for arg in self.py_args]
+        if all(
+            arg.ctype in ("double", "int") and not arg.shape for arg in self.py_args
+        ) and any(
+            re.fullmatch(r"(date|dj|tai|tcb|tcg|tdb|tt|ut1?|utc)[1a]", first)
+            and second == first[:-1] + {"1": "2", "a": "b"}[first[-1]]
+            for first, second in pairwise(names)
+        ):
+            return self.py_args
+        return ()
+
+    @property
+    def unique_epochs_body(self) -> list[str]:
+        """Lines calculating the outputs for only the unique epochs."""
+        epoch_names = [arg.name for arg in self.epoch_args]
+        call_args = [_as_tuple(epoch_names)]
+        if other_names := [
+            arg.name for arg in self.py_args if arg.name not in epoch_names
+        ]:
+            call_args.append(_as_tuple(other_names))
+        lines = [
+            _assemble_func_call(
+                "_unique_epochs", call_args, [_as_tuple(epoch_names), "inverse"]
+            )
+        ]
+        known = {arg.name for arg in self.py_args}
+        for i, func in enumerate(self.epoch_split or (self,)):
+            out_names = [arg.name for arg in func.ufunc_return]
+            lines.append(
+                _assemble_func_call(
+                    f"ufunc.{func.pyname}",
+                    in_args=[arg.name for arg in func.py_args],
+                    out_args=out_names,
+                )
+            )
+            if i == 0:
+                lines.append(
+                    f"{', '.join(out_names)} = "
+                    f"{', '.join(name + '[inverse]' for name in out_names)}"
+                )
+            known.update(out_names)
+        if missing := {arg.name for arg in self.ufunc_return} - known:
+            raise RuntimeError(
+                f"split of {self.pyname} does not produce {', '.join(sorted(missing))}"
+            )
+        return lines
+
+    @property
+    def has_axis(self) -> bool:
+        """Whether the wrapper can take vectors and matrices along any axis.
+
+        This is for functions with vector or matrix arguments, but not those
+        with a list of bodies, or for which the wrapper may not call the
+        ufunc directly (for unique epochs or the fast versions).
+        """
+        shapes = {arg.signature_shape for arg in self.py_args + self.ufunc_return}
+        return (
+            bool(shapes & {"(3)", "(3, 3)"})
+            and "(n)" not in shapes
+            and not self.epoch_args
+            and self.pyname not in FAST_FUNCTIONS
+        )
+
+    @property
+    def py_return_names(self) -> list[str]:
+        if isinstance(self.py_return, ResultTuple):
+            return [arg.name for arg in self.py_return.args]
+        return [self.py_return.name]
+
     def generate_python_body(self) -> list[str]:
         ufunc_name = f"ufunc.{self.pyname}"
         arg_names = [arg.name for arg in self.py_args]
+        if self.checks_status:
+            ufunc_out = f"_ufunc_out({ufunc_name}, out, status=True)"
+        elif isinstance(self.py_return, ResultTuple) or any(
+            arg.ctype == "char" for arg in self.out_args
+        ):
+            ufunc_out = f"_ufunc_out({ufunc_name}, out)"
+        else:
+            ufunc_out = "out"
+        axes, no_status_axes = (
+            ([f"**_core_axes({ufunc_name}, axis)"],
+             [f"**_core_axes({ufunc_name}_nostatus, axis)"])
+            if self.has_axis
+            else ([], [])
+        )
         lines = [
             _assemble_func_call(
                 ufunc_name,
-                in_args=arg_names,
+                in_args=[*arg_names, f"out={ufunc_out}", *axes],
                 out_args=[arg.name for arg in self.ufunc_return],
             )
         ]
-        if isinstance(self.c_retval, StatusCode) and self.c_retval.descriptons:
-            lines.append(f'check_errwarn({self.c_retval.name}, "{self.pyname}")')
+        # Results of the unique-epoch path still have to be put in out.
+        out_names = self.py_return_names
+        copy_to_out = _assemble_func_call(
+            "_copy_to_out",
+            in_args=[_as_tuple(out_names) if len(out_names) > 1 else out_names[0],
+                     "out"],
+            out_args=out_names,
+        )
+        if isinstance(scode := self.c_retval, StatusCode) and self.checks_status:
+            check = f'check_errwarn({scode.name}, "{self.pyname}")'
+            no_status_call = _assemble_func_call(
+                "_call_without_status",
+                in_args=[f"{ufunc_name}_nostatus", f'"{self.pyname}"', "status",
+                         *arg_names, "out=out", *no_status_axes],
+                out_args=[
+                    arg.name for arg in self.ufunc_return if arg is not self.c_retval
+                ],
+            )
+            status_lines = [
+                f"    {lines[0]}", f"    {check}", "else:", f"    {no_status_call}"
+            ]
+            lines = ['if status == "raise":', *status_lines]
+        if self.epoch_args:
+            unique_lines = [f"    {line}" for line in self.unique_epochs_body]
+            if self.checks_status:
+                unique_lines.extend([
+                    '    if status != "ignore":',
+                    f"        {check}",
+                    f"    {copy_to_out}",
+                    'elif status == "raise":',
+                    *status_lines,
+                ])
+            else:
+                unique_lines.extend([f"    {copy_to_out}", "else:", f"    {lines[0]}"])
+            lines = ["if unique_epochs:", *unique_lines]
+        if self.pyname in FAST_FUNCTIONS:
+            fast_args = arg_names.copy()
+            if self.epoch_args:
+                fast_args.append("unique_epochs=unique_epochs")
+            if self.checks_status:
+                fast_args.append("status=status")
+            fast_call = _assemble_func_call(f"fast_{self.pyname}", fast_args)
+            lines[:0] = [
+                "if fast:",
+                f"    from ..fast import {self.pyname} as fast_{self.pyname}",
+                "",
+                f"    return _copy_to_out({fast_call}, out)",
+            ]
+        if self.pyname in BULK_FUNCTIONS:
+            bulk_call = _assemble_func_call(
+                f"bulk_{self.pyname}", [*arg_names, "out=out", "axis=axis"]
+            )
+            lines[:0] = [
+                "if bulk:",
+                f"    from ..bulk import {self.pyname} as bulk_{self.pyname}",
+                "",
+                f"    return {bulk_call}",
+            ]
+        if self.checks_status:
+            # Up front, as not all paths pass status on to a function that
+            # would check it.
+            lines[:0] = ["_check_status_argument(status)"]
+        n_call_lines = len(lines)
         lines.extend(
             f"{arg.name} = {arg.name}.view(dt_bytes1)"
             for arg in self.out_args
             if arg.ctype == "char"
         )
-        if len(lines) == 1 and not isinstance(self.c_retval, StatusCode):
-            ufunc_call = f"{ufunc_name}({', '.join(arg_names)})"
+        if n_call_lines == len(lines) == 1 and not isinstance(
+            self.c_retval, StatusCode
+        ):
+            ufunc_call = _assemble_func_call(
+                ufunc_name, in_args=[*arg_names, f"out={ufunc_out}", *axes]
+            )
             return [
                 f"return {self.py_return.name}(*{ufunc_call})"
                 if isinstance(self.py_return, ResultTuple)
@@ -411,13 +704,67 @@ class Function(ABC):
             [f"{arg.name} += s_{arg.name}" for arg in self.in_args + self.ufunc_return]
             + [f"{arg.name}_in += s_{arg.name}_in" for arg in self.inout_args],
         )
+        # The dimensions passed to the loop are the outer one and one for
+        # each distinct core dimension (like "n" or "3") in the signature.
+        core_dimensions = {
+            name
+            for arg in self.py_args + self.ufunc_return
+            for name in re.findall(r"\w+", arg.signature_shape)
+        }
         return self.ufunc_loop_template.substitute(
-            pyname=self.pyname,
+            pyname=self.ufunc_name,
+            n_args=len(self.py_args + self.ufunc_return),
+            n_dimensions=1 + len(core_dimensions),
+            strided_loop=self.strided_loop,
+            shared_bodies_loop=self.shared_bodies_loop,
             init_ufunc_loop_local_vars=_indent(self.init_ufunc_loop_local_vars),
             increment_arg_pointers=arg_pointer_incrementation,
             ufunc_inner_loop_body=_indent(self.ufunc_loop_inner_loop_body, 2),
         )
 
+    @property
+    def strided_loop(self) -> str:
+        """Dispatch to the strided loop, if there is one.
+
+        The loop gets constant steps if the operands are contiguous, and the
+        actual steps otherwise, if those are whole numbers of doubles.
+        """
+        if self.pyname not in STRIDED_LOOPS:
+            return ""
+        args = self.py_args + self.ufunc_return
+        if any(arg.ctype != "double" for arg in args):
+            raise RuntimeError(f"strided loop for {self.pyname} needs doubles")
+        shapes = [getattr(arg, "shape", ()) for arg in args]
+        # Steps of contiguous operands between elements, then between items of
+        # vectors and matrices, in units of doubles.
+        steps = [math.prod(shape) for shape in shapes] + [
+            math.prod(shape[i + 1:]) for shape in shapes for i in range(len(shape))
+        ]
+        initializer = ", ".join(map(str, steps))
+        return "\n    " + _indent([
+            f"static const npy_intp contiguous_steps[{len(steps)}] = {{{initializer}}};",
+            f"npy_intp double_steps[{len(steps)}];",
+            f"if (erfa_steps_contiguous(steps, contiguous_steps, {len(steps)})) {{",
+            f"    strided_{self.pyname}(args, dimensions[0], contiguous_steps);",
+            "    return;",
+            "}",
+            f"if (erfa_steps_doubles(args, {len(args)}, steps, double_steps, {len(steps)})) {{",
+            f"    strided_{self.pyname}(args, dimensions[0], double_steps);",
+            "    return;",
+            "}",
+        ])
+
+    @property
+    def shared_bodies_loop(self) -> str:
+        """Dispatch to the loop for bodies shared by all stars, if there is one."""
+        if self.pyname not in SHARED_BODIES_LOOPS:
+            return ""
+        return "\n    " + _indent([
+            f"if (erfa_{self.pyname}_shared_bodies(args, dimensions, steps)) {{",
+            "    return;",
+            "}",
+        ])
+
     @property
     def ufunc_loop_inner_loop_body(self) -> list[str]:
         lines = [*[a.cast_pointer for a in self.c_args if a.signature_shape == "()"]]
@@ -435,7 +782,12 @@ class Function(ABC):
                 "}",
             ])
         call = _assemble_func_call(self.name, [a.name_for_call for a in self.c_args])
-        if retval := self.c_retval:
+        if (retval := self.c_retval) and self.tally_status:
+            lines.extend([
+                f"_{retval.name} = {call};",
+                f"erfa_tally_status(_{retval.name});",
+            ])
+        elif retval:
             lines.extend([
                 f"_{retval.name} = {call};",
                 f"*(({retval.ctype} *){retval.name}) = _{retval.name};",
@@ -452,15 +804,15 @@ class Function(ABC):
         # as these do not get copied
         npy_types = [arg.npy_type for arg in self.py_args + self.ufunc_return]
         return [
-            f"static char types_{self.pyname}[{len(npy_types)}] = {{{', '.join(npy_types)}}};",
-            f"static PyUFuncGenericFunction funcs_{self.pyname}[1] = {{ &ufunc_loop_{self.pyname} }};",
+            f"static char types_{self.ufunc_name}[{len(npy_types)}] = {{{', '.join(npy_types)}}};",
+            f"static PyUFuncGenericFunction funcs_{self.ufunc_name}[1] = {{ &ufunc_loop_{self.ufunc_name} }};",
         ]
 
     @functools.cached_property
     def define_ufunc(self) -> str:
         placeholders = {
             "name": self.name,
-            "pyname": self.pyname,
+            "pyname": self.ufunc_name,
             "n_py_args": len(self.py_args),
             "n_ufunc_return": len(self.ufunc_return),
             "signature": self.signature,
@@ -479,9 +831,107 @@ class Function(ABC):
     @functools.cached_property
     def py_docstring(self) -> str:
         lines = ['"""', self.doc.first_sentence]
-        if self.py_args:
-            lines.extend(_docstring_section_title("Parameters"))
-            lines.extend(f"{arg.name} : {arg.ctype} array" for arg in self.py_args)
+        lines.extend(_docstring_section_title("Parameters"))
+        lines.extend(f"{arg.name} : {arg.ctype} array" for arg in self.py_args)
+        if isinstance(self.py_return, ResultTuple):
+            lines.append("out : tuple of array, optional")
+            out_doc = (
+                "Arrays in which to store the results, as a tuple or "
+                f"``{self.py_return.name}`` with one array per output.  By "
+                "default, new arrays are allocated."
+            )
+        else:
+            lines.append("out : array, optional")
+            out_doc = (
+                "Array in which to store the result.  By default, a new array "
+                "is allocated."
+            )
+        if inout_names := ", ".join(arg.name for arg in self.inout_args):
+            out_doc += f"  Pass in {inout_names} itself to update it in-place."
+        lines.extend(
+            textwrap.wrap(
+                out_doc,
+                width=76,
+                initial_indent=4 * " ",
+                subsequent_indent=4 * " ",
+            )
+        )
+        if self.has_axis:
+            lines.append("axis : int, optional")
+            lines.extend(
+                textwrap.wrap(
+                    "Axis along which the components of vectors are stored, in "
+                    "both inputs and outputs.  For matrices, the rows are "
+                    "along this axis and the columns along the next one (or "
+                    "rows along the previous one and columns along this one "
+                    "for negative ``axis``).  E.g., for ``axis=0``, N vectors "
+                    "can be passed in as a (3, N) array.  No copies are made "
+                    "of the arrays.  Default: the last axes.",
+                    width=76,
+                    initial_indent=4 * " ",
+                    subsequent_indent=4 * " ",
+                    break_long_words=False,
+                )
+            )
+        if self.epoch_args:
+            names = ", ".join(arg.name for arg in self.epoch_args)
+            lines.append("unique_epochs : bool, optional")
+            lines.extend(
+                textwrap.wrap(
+                    "If `True`, do the time-dependent calculation only once for "
+                    f"each unique combination of ``{names}``, and broadcast the "
+                    "result.  This is faster if many elements share the same "
+                    "epoch.  Default: `False`.",
+                    width=76,
+                    initial_indent=4 * " ",
+                    subsequent_indent=4 * " ",
+                    break_long_words=False,
+                )
+            )
+        if self.checks_status:
+            lines.append("status : {'raise', 'ignore', 'count'}, optional")
+            lines.extend(
+                textwrap.wrap(
+                    "How to deal with ERFA status codes.  For 'raise', an array "
+                    "of codes is created and checked, and `ErfaError` is raised "
+                    "for any errors, or `ErfaWarning` emitted for any warnings.  "
+                    "For 'count', the codes are not stored but counted, with "
+                    "errors and warnings reported the same way (though also for "
+                    "masked elements).  For 'ignore', the codes are discarded.  "
+                    "Default: 'raise'.",
+                    width=76,
+                    initial_indent=4 * " ",
+                    subsequent_indent=4 * " ",
+                )
+            )
+        if self.pyname in FAST_FUNCTIONS:
+            approximated, max_error = FAST_FUNCTIONS[self.pyname]
+            lines.append("fast : bool, optional")
+            lines.extend(
+                textwrap.wrap(
+                    "If `True`, use the Chebyshev representation of the "
+                    f"{approximated} from `erfa.fast`, which is much faster "
+                    "and differs from the full series by less than "
+                    f"{max_error}.  Default: `False`.",
+                    width=76,
+                    initial_indent=4 * " ",
+                    subsequent_indent=4 * " ",
+                )
+            )
+        if self.pyname in BULK_FUNCTIONS:
+            lines.append("bulk : bool, optional")
+            lines.extend(
+                textwrap.wrap(
+                    "If `True`, and a single matrix is applied to many vectors "
+                    "or matrices, evaluate all products with one BLAS matrix "
+                    "multiplication, using `erfa.bulk`.  This is faster for "
+                    "large arrays, but results may differ from those of ERFA "
+                    "in the last bit.  Default: `False`.",
+                    width=76,
+                    initial_indent=4 * " ",
+                    subsequent_indent=4 * " ",
+                )
+            )
         lines.extend(_docstring_section_title("Returns"))
         if isinstance(self.py_return, ResultTuple):
             lines.append(
@@ -503,8 +953,21 @@ class Function(ABC):
 
     @functools.cached_property
     def python_wrapper(self) -> str:
+        arg_names = [arg.name for arg in self.py_args]
+        keywords = ["out=None"]
+        if self.has_axis:
+            keywords.append("axis=None")
+        if self.epoch_args:
+            keywords.append("unique_epochs=False")
+        if self.checks_status:
+            keywords.append('status="raise"')
+        if self.pyname in FAST_FUNCTIONS:
+            keywords.append("fast=False")
+        if self.pyname in BULK_FUNCTIONS:
+            keywords.append("bulk=False")
+        arg_names.extend(["*", *keywords])
         return _indent([
-            f"def {self.pyname}({', '.join(arg.name for arg in self.py_args)}):",
+            f"def {self.pyname}({', '.join(arg_names)}):",
             *self.py_docstring.splitlines(),
             *self.generate_python_body(),
         ])
@@ -517,6 +980,84 @@ class Function(ABC):
         lines.append(self.python_wrapper)
         return "\n\n\n".join(lines)
 
+    @property
+    def has_scalar(self) -> bool:
+        """Whether erfa.scalar has a version (not for structured arguments)."""
+        return all(arg.ctype not in ("eraASTROM", "eraLDBODY") for arg in self.c_args)
+
+    @functools.cached_property
+    def scalar_function(self) -> str:
+        returns = (
+            self.py_return.args
+            if isinstance(self.py_return, ResultTuple)
+            else (self.py_return,)
+        )
+        build_format = "".join(arg.scalar_format for arg in returns)
+        if len(returns) > 1:
+            build_format = f"({build_format})"
+        arg_names = ", ".join(
+            [*(arg.name for arg in self.py_args), "/"] if self.py_args else []
+        )
+        doc = (
+            f"{self.pyname}({arg_names})\n--\n\n"
+            f"{' '.join(self.doc.first_sentence.split())}\n\n"
+            f"Like `erfa.{self.pyname}`, but for plain python numbers, with "
+            "vectors and matrices as (nested) tuples."
+        )
+        call = _assemble_func_call(
+            self.name, [arg.scalar_name_for_call for arg in self.c_args]
+        )
+        lines = [
+            f"PyDoc_STRVAR(scalar_{self.pyname}_doc,",
+            f"    {_c_string(doc)});",
+            "",
+            "static PyObject *",
+            f"scalar_{self.pyname}(PyObject *Py_UNUSED(module),",
+            f"{' ' * (len(self.pyname) + 8)}PyObject *const *args, Py_ssize_t nargs)",
+            "{",
+            *[f"    {arg.scalar_declaration}" for arg in self.c_args],
+        ]
+        # Unchecked status codes are not used.
+        retval = (
+            self.c_retval
+            if isinstance(self.c_retval, Return) or self.checks_status
+            else None
+        )
+        if retval is not None:
+            lines.append(f"    {retval.scalar_declaration}")
+        checks = [f'check_nargs("{self.pyname}", nargs, {len(self.py_args)}) < 0']
+        checks.extend(
+            f"{arg.scalar_converter(i)} < 0" for i, arg in enumerate(self.py_args)
+        )
+        checks[:-1] = [f"{check} ||" for check in checks[:-1]]
+        lines.extend([
+            "",
+            f"    if ({checks[0]}",
+            *[f"        {check}" for check in checks[1:]],
+            "    ) {",
+            "        return NULL;",
+            "    }",
+            f"    {retval.name + ' = ' if retval else ''}{call};",
+        ])
+        if isinstance(retval, StatusCode):
+            lines.extend([
+                f"    if ({retval.name} != 0 &&",
+                f'        check_status("{self.pyname}", {retval.name}) < 0) {{',
+                "        return NULL;",
+                "    }",
+            ])
+        build_args = [f'"{build_format}"']
+        build_args.extend(value for arg in returns for value in arg.scalar_values)
+        lines.extend([f"    return {_assemble_func_call('Py_BuildValue', build_args)};", "}"])
+        return "\n".join(lines)
+
+    @property
+    def scalar_method_def(self) -> str:
+        return (
+            f'{{"{self.pyname}", (PyCFunction)(void (*)(void))scalar_{self.pyname}, '
+            f"METH_FASTCALL, scalar_{self.pyname}_doc}},"
+        )
+
 
 class UFunc(Function):
     @functools.cached_property
@@ -560,18 +1101,26 @@ class GUFunc(Function):
         lines = []
         for arg in self.c_args:
             if arg.signature_shape != "()":
-                lines.extend([
+                convert = [
                     f"if (!copy_{arg.name}) {{",
                     f"    {arg.cast_pointer}",
                     "}",
-                ])
+                ]
                 if arg in self.in_args:  # copy input arguments to buffer if needed
-                    lines.extend([
+                    convert.extend([
                         "else {",
                         f"    {arg.copy_elements('to')}",
                         "}",
                     ])
-                elif arg in self.inout_args:
+                    # inputs broadcast over the loop need converting only once
+                    lines.extend([
+                        f"if (s_{arg.name} != 0 || i_o == 0) {{",
+                        *["    " + line for line in convert],
+                        "}",
+                    ])
+                    continue
+                lines.extend(convert)
+                if arg in self.inout_args:
                     # for inout arguments copy to output if needed
                     lines.extend([
                         f"if (copy_{arg.name}_in || {arg.name} != {arg.name}_in) {{",
@@ -732,6 +1281,34 @@ class TestFunction:
 
         return out
 
+    def benchmark_inputs(self) -> list[str]:
+        """Lines defining a function that returns inputs for a benchmark.
+
+        These are the inputs of the first call of the function in the test
+        that does not yield an error, with anything needed to calculate them.
+        """
+        call = f"erfa_ufunc.{self.func.pyname}("
+        lines = [f"def _inputs_{self.func.pyname}():"]
+        inputs = None
+        for line in self.to_python():
+            if inputs is not None and re.match(r"assert \w+ == -\d", line):
+                inputs = None
+            elif (start := line.find(call)) >= 0:
+                if inputs is not None:
+                    break
+                start += len(call)
+                depth = 1
+                for end in range(start, len(line)):
+                    depth += {"(": 1, ")": -1}.get(line[end], 0)
+                    if depth == 0:
+                        break
+                inputs = line[start:end]
+            elif inputs is None and not line.startswith("assert"):
+                lines.append(line)
+        if inputs is None:
+            raise RuntimeError(f"cannot find a call of {self.func.name} in its test")
+        return [*lines, f"return [{inputs}]"]
+
 
 def _args_from_func_call(line: str, func: Function) -> tuple[list[str], list[str]]:
     args = [
@@ -756,6 +1333,15 @@ def _assemble_func_call(
     return f"{', '.join(out_args)} = {func_call}" if out_args else func_call
 
 
+def _c_string(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def _as_tuple(names: list[str]) -> str:
+    return f"({', '.join(names)}{',' if len(names) == 1 else ''})"
+
+
 def _indent(lines: list[str], levels: int = 1) -> str:
     for i in range(1, len(lines)):
         if lines[i]:
@@ -767,20 +1353,43 @@ def _docstring_section_title(title: str) -> tuple[str, str, str]:
     return ("", title, len(title) * "-")
 
 
-def _render_template(template: Path, /, **kwargs: str) -> None:
-    template.with_suffix("").write_text(
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _render_template(
+    template: Path, /, output: Path | None = None, **kwargs: str
+) -> None:
+    (output or template.with_suffix("")).write_text(
         Template(template.read_text()).substitute(**kwargs)
     )
 
 
 def main(srcdir: Path, templateloc: Path) -> None:
-    funcs = [
-        Function.from_c_code(name, srcdir, templateloc)
-        for name in re.findall(
-            r"\w+ (\w+)\(.*?\);", (srcdir / "erfa.h").read_text(), flags=re.DOTALL
+    # The python wrappers are put in modules for the groups of erfa.h, such
+    # as "Astronomy/Calendars", which erfa.core imports only when needed.
+    sections = re.split(r"/\* (\w+/\w+) \*/\n", (srcdir / "erfa.h").read_text())
+    groups = {
+        _snake_case(title.split("/")[1]): (
+            title,
+            [
+                Function.from_c_code(name, srcdir, templateloc)
+                for name in re.findall(r"\w+ (\w+)\(.*?\);", body, flags=re.DOTALL)
+            ],
         )
+        for title, body in zip(sections[1::2], sections[2::2])
+    }
+    funcs = [func for _, group_funcs in groups.values() for func in group_funcs]
+    # Ufuncs that count rather than return status codes, for status!="raise".
+    ufunc_funcs = [
+        *funcs, *[func.without_status() for func in funcs if func.checks_status]
     ]
     funcs_sorted_by_name = {f.name: f for f in sorted(funcs, key=lambda f: f.pyname)}
+    funcs_by_pyname = {f.pyname: f for f in funcs}
+    for pyname, split in EPOCH_SPLITS.items():
+        funcs_by_pyname[pyname].epoch_split = tuple(
+            funcs_by_pyname[name] for name in split
+        )
 
     constants: list[Constant] = []
     for chunk in (srcdir / "erfam.h").read_text().split("\n\n"):
@@ -800,6 +1409,8 @@ def main(srcdir: Path, templateloc: Path) -> None:
             *[f'"{constant.name}",' for constant in constants],
             '"ErfaError",',
             '"ErfaWarning",',
+            '"TIME_SCALES",',
+            '"convert_timescale",',
             *[f'"{func.pyname}",' for func in funcs],
         ]),
         status_code_entries=_indent([
@@ -808,17 +1419,59 @@ def main(srcdir: Path, templateloc: Path) -> None:
             if isinstance((scode := func.c_retval), StatusCode) and scode.descriptons
         ]),
         constants="\n".join(constant.define for constant in constants),
-        funcs="\n\n\n".join([func.to_python for func in funcs]),
+        wrapper_groups=_indent([
+            f'"{name}": "{group}",'
+            for group, (_, group_funcs) in groups.items()
+            for func in group_funcs
+            for name in (
+                [func.pyname, func.py_return.name]
+                if isinstance(func.py_return, ResultTuple)
+                else [func.pyname]
+            )
+        ]),
     )
 
+    for group, (title, group_funcs) in groups.items():
+        body = "\n\n\n".join([func.to_python for func in group_funcs])
+        imports = []
+        if "namedtuple(" in body:
+            imports += ["from collections import namedtuple", ""]
+        if re.search(r"\bnp\.", body):
+            imports += ["import numpy as np", ""]
+        imports.append("from .. import ufunc")
+        if helpers := [name for name in CORE_HELPERS if re.search(rf"\b{name}\b", body)]:
+            imports.append(f"from ..core import {', '.join(helpers)}")
+        _render_template(
+            templateloc / "_core" / "group.py.templ",
+            output=templateloc / "_core" / f"{group}.py",
+            group=group,
+            title=title,
+            imports="\n".join(imports),
+            funcs=body,
+        )
+
     _render_template(
         templateloc / "ufunc.c.templ",
-        ufunc_loops="\n\n".join(func.ufunc_loop for func in funcs),
+        ufunc_loops="\n\n".join(func.ufunc_loop for func in ufunc_funcs),
         type_and_func_definitions=_indent(
-            list(chain(*[func.define_types_and_functions for func in funcs]))
+            list(chain(*[func.define_types_and_functions for func in ufunc_funcs]))
         ),
         ufunc_definitions=_indent(
-            list(chain(*[func.define_ufunc.splitlines() for func in funcs]))
+            list(chain(*[func.define_ufunc.splitlines() for func in ufunc_funcs]))
+        ),
+    )
+
+    scalar_funcs = [func for func in funcs if func.has_scalar]
+    _render_template(
+        templateloc / "scalar.c.templ",
+        scalar_functions="\n\n".join(func.scalar_function for func in scalar_funcs),
+        scalar_method_defs=_indent([func.scalar_method_def for func in scalar_funcs]),
+    )
+    _render_template(
+        templateloc / "scalar.py.templ",
+        all_list=_indent([f'"{func.pyname}",' for func in scalar_funcs]),
+        funcs="\n".join(
+            f"{func.pyname} = _scalar.{func.pyname}" for func in scalar_funcs
         ),
     )
 
@@ -827,11 +1480,23 @@ def main(srcdir: Path, templateloc: Path) -> None:
         t_erfa_c=(srcdir / "t_erfa_c.c").read_text(),
         erfa_funcs=funcs_sorted_by_name,
     )
+    test_funcs = list(map(create_test_funcs, funcs_sorted_by_name.values()))
     _render_template(
         templateloc / "tests" / "test_ufunc.py.templ",
         test_functions="\n\n\n".join([
             _indent([f"def test_{tfunc.func.pyname}():", *tfunc.to_python()])
-            for tfunc in map(create_test_funcs, funcs_sorted_by_name.values())
+            for tfunc in test_funcs
+        ]),
+    )
+
+    _render_template(
+        templateloc.parent / "benchmarks" / "bench_ufunc.py.templ",
+        input_functions="\n\n\n".join(
+            _indent(tfunc.benchmark_inputs()) for tfunc in test_funcs
+        ),
+        inputs=_indent([
+            f'"{tfunc.func.pyname}": _inputs_{tfunc.func.pyname},'
+            for tfunc in test_funcs
         ]),
     )
 
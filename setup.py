@@ -98,9 +98,10 @@ if not BUILDING_FROM_SDIST:
             'Maybe "git submodule update" could help.'
         ) from err
 
-sources = [Path("erfa", "ufunc.c")]
+sources = [Path("erfa", "ufunc.c"), Path("erfa", "scalar.c")]
 include_dirs = [np.get_include()]
 libraries = []
+extra_compile_args = []
 if int(os.environ.get("PYERFA_USE_SYSTEM_LIBERFA", "0")):
     print("Using system liberfa")
     libraries.append("erfa")
@@ -130,6 +131,12 @@ else:
             raise RuntimeError("unable to get liberfa version")
     include_dirs.extend(map(str, [ERFA_SRC, LIBERFADIR]))
     define_macros.append(("HAVE_CONFIG_H", "1"))
+    # Some loops in ufunc.c repeat the arithmetic of ERFA functions, without
+    # contraction to fused multiply-adds.  Ensure liberfa does not contract
+    # either (as GCC does by default on, e.g., aarch64), so that the results
+    # are identical.  MSVC does not contract by default.
+    if sys.platform != "win32":
+        extra_compile_args.append("-ffp-contract=off")
 
 setuptools.setup(
     use_scm_version={"version_scheme": guess_next_dev},
@@ -140,6 +147,7 @@ setuptools.setup(
             include_dirs=include_dirs,
             libraries=libraries,
             define_macros=define_macros,
+            extra_compile_args=extra_compile_args,
             py_limited_api=USE_PY_LIMITED_API,
             language="c",
         )